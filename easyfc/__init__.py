@@ -0,0 +1,7 @@
+"""EasyFc 命令行入口，不依赖 Qt"""
+
+from .cli import main
+
+__all__ = [
+    "main",
+]
@@ -0,0 +1,683 @@
+"""命令行分类入口
+
+    python -m easyfc SOURCE [SOURCE ...] TARGET [--mode extension] [--profile default] [--depth N] [--delete]
+
+只使用 models 和 utils，不导入 Qt，可在没有图形界面的服务器、计划任务和脚本中运行。
+进度和结果以 JSON Lines 写到标准输出，每行一个事件：
+
+    {"event": "start", "sources": ["..."], "target": "...", "mode": "extension", ...}
+    {"event": "progress", "phase": "copy", "processed": 120, "total": 500, ...}
+    {"event": "file", "status": "failed", "file_path": "...", "code": "copy", "errno": 13, "phase": "copy", "error": "..."}
+    {"event": "source", "source_folder": "...", "success_count": 300, "failed_count": 2, ...}
+    {"event": "result", "success_count": 498, "failed_count": 2, "failure_counts": {...}, "exit_code": 1, ...}
+
+失败记录的 code、errno、phase 见 models.failures，error 为按错误码生成的说明；
+result 事件的 failure_counts 按错误码（by_code）、错误类别（by_category）和目标分类（by_target）统计本次的失败。
+
+--watch 模式下持续监视源文件夹，每处理一批新到达的文件输出一个 batch 事件，
+收到 Ctrl+C 或 SIGTERM 后输出累计的 result 事件并退出。可读的错误说明同时写到标准错误。
+
+每次运行的操作记录在运行日志中，result 事件的 journal 为日志路径，
+--undo 按日志撤销该次运行（--undo last 为最近一次未撤销的运行）。
+"""
+
+import argparse
+import json
+import os
+import signal
+import sys
+import time
+from typing import Callable, Optional, TextIO
+
+from models.classifier_registry import available_classifiers, load_plugins
+from models.failures import count_failures, describe_failure, merge_failure_counts
+from models.file_classifier import DEFAULT_DELIMITER, DEFAULT_DELIMITER_END_POS, DEFAULT_DELIMITER_START_POS
+from models.job_spec import JobSpec
+from models.plan_file import PlanFileExecutor, read_plan_header, write_plan_file
+from models.progress import PHASE_COPY, PHASE_PLAN, PHASE_SCAN, PHASE_UNDO, ProgressReporter, ProgressSnapshot
+from models.run_journal import JournalUndoer, RunJournal, list_journals
+from models.source_scan import scan_sources
+from utils.delimiter_config_manager import DelimiterConfigManager
+from utils.extension_config_manager import ExtensionConfigManager
+from utils.folder_watcher import WATCH_BACKEND_INOTIFY, WATCH_BACKEND_POLLING, FolderWatcher
+from utils.job_control import JobCancelled, JobControl
+
+EXIT_OK = 0
+EXIT_FAILURES = 1
+EXIT_USAGE = 2
+EXIT_ERROR = 3
+EXIT_CANCELLED = 130
+
+FILES_NONE = "none"
+FILES_FAILED = "failed"
+FILES_ALL = "all"
+
+DEFAULT_PROGRESS_INTERVAL = 0.5
+
+
+def snapshot_to_dict(snapshot: ProgressSnapshot) -> dict:
+    """将进度快照转换为可序列化为 JSON 的字典"""
+    return {
+        "phase": snapshot.phase,
+        "processed": snapshot.processed,
+        "total": snapshot.total,
+        "current_file": snapshot.current_file,
+        "elapsed": round(snapshot.elapsed, 3),
+        "files_per_second": round(snapshot.files_per_second, 1),
+        "bytes_done": snapshot.bytes_done,
+        "bytes_total": snapshot.bytes_total,
+        "bytes_per_second": round(snapshot.bytes_per_second),
+        "failed_count": snapshot.failed_count,
+        "eta": None if snapshot.eta is None else round(snapshot.eta, 1),
+    }
+
+
+class JsonLinesWriter:
+    """将事件逐行写为 JSON，每行写完立即刷新，便于管道另一端实时读取"""
+
+    def __init__(self, stream: TextIO):
+        self._stream = stream
+
+    def emit(self, event: str, **fields):
+        """写出一个事件"""
+        self._stream.write(json.dumps({"event": event, **fields}, ensure_ascii=False) + "\n")
+        self._stream.flush()
+
+    def progress(self, snapshot: ProgressSnapshot):
+        """写出进度快照"""
+        self.emit("progress", **snapshot_to_dict(snapshot))
+
+
+def build_parser(classifier_names: list[str]) -> argparse.ArgumentParser:
+    """
+    构造命令行参数解析器
+
+    Args:
+        classifier_names: 可选的分类器名称（含插件）
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m easyfc",
+        description="按扩展名、分隔符或日期分类文件，进度和结果以 JSON Lines 输出到标准输出",
+        epilog="退出码: 0 全部成功, 1 部分文件失败, 2 参数或配置错误, 3 运行错误, 130 已取消"
+    )
+    parser.add_argument(
+        "paths", nargs="*", metavar="PATH",
+        help="一个或多个源文件夹，最后一个为目标文件夹；多个源文件夹并发扫描后合并分类"
+    )
+    parser.add_argument(
+        "-m", "--mode", default="extension", choices=classifier_names,
+        help="分类方式（默认: extension）"
+    )
+    parser.add_argument(
+        "-p", "--profile",
+        help="配置方案：extension 模式为 extension_configs.json 中的方案名（默认: default），"
+             "delimiter 模式为 delimiter_configs.json 中的配置名称"
+    )
+    parser.add_argument("-d", "--depth", type=int, help="最大扫描深度，1 表示只扫描源文件夹本身（默认: 不限制）")
+    parser.add_argument("--delete", action="store_true", help="分类后删除源文件（移动）")
+    parser.add_argument("--template", default="", help="目标路径模板，如 \"{category}/{year}\"")
+
+    delimiter_group = parser.add_argument_group("分隔符参数（覆盖 --profile 中的同名设置）")
+    delimiter_group.add_argument("--delimiter-start", help=f"起始分隔符（默认: {DEFAULT_DELIMITER}）")
+    delimiter_group.add_argument("--delimiter-end", help=f"结束分隔符（默认: {DEFAULT_DELIMITER}）")
+    delimiter_group.add_argument(
+        "--start-pos", type=int, help=f"第几个起始分隔符（默认: {DEFAULT_DELIMITER_START_POS}）"
+    )
+    delimiter_group.add_argument(
+        "--end-pos", type=int, help=f"第几个结束分隔符，-1 表示末尾（默认: {DEFAULT_DELIMITER_END_POS}）"
+    )
+
+    plan_group = parser.add_argument_group("分类方案")
+    plan_group.add_argument("--dry-run", action="store_true", help="只生成方案并输出摘要，不读写任何文件数据")
+    plan_group.add_argument("--plan-out", metavar="FILE", help="将方案写入 JSONL 方案文件，不执行")
+    plan_group.add_argument("--execute-plan", metavar="FILE", help="执行方案文件，中断后再次执行会从检查点继续")
+
+    journal_group = parser.add_argument_group("撤销")
+    journal_group.add_argument("--no-journal", action="store_true", help="不记录运行日志，本次运行将无法撤销")
+    journal_group.add_argument(
+        "--undo", metavar="JOURNAL",
+        help="按运行日志撤销一次运行，last 为最近一次未撤销的运行；中断后再次执行会继续"
+    )
+
+    watch_group = parser.add_argument_group("监视模式")
+    watch_group.add_argument(
+        "--watch", action="store_true",
+        help="持续监视源文件夹，只分类启动后新到达的文件，按 Ctrl+C 停止"
+    )
+    watch_group.add_argument(
+        "--stable-seconds", type=float, default=FolderWatcher.DEFAULT_STABLE_SECONDS,
+        help=f"文件大小和修改时间保持不变多少秒后视为写完（默认: {FolderWatcher.DEFAULT_STABLE_SECONDS}）"
+    )
+    watch_group.add_argument(
+        "--poll-interval", type=float, default=FolderWatcher.DEFAULT_POLL_INTERVAL,
+        help=f"检查间隔秒数（默认: {FolderWatcher.DEFAULT_POLL_INTERVAL}）"
+    )
+    watch_group.add_argument(
+        "--watch-backend", default="auto", choices=["auto", WATCH_BACKEND_INOTIFY, WATCH_BACKEND_POLLING],
+        help="监视方式，auto 在 Linux 上使用 inotify，否则轮询（默认: auto）"
+    )
+
+    output_group = parser.add_argument_group("输出")
+    output_group.add_argument(
+        "--files", default=FILES_FAILED, choices=[FILES_NONE, FILES_FAILED, FILES_ALL],
+        help="结束时逐行输出哪些文件的结果（默认: failed，包括失败和未处理的文件）"
+    )
+    output_group.add_argument(
+        "--interval", type=float, default=DEFAULT_PROGRESS_INTERVAL,
+        help=f"进度事件的最小间隔秒数（默认: {DEFAULT_PROGRESS_INTERVAL}）"
+    )
+    return parser
+
+
+def build_classifier_options(args: argparse.Namespace) -> dict:
+    """
+    根据命令行参数和配置文件构造分类器参数
+
+    Raises:
+        ValueError: 配置方案不存在或无法读取
+    """
+    if args.mode == "extension":
+        return {"extensions_map": ExtensionConfigManager().load_lookup(args.profile)}
+
+    if args.mode == "delimiter":
+        options = {}
+        if args.profile:
+            config_manager = DelimiterConfigManager()
+            if not config_manager.load_configs():
+                raise ValueError(config_manager.load_error)
+            config = config_manager.get_config_by_name(args.profile)
+            if config is None:
+                raise ValueError(f"分隔符配置 '{args.profile}' 不存在")
+            options = config.to_classifier_options()
+
+        overrides = {
+            "delimiter_start_str": args.delimiter_start,
+            "delimiter_end_str": args.delimiter_end,
+            "delimiter_start_pos": args.start_pos,
+            "delimiter_end_pos": args.end_pos,
+        }
+        options.update({key: value for key, value in overrides.items() if value is not None})
+        options.setdefault("delimiter_start_str", DEFAULT_DELIMITER)
+        options.setdefault("delimiter_end_str", DEFAULT_DELIMITER)
+        options.setdefault("delimiter_start_pos", DEFAULT_DELIMITER_START_POS)
+        options.setdefault("delimiter_end_pos", DEFAULT_DELIMITER_END_POS)
+        return options
+
+    return {}
+
+
+def get_profile_name(args: argparse.Namespace) -> str:
+    """任务使用的配置方案名称，扩展名分类未指定时为默认方案"""
+    if args.mode == "extension":
+        return args.profile or ExtensionConfigManager.DEFAULT_PROFILE
+    return args.profile or ""
+
+
+def build_job_spec(args: argparse.Namespace) -> JobSpec:
+    """
+    根据命令行参数构造任务规格
+
+    Raises:
+        ValueError: 参数或配置无效
+    """
+    for source in args.sources:
+        if not os.path.isdir(source):
+            raise ValueError(f"源文件夹不存在: {source}")
+    if args.depth is not None and args.depth < 1:
+        raise ValueError("扫描深度必须大于等于1")
+
+    return JobSpec(
+        classifier_name=args.mode,
+        source_folder=args.sources[0],
+        target_folder=args.target,
+        delete_source=args.delete,
+        options=build_classifier_options(args),
+        specify_depth=args.depth is not None,
+        scan_depth=args.depth or 1,
+        path_template=args.template,
+        source_folders=tuple(args.sources),
+        profile=get_profile_name(args)
+    )
+
+
+def create_journal(args: argparse.Namespace, spec: Optional[JobSpec]) -> Optional[RunJournal]:
+    """
+    为本次运行创建运行日志，只生成方案或指定 --no-journal 时不记录
+
+    Raises:
+        ValueError: 方案文件无效
+    """
+    if args.no_journal or args.dry_run or args.plan_out:
+        return None
+    if spec is None:
+        header = read_plan_header(args.execute_plan)
+        return RunJournal.create(header.get("target_dir", ""), False)
+    return RunJournal.create(spec.target_folder, spec.delete_source, spec.source_folders, spec.profile)
+
+
+def _empty_result(total_files: int = 0) -> dict:
+    return {
+        "success_count": 0,
+        "failed_count": 0,
+        "failed_files": [],
+        "success_files": [],
+        "total_files": total_files
+    }
+
+
+def run_spec(
+    spec: JobSpec,
+    writer: JsonLinesWriter,
+    control: JobControl,
+    interval: float = DEFAULT_PROGRESS_INTERVAL,
+    dry_run: bool = False,
+    plan_out: Optional[str] = None,
+    journal: Optional[RunJournal] = None
+) -> dict:
+    """
+    扫描、生成方案并执行
+
+    Args:
+        spec: 任务规格
+        writer: 事件输出
+        control: 任务控制句柄
+        interval: 进度事件的最小间隔（秒）
+        dry_run: 只输出方案摘要，不执行
+        plan_out: 方案文件路径，指定时只写出方案，不执行
+        journal: 运行日志，记录执行的操作
+
+    Returns:
+        处理结果字典，格式与界面分类结果相同
+    """
+    reporter = ProgressReporter(0, writer.progress, interval=interval)
+    reporter.start_phase(PHASE_SCAN, 0)
+
+    scan = scan_sources(spec.source_folders, max_depth=spec.max_depth)
+    files = scan.files
+    total_files = len(files)
+    if control.is_cancelled:
+        raise JobCancelled()
+    if total_files == 0:
+        return _empty_result()
+
+    reporter.start_phase(PHASE_PLAN, total_files)
+    try:
+        plan = spec.create_classifier().plan(files, control=control)
+    except JobCancelled:
+        result = _empty_result(total_files)
+        result["cancelled"] = True
+        result["unprocessed_files"] = [
+            {"file_path": file_path, "file_name": file_name}
+            for file_path, file_name, _ in files
+        ]
+        return scan.add_breakdown(result)
+
+    if dry_run or plan_out:
+        if plan_out:
+            write_plan_file(plan, plan_out)
+        writer.emit("plan", plan_file=plan_out, **plan.get_summary())
+        result = _empty_result(total_files)
+        result["failed_count"] = len(plan.failed_files)
+        result["failed_files"] = list(plan.failed_files)
+        result["planned"] = True
+        return result
+
+    return scan.add_breakdown(execute_plan(plan, writer, control, interval, journal))
+
+
+def execute_plan(
+    plan,
+    writer: JsonLinesWriter,
+    control: JobControl,
+    interval: float = DEFAULT_PROGRESS_INTERVAL,
+    journal: Optional[RunJournal] = None
+) -> dict:
+    """
+    执行分类方案并输出进度
+
+    Returns:
+        处理结果字典
+    """
+    reporter = ProgressReporter(0, writer.progress, interval=interval)
+    reporter.start_phase(
+        PHASE_COPY,
+        plan.total_files,
+        bytes_total=sum(operation.size for operation in plan.operations),
+        failed_count=len(plan.failed_files)
+    )
+    result = plan.execute(
+        progress_callback=reporter.update,
+        control=control,
+        file_done_callback=reporter.file_done,
+        journal=journal
+    )
+    result["total_files"] = plan.total_files
+    reporter.finish()
+    return result
+
+
+def run_watch(
+    spec: JobSpec,
+    writer: JsonLinesWriter,
+    control: JobControl,
+    watcher: FolderWatcher,
+    files: str = FILES_FAILED,
+    interval: float = DEFAULT_PROGRESS_INTERVAL,
+    reload_spec: Optional[Callable[[], JobSpec]] = None,
+    journal: Optional[RunJournal] = None
+) -> dict:
+    """
+    持续分类新到达的文件，直到任务被取消
+
+    每批文件单独生成方案并执行，分类器（包括扩展名后缀树）在各批之间复用；
+    每批结束后只累加计数，不保留文件记录，长时间运行时内存保持平稳。
+
+    Args:
+        reload_spec: 每批开始前重新构造任务规格，配置文件修改后分类参数变化时重建分类器；
+            配置暂时无效时输出 config_error 事件并继续使用原有参数
+        journal: 运行日志，整个监视过程共用一个
+
+    Returns:
+        累计的处理结果字典（不含文件列表）
+    """
+    current = {"spec": spec, "classifier": spec.create_classifier()}
+    totals = {
+        "success_count": 0,
+        "failed_count": 0,
+        "total_files": 0,
+        "retried_count": 0,
+        "batch_count": 0,
+        "failure_counts": {},
+    }
+
+    def refresh_classifier():
+        try:
+            new_spec = reload_spec()
+        except ValueError as e:
+            writer.emit("config_error", message=str(e))
+            return
+        if dict(new_spec.options) != dict(current["spec"].options):
+            current["spec"] = new_spec
+            current["classifier"] = new_spec.create_classifier()
+            writer.emit("config_reloaded")
+
+    def classify_batch(batch: list):
+        if reload_spec is not None:
+            refresh_classifier()
+        plan = current["classifier"].plan(batch, control=control)
+        result = execute_plan(plan, writer, control, interval, journal)
+        totals["success_count"] += result["success_count"]
+        totals["failed_count"] += result["failed_count"]
+        totals["total_files"] += result["total_files"]
+        totals["retried_count"] += result.get("retried_count", 0)
+        merge_failure_counts(totals["failure_counts"], count_failures(result["failed_files"]))
+        totals["batch_count"] += 1
+
+        _emit_file_records(writer, result, files)
+        writer.emit(
+            "batch",
+            success_count=result["success_count"],
+            failed_count=result["failed_count"],
+            total_files=result["total_files"],
+            pending_count=watcher.pending_count
+        )
+        if result.get("cancelled"):
+            raise JobCancelled()
+
+    writer.emit(
+        "watch",
+        backend=watcher.backend_name,
+        stable_seconds=watcher.stable_seconds,
+        poll_interval=watcher.poll_interval
+    )
+    try:
+        watcher.run(classify_batch, control)
+    except JobCancelled:
+        pass
+    return totals
+
+
+def run_plan_file(
+    plan_file: str,
+    writer: JsonLinesWriter,
+    control: JobControl,
+    interval: float = DEFAULT_PROGRESS_INTERVAL,
+    journal: Optional[RunJournal] = None
+) -> dict:
+    """
+    执行方案文件，从检查点继续
+
+    Raises:
+        ValueError: 方案文件无效
+    """
+    executor = PlanFileExecutor(plan_file)
+    reporter = ProgressReporter(0, writer.progress, interval=interval)
+    reporter.start_phase(PHASE_COPY, executor.total_files, bytes_total=executor.total_bytes)
+
+    result = executor.execute(
+        progress_callback=reporter.update,
+        control=control,
+        file_done_callback=reporter.file_done,
+        journal=journal
+    )
+    reporter.finish()
+    return result
+
+
+def resolve_journal(journal: str) -> str:
+    """
+    解析 --undo 参数，last 为最近一次未撤销的运行日志
+
+    Raises:
+        ValueError: 没有可撤销的运行
+    """
+    if journal != "last":
+        return journal
+    journals = list_journals()
+    if not journals:
+        raise ValueError("没有可撤销的运行")
+    return journals[0]
+
+
+def run_undo(
+    journal_path: str,
+    writer: JsonLinesWriter,
+    control: JobControl,
+    interval: float = DEFAULT_PROGRESS_INTERVAL
+) -> dict:
+    """
+    按运行日志撤销一次运行
+
+    Raises:
+        ValueError: 运行日志无效
+    """
+    undoer = JournalUndoer(journal_path)
+    reporter = ProgressReporter(0, writer.progress, interval=interval)
+    reporter.start_phase(PHASE_UNDO, undoer.total_files)
+
+    result = undoer.execute(
+        progress_callback=reporter.update,
+        control=control,
+        file_done_callback=reporter.file_done
+    )
+    reporter.finish()
+    return result
+
+
+def _emit_file_records(writer: JsonLinesWriter, result: dict, files: str):
+    """逐行输出文件结果"""
+    if files == FILES_NONE:
+        return
+    if files == FILES_ALL:
+        for record in result.get("success_files", []):
+            writer.emit("file", status="success", **record)
+    for record in result.get("failed_files", []):
+        writer.emit("file", status="failed", error=describe_failure(record), **record)
+    for record in result.get("unprocessed_files", []):
+        writer.emit("file", status="unprocessed", **record)
+
+
+def get_exit_code(result: dict) -> int:
+    """根据处理结果确定退出码"""
+    if result.get("cancelled"):
+        return EXIT_CANCELLED
+    if result.get("failed_count", 0) > 0:
+        return EXIT_FAILURES
+    return EXIT_OK
+
+
+def _install_signal_handlers(control: JobControl) -> Callable[[], None]:
+    """
+    第一次 Ctrl+C 或 SIGTERM 协作式取消，已完成的文件保留；再次 Ctrl+C 立即中断
+
+    Returns:
+        恢复原信号处理函数的回调
+    """
+    handled = [signal.SIGINT]
+    if hasattr(signal, "SIGTERM"):
+        handled.append(signal.SIGTERM)
+
+    def handle(signum, frame):
+        if control.is_cancelled and signum == signal.SIGINT:
+            raise KeyboardInterrupt
+        print("正在取消，当前文件处理完后停止...", file=sys.stderr)
+        control.cancel()
+
+    previous = {}
+    try:
+        for signum in handled:
+            previous[signum] = signal.signal(signum, handle)
+    except ValueError:
+        pass
+
+    def restore():
+        for signum, handler in previous.items():
+            signal.signal(signum, handler)
+
+    return restore
+
+
+def main(argv: Optional[list[str]] = None, stdout: Optional[TextIO] = None) -> int:
+    """
+    命令行入口
+
+    Args:
+        argv: 命令行参数，默认为 sys.argv[1:]
+        stdout: 事件输出流，默认为标准输出
+
+    Returns:
+        退出码
+    """
+    for error in load_plugins()[1]:
+        print(f"警告: {error}", file=sys.stderr)
+
+    parser = build_parser(available_classifiers())
+    args = parser.parse_args(argv)
+    writer = JsonLinesWriter(stdout or sys.stdout)
+
+    args.sources, args.target = args.paths[:-1], args.paths[-1] if args.paths else ""
+    if args.undo:
+        if args.paths or args.execute_plan or args.watch or args.plan_out or args.dry_run:
+            parser.error("--undo 不能与其他运行方式或源文件夹、目标文件夹同时使用")
+    elif args.execute_plan:
+        if args.paths:
+            parser.error("--execute-plan 不能与源文件夹、目标文件夹同时使用")
+    elif not args.sources:
+        parser.error("需要指定源文件夹和目标文件夹")
+    if args.interval < 0:
+        parser.error("--interval 不能为负数")
+    if args.watch and (args.execute_plan or args.plan_out or args.dry_run):
+        parser.error("--watch 不能与 --execute-plan、--plan-out 或 --dry-run 同时使用")
+    if args.watch and len(args.sources) > 1:
+        parser.error("--watch 只支持一个源文件夹")
+
+    try:
+        spec = None if args.execute_plan or args.undo else build_job_spec(args)
+    except ValueError as e:
+        writer.emit("error", message=str(e), exit_code=EXIT_USAGE)
+        print(f"错误: {e}", file=sys.stderr)
+        return EXIT_USAGE
+
+    control = JobControl()
+    restore_signals = _install_signal_handlers(control)
+    start_time = time.monotonic()
+    journal = None
+    try:
+        if not args.undo:
+            journal = create_journal(args, spec)
+
+        if args.undo:
+            journal_path = resolve_journal(args.undo)
+            writer.emit("start", undo=journal_path)
+            result = run_undo(journal_path, writer, control, args.interval)
+        elif spec is None:
+            writer.emit("start", plan_file=args.execute_plan)
+            result = run_plan_file(args.execute_plan, writer, control, args.interval, journal)
+        else:
+            writer.emit(
+                "start",
+                sources=list(spec.source_folders),
+                target=spec.target_folder,
+                mode=spec.classifier_name,
+                profile=spec.profile,
+                delete_source=spec.delete_source,
+                max_depth=spec.max_depth,
+                watch=args.watch
+            )
+            if args.watch:
+                watcher = FolderWatcher(
+                    spec.source_folder,
+                    max_depth=spec.max_depth,
+                    stable_seconds=args.stable_seconds,
+                    poll_interval=args.poll_interval,
+                    exclude=[spec.target_folder],
+                    backend=None if args.watch_backend == "auto" else args.watch_backend
+                )
+                watcher.start()
+                result = run_watch(
+                    spec, writer, control, watcher, args.files, args.interval,
+                    reload_spec=lambda: build_job_spec(args),
+                    journal=journal
+                )
+            else:
+                result = run_spec(
+                    spec, writer, control, args.interval, args.dry_run, args.plan_out, journal
+                )
+    except (JobCancelled, KeyboardInterrupt):
+        writer.emit("result", cancelled=True, exit_code=EXIT_CANCELLED)
+        return EXIT_CANCELLED
+    except ValueError as e:
+        writer.emit("error", message=str(e), exit_code=EXIT_USAGE)
+        print(f"错误: {e}", file=sys.stderr)
+        return EXIT_USAGE
+    except Exception as e:
+        writer.emit("error", message=f"分类失败: {str(e)}", exit_code=EXIT_ERROR)
+        print(f"分类失败: {e}", file=sys.stderr)
+        return EXIT_ERROR
+    finally:
+        restore_signals()
+        if journal is not None:
+            journal.close()
+
+    if journal is not None:
+        journal.add_to_result(result)
+        if journal.error:
+            print(f"警告: {journal.error}", file=sys.stderr)
+    exit_code = get_exit_code(result)
+    _emit_file_records(writer, result, args.files)
+    for source in result.get("source_breakdown", []):
+        writer.emit("source", **source)
+    writer.emit(
+        "result",
+        success_count=result.get("success_count", 0),
+        failed_count=result.get("failed_count", 0),
+        total_files=result.get("total_files", 0),
+        unprocessed_count=len(result.get("unprocessed_files", [])),
+        retried_count=result.get("retried_count", 0),
+        failure_counts=result.get("failure_counts") or count_failures(result.get("failed_files", [])),
+        cancelled=bool(result.get("cancelled")),
+        journal=result.get("journal_path"),
+        elapsed=round(time.monotonic() - start_time, 3),
+        exit_code=exit_code
+    )
+    return exit_code
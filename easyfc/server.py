@@ -0,0 +1,620 @@
+"""本地任务服务：通过 HTTP/JSON 提交分类任务、查询状态和接收进度
+
+    python -m easyfc.server [--host 127.0.0.1] [--port 8765] [--workers 2] [--token TOKEN]
+
+默认只监听本机回环地址，不导入 Qt。所有请求都必须带 Authorization: Bearer <令牌>，
+令牌由 --token 或环境变量 EASYFC_SERVICE_TOKEN 指定，未指定时每次启动随机生成并输出到标准错误；
+Host 必须是回环地址（或监听地址），带 Origin 时也必须是回环地址，POST 的 Content-Type 必须是
+application/json。浏览器中的其他网页因此无法跨域提交任务，DNS 重绑定也无法通过 Host 检查。
+监听非回环地址时必须显式指定令牌。接口：
+
+    GET    /classifiers             可用的分类器名称
+    POST   /jobs                    提交任务，请求体为 JobSpec 字典（可用 source_folders 指定多个源文件夹），可附加 profile
+    GET    /jobs                    所有任务的状态（只含分类器、方案、文件夹和选项，不含完整规格）
+    GET    /jobs/{id}               单个任务的状态和结果摘要
+    GET    /jobs/{id}/events?after=N  以 JSON Lines 持续推送序号大于 N 的事件，任务结束后关闭连接
+    DELETE /jobs/{id}               取消任务
+
+任务在固定大小的线程池中运行。配置通过进程内共享的配置缓存读取，扩展名后缀树和目标目录
+文件名索引在任务之间保留，配置文件被修改或目标目录被其他程序改动时才重新读取。
+"""
+
+import argparse
+import hmac
+import ipaddress
+import json
+import os
+import secrets
+import sys
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlsplit
+
+from models.classification_plan import TargetDirectoryIndex
+from models.classifier_registry import available_classifiers, check_classifier_options, load_plugins
+from models.failures import count_failures, describe_failure
+from models.job_spec import JobSpec
+from models.progress import PHASE_COPY, PHASE_PLAN, PHASE_SCAN, ProgressReporter, ProgressSnapshot
+from models.run_journal import RunJournal
+from models.source_scan import scan_sources
+from utils.delimiter_config_manager import DelimiterConfigManager
+from utils.extension_config_manager import ExtensionConfigManager
+from utils.job_control import JobCancelled, JobControl
+
+from .cli import snapshot_to_dict
+
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+TOKEN_ENV = "EASYFC_SERVICE_TOKEN"
+MAX_REQUEST_BYTES = 1024 * 1024
+MAX_JOB_EVENTS = 1000
+EVENTS_WAIT_SECONDS = 15.0
+
+
+def load_delimiter_options(name: str) -> dict:
+    """
+    获取分隔符配置对应的分类器参数
+
+    Raises:
+        ValueError: 配置不存在或无法读取
+    """
+    config_manager = DelimiterConfigManager()
+    if not config_manager.load_configs():
+        raise ValueError(config_manager.load_error)
+    config = config_manager.get_config_by_name(name)
+    if config is None:
+        raise ValueError(f"分隔符配置 '{name}' 不存在")
+    return config.to_classifier_options()
+
+
+@dataclass
+class ServiceJob:
+    """服务中的分类任务，事件只保留最近 MAX_JOB_EVENTS 条"""
+    spec: JobSpec
+    job_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    created_at: float = field(default_factory=time.time)
+    state: str = JOB_PENDING
+    finished_at: Optional[float] = None
+    progress: Optional[dict] = None
+    summary: Optional[dict] = None
+    error: str = ""
+    control: JobControl = field(default_factory=JobControl, repr=False)
+    _events: deque = field(default_factory=lambda: deque(maxlen=MAX_JOB_EVENTS), repr=False)
+    _last_seq: int = 0
+    _condition: threading.Condition = field(default_factory=threading.Condition, repr=False)
+
+    @property
+    def is_finished(self) -> bool:
+        return self.state in (JOB_COMPLETED, JOB_FAILED, JOB_CANCELLED)
+
+    def add_event(self, event: str, **fields):
+        """记录事件并唤醒等待事件的连接"""
+        with self._condition:
+            self._last_seq += 1
+            self._events.append({"seq": self._last_seq, "event": event, **fields})
+            self._condition.notify_all()
+
+    def set_state(self, state: str, **fields):
+        """修改状态并记录 state 事件"""
+        self.state = state
+        if self.is_finished:
+            self.finished_at = time.time()
+        self.add_event("state", state=state, **fields)
+
+    def publish_progress(self, snapshot: ProgressSnapshot):
+        """ProgressReporter 的发布回调"""
+        self.progress = snapshot_to_dict(snapshot)
+        self.add_event("progress", **self.progress)
+
+    def events_after(self, seq: int, timeout: float) -> list[dict]:
+        """
+        获取序号大于 seq 的事件，没有新事件时最多等待 timeout 秒
+
+        Returns:
+            事件列表；任务已结束且没有新事件时为空列表
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self._last_seq > seq or self.is_finished, timeout)
+            return [event for event in self._events if event["seq"] > seq]
+
+    def to_dict(self, include_spec: bool = False) -> dict:
+        """
+        转换为接口返回的字典
+
+        Args:
+            include_spec: 是否包含完整的任务规格（含扩展名映射等分类器参数），只在查询单个任务时返回
+        """
+        spec = self.spec
+        data = {
+            "job_id": self.job_id,
+            "state": self.state,
+            "classifier_name": spec.classifier_name,
+            "profile": spec.profile,
+            "source_folders": list(spec.source_folders),
+            "target_folder": spec.target_folder,
+            "delete_source": spec.delete_source,
+            "max_depth": spec.max_depth,
+            "path_template": spec.path_template,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            "progress": self.progress,
+            "summary": self.summary,
+            "error": self.error,
+            "last_event_seq": self._last_seq,
+        }
+        if include_spec:
+            data["spec"] = spec.to_dict()
+        return data
+
+
+def summarize_result(result: dict) -> dict:
+    """
+    生成结果摘要：只保留计数和失败文件，不保留成功文件列表；失败按错误码和错误类别统计
+
+    Args:
+        result: 分类结果字典
+    """
+    return {
+        "success_count": result.get("success_count", 0),
+        "failed_count": result.get("failed_count", 0),
+        "total_files": result.get("total_files", 0),
+        "cancelled": bool(result.get("cancelled")),
+        "unprocessed_count": len(result.get("unprocessed_files", [])),
+        "retried_count": result.get("retried_count", 0),
+        "failure_counts": count_failures(result.get("failed_files", [])),
+        "failed_files": [
+            {
+                "file_path": record.get("file_path", ""),
+                "code": record.get("code"),
+                "errno": record.get("errno"),
+                "phase": record.get("phase"),
+                "target_category": record.get("target_category", ""),
+                "attempts": record.get("attempts", 1),
+                "error": describe_failure(record),
+            }
+            for record in result.get("failed_files", [])
+        ],
+        "source_breakdown": result.get("source_breakdown", []),
+        "journal_path": result.get("journal_path"),
+    }
+
+
+class ClassificationService:
+    """
+    分类任务服务
+
+    任务提交后立即返回，由固定大小的线程池执行。写入同一目标文件夹的任务依次执行，
+    共享该目标文件夹的文件名索引；已结束的任务只保留最近 MAX_FINISHED_JOBS 个。
+    """
+
+    DEFAULT_MAX_WORKERS = 2
+    MAX_FINISHED_JOBS = 200
+    MAX_DIRECTORY_INDEXES = 32
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS, progress_interval: float = 0.5):
+        """
+        初始化服务
+
+        Args:
+            max_workers: 同时运行的任务数
+            progress_interval: 进度事件的最小间隔（秒）
+        """
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="easyfc-job")
+        self._progress_interval = progress_interval
+        self._lock = threading.Lock()
+        self._jobs: OrderedDict[str, ServiceJob] = OrderedDict()
+        self._indexes: OrderedDict[str, tuple[TargetDirectoryIndex, threading.Lock]] = OrderedDict()
+
+    def build_spec(self, data: dict) -> JobSpec:
+        """
+        根据请求数据构造任务规格，extension 和 delimiter 分类器可用 profile 引用配置文件中的方案
+
+        Raises:
+            ValueError: 参数或配置无效
+        """
+        classifier_name = data.get("classifier_name", "extension")
+        profile = data.get("profile") or ""
+        options = dict(data.get("options") or {})
+
+        if classifier_name == "extension" and "extensions_map" not in options:
+            profile = profile or ExtensionConfigManager.DEFAULT_PROFILE
+            options["extensions_map"] = ExtensionConfigManager().load_lookup(profile)
+        elif classifier_name == "delimiter" and profile:
+            options = {**load_delimiter_options(profile), **options}
+
+        for source_folder in [data.get("source_folder", ""), *(data.get("source_folders") or [])]:
+            if source_folder and not os.path.isdir(source_folder):
+                raise ValueError(f"源文件夹不存在: {source_folder}")
+
+        check_classifier_options(classifier_name, options)
+        spec = JobSpec.from_dict({
+            **data,
+            "classifier_name": classifier_name,
+            "options": options,
+            "profile": profile
+        })
+        # 构造一次分类器，参数值无效（如分隔符为空）时在提交时就返回错误，而不是在任务运行后失败
+        try:
+            spec.create_classifier()
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"分类器参数无效: {str(e)}")
+        return spec
+
+    def submit(self, data: dict) -> ServiceJob:
+        """
+        提交任务
+
+        Raises:
+            ValueError: 参数或配置无效
+        """
+        job = ServiceJob(spec=self.build_spec(data))
+        with self._lock:
+            self._jobs[job.job_id] = job
+            self._prune_finished()
+        job.add_event("state", state=JOB_PENDING)
+        self._executor.submit(self._run_job, job)
+        return job
+
+    def get_job(self, job_id: str) -> Optional[ServiceJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list_jobs(self) -> list[ServiceJob]:
+        with self._lock:
+            return list(self._jobs.values())
+
+    def cancel_job(self, job_id: str) -> Optional[ServiceJob]:
+        """取消任务：排队中的任务不再执行，运行中的任务协作式取消"""
+        job = self.get_job(job_id)
+        if job is not None and not job.is_finished:
+            job.control.cancel()
+        return job
+
+    def shutdown(self):
+        """取消所有未结束的任务并等待线程池退出"""
+        for job in self.list_jobs():
+            job.control.cancel()
+        self._executor.shutdown(wait=True)
+
+    def _prune_finished(self):
+        """移除最早结束的任务，保证内存不随运行时间增长"""
+        finished = [job_id for job_id, job in self._jobs.items() if job.is_finished]
+        for job_id in finished[:max(0, len(finished) - self.MAX_FINISHED_JOBS)]:
+            del self._jobs[job_id]
+
+    def _get_directory_index(self, target_folder: str) -> tuple[TargetDirectoryIndex, threading.Lock]:
+        """获取目标文件夹的文件名索引及其锁，最近最少使用的索引超出数量上限时丢弃"""
+        key = os.path.normcase(os.path.abspath(target_folder))
+        with self._lock:
+            entry = self._indexes.get(key)
+            if entry is None:
+                entry = self._indexes[key] = (TargetDirectoryIndex(), threading.Lock())
+                while len(self._indexes) > self.MAX_DIRECTORY_INDEXES:
+                    self._indexes.popitem(last=False)
+            else:
+                self._indexes.move_to_end(key)
+            return entry
+
+    def _run_job(self, job: ServiceJob):
+        """在线程池中执行任务"""
+        if job.control.is_cancelled:
+            job.summary = summarize_result({"cancelled": True})
+            job.set_state(JOB_CANCELLED, summary=job.summary)
+            return
+
+        job.set_state(JOB_RUNNING)
+        spec = job.spec
+        reporter = ProgressReporter(0, job.publish_progress, interval=self._progress_interval)
+        directory_index, index_lock = self._get_directory_index(spec.target_folder)
+
+        try:
+            with index_lock:
+                reporter.start_phase(PHASE_SCAN, 0)
+                scan = scan_sources(spec.source_folders, max_depth=spec.max_depth)
+                files = scan.files
+
+                reporter.start_phase(PHASE_PLAN, len(files))
+                directory_index.refresh_stale()
+                try:
+                    plan = spec.create_classifier().plan(files, directory_index=directory_index, control=job.control)
+                except JobCancelled:
+                    directory_index.invalidate()
+                    result = {
+                        "cancelled": True,
+                        "unprocessed_files": [{"file_path": file_info[0]} for file_info in files],
+                        "total_files": len(files)
+                    }
+                else:
+                    reporter.start_phase(
+                        PHASE_COPY,
+                        plan.total_files,
+                        bytes_total=sum(operation.size for operation in plan.operations),
+                        failed_count=len(plan.failed_files)
+                    )
+                    with RunJournal.create(
+                        spec.target_folder, spec.delete_source, spec.source_folders, spec.profile
+                    ) as journal:
+                        result = plan.execute(
+                            progress_callback=reporter.update,
+                            control=job.control,
+                            file_done_callback=reporter.file_done,
+                            journal=journal
+                        )
+                    journal.add_to_result(result)
+                    result["total_files"] = plan.total_files
+                    reporter.finish()
+                    if result.get("cancelled"):
+                        directory_index.invalidate()
+                    else:
+                        directory_index.mark_current()
+        except Exception as e:
+            directory_index.invalidate()
+            job.error = f"分类失败: {str(e)}"
+            job.set_state(JOB_FAILED, error=job.error)
+            return
+
+        job.summary = summarize_result(scan.add_breakdown(result))
+        job.set_state(JOB_CANCELLED if job.summary["cancelled"] else JOB_COMPLETED, summary=job.summary)
+
+
+def is_loopback_host(host: str) -> bool:
+    """主机名是否为本机回环地址（localhost、127.0.0.0/8、::1）"""
+    if host.lower() == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def _parse_hostname(value: str) -> str:
+    """从 Host 或 Origin 头中取出主机名（去掉协议、端口和 IPv6 的方括号）"""
+    if "://" not in value:
+        value = "//" + value
+    try:
+        return (urlsplit(value).hostname or "").lower()
+    except ValueError:
+        return ""
+
+
+class ServiceRequestHandler(BaseHTTPRequestHandler):
+    """任务服务的 HTTP 请求处理"""
+
+    server_version = "EasyFc"
+
+    @property
+    def service(self) -> ClassificationService:
+        return self.server.service
+
+    def _send_json(self, status: HTTPStatus, data):
+        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status: HTTPStatus, message: str):
+        self._send_json(status, {"error": message})
+
+    def _authorize(self) -> bool:
+        """
+        检查 Host、Origin 和令牌，不通过时发送错误响应
+
+        Returns:
+            是否允许处理请求
+        """
+        host = _parse_hostname(self.headers.get("Host", ""))
+        if not is_loopback_host(host) and host != self.server.bind_host:
+            self._send_error(HTTPStatus.FORBIDDEN, "Host 不是本机地址")
+            return False
+
+        origin = self.headers.get("Origin")
+        if origin is not None and not is_loopback_host(_parse_hostname(origin)):
+            self._send_error(HTTPStatus.FORBIDDEN, "不允许跨域请求")
+            return False
+
+        scheme, _, token = self.headers.get("Authorization", "").partition(" ")
+        if scheme.lower() != "bearer" or not hmac.compare_digest(token.strip().encode(), self.server.token.encode()):
+            self._send_error(HTTPStatus.UNAUTHORIZED, "令牌无效，请在 Authorization 头中提供 Bearer 令牌")
+            return False
+        return True
+
+    def _read_json(self) -> dict:
+        """
+        读取请求体
+
+        Raises:
+            ValueError: 请求体过大或不是 JSON 对象
+        """
+        length = int(self.headers.get("Content-Length") or 0)
+        if length < 0:
+            raise ValueError("Content-Length 无效")
+        if length > MAX_REQUEST_BYTES:
+            raise ValueError("请求体过大")
+        try:
+            data = json.loads(self.rfile.read(length) or b"{}")
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            raise ValueError(f"请求体不是有效的 JSON: {str(e)}")
+        if not isinstance(data, dict):
+            raise ValueError("请求体必须是 JSON 对象")
+        return data
+
+    def _route(self) -> tuple[list[str], dict]:
+        url = urlsplit(self.path)
+        return [part for part in url.path.split("/") if part], parse_qs(url.query)
+
+    def _find_job(self, job_id: str) -> Optional[ServiceJob]:
+        job = self.service.get_job(job_id)
+        if job is None:
+            self._send_error(HTTPStatus.NOT_FOUND, f"任务不存在: {job_id}")
+        return job
+
+    def do_GET(self):
+        if not self._authorize():
+            return
+        parts, query = self._route()
+        if parts == ["classifiers"]:
+            self._send_json(HTTPStatus.OK, {"classifiers": available_classifiers()})
+        elif parts == ["jobs"]:
+            self._send_json(HTTPStatus.OK, {"jobs": [job.to_dict() for job in self.service.list_jobs()]})
+        elif len(parts) == 2 and parts[0] == "jobs":
+            job = self._find_job(parts[1])
+            if job is not None:
+                self._send_json(HTTPStatus.OK, job.to_dict(include_spec=True))
+        elif len(parts) == 3 and parts[0] == "jobs" and parts[2] == "events":
+            job = self._find_job(parts[1])
+            if job is not None:
+                try:
+                    after = int(query.get("after", ["0"])[0])
+                except ValueError:
+                    self._send_error(HTTPStatus.BAD_REQUEST, "after 必须是整数")
+                    return
+                self._stream_events(job, after)
+        else:
+            self._send_error(HTTPStatus.NOT_FOUND, "接口不存在")
+
+    def do_POST(self):
+        if not self._authorize():
+            return
+        parts, _ = self._route()
+        if parts != ["jobs"]:
+            self._send_error(HTTPStatus.NOT_FOUND, "接口不存在")
+            return
+        # 浏览器跨域提交的 text/plain、表单等“简单请求”不经过预检，必须在此拒绝
+        content_type = self.headers.get("Content-Type", "").split(";")[0].strip().lower()
+        if content_type != "application/json":
+            self._send_error(HTTPStatus.UNSUPPORTED_MEDIA_TYPE, "Content-Type 必须是 application/json")
+            return
+        try:
+            job = self.service.submit(self._read_json())
+        except ValueError as e:
+            self._send_error(HTTPStatus.BAD_REQUEST, str(e))
+            return
+        self._send_json(HTTPStatus.CREATED, job.to_dict())
+
+    def do_DELETE(self):
+        if not self._authorize():
+            return
+        parts, _ = self._route()
+        if len(parts) != 2 or parts[0] != "jobs":
+            self._send_error(HTTPStatus.NOT_FOUND, "接口不存在")
+            return
+        if self.service.get_job(parts[1]) is None:
+            self._send_error(HTTPStatus.NOT_FOUND, f"任务不存在: {parts[1]}")
+            return
+        self._send_json(HTTPStatus.ACCEPTED, self.service.cancel_job(parts[1]).to_dict())
+
+    def _stream_events(self, job: ServiceJob, after: int):
+        """以 JSON Lines 持续推送事件，任务结束后关闭连接"""
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "application/x-ndjson; charset=utf-8")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.close_connection = True
+
+        try:
+            while True:
+                events = job.events_after(after, EVENTS_WAIT_SECONDS)
+                for event in events:
+                    self.wfile.write((json.dumps(event, ensure_ascii=False) + "\n").encode("utf-8"))
+                    after = event["seq"]
+                self.wfile.flush()
+                if not events and job.is_finished:
+                    break
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+class ServiceHTTPServer(ThreadingHTTPServer):
+    """每个连接一个线程的 HTTP 服务，持有分类任务服务和访问令牌"""
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], service: ClassificationService, token: str):
+        """
+        Args:
+            address: 监听地址
+            service: 分类任务服务
+            token: 访问令牌，不能为空
+        """
+        if not token:
+            raise ValueError("访问令牌不能为空")
+        super().__init__(address, ServiceRequestHandler)
+        self.service = service
+        self.token = token
+        self.bind_host = address[0].lower()
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """
+    服务入口
+
+    Returns:
+        退出码
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m easyfc.server",
+        description="本地分类任务服务，通过 HTTP/JSON 提交任务、查询状态和接收进度"
+    )
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"监听地址（默认: {DEFAULT_HOST}，仅本机可访问）")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"监听端口（默认: {DEFAULT_PORT}）")
+    parser.add_argument(
+        "--workers", type=int, default=ClassificationService.DEFAULT_MAX_WORKERS,
+        help=f"同时运行的任务数（默认: {ClassificationService.DEFAULT_MAX_WORKERS}）"
+    )
+    parser.add_argument("--interval", type=float, default=0.5, help="进度事件的最小间隔秒数（默认: 0.5）")
+    parser.add_argument(
+        "--token",
+        default=os.environ.get(TOKEN_ENV, ""),
+        help=f"访问令牌（默认读取环境变量 {TOKEN_ENV}，都未指定时每次启动随机生成）"
+    )
+    args = parser.parse_args(argv)
+
+    token = args.token
+    if not is_loopback_host(args.host) and not token:
+        print(f"错误: 监听非本机地址 {args.host} 时必须用 --token 或 {TOKEN_ENV} 指定访问令牌", file=sys.stderr)
+        return 2
+    generated_token = not token
+    if generated_token:
+        token = secrets.token_urlsafe(24)
+
+    for error in load_plugins()[1]:
+        print(f"警告: {error}", file=sys.stderr)
+
+    service = ClassificationService(max_workers=args.workers, progress_interval=args.interval)
+    try:
+        server = ServiceHTTPServer((args.host, args.port), service, token)
+    except OSError as e:
+        print(f"错误: 无法监听 {args.host}:{args.port}: {e}", file=sys.stderr)
+        service.shutdown()
+        return 2
+
+    print(f"服务已启动: http://{args.host}:{server.server_address[1]}", file=sys.stderr)
+    if generated_token:
+        print(f"访问令牌: {token}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -46,10 +46,15 @@ def main() -> int:
     main_window.setWindowIcon(app_icon)
 
     viewmodel.progress_updated.connect(main_window._on_progress_updated)
+    viewmodel.metrics_updated.connect(main_window._on_metrics_updated)
     viewmodel.status_changed.connect(main_window._on_status_changed)
     viewmodel.classification_started.connect(main_window._on_classification_started)
     viewmodel.classification_finished.connect(main_window._on_classification_finished)
+    viewmodel.plan_ready.connect(main_window._on_plan_ready)
+    viewmodel.paused_changed.connect(main_window._on_paused_changed)
+    viewmodel.classification_failed.connect(main_window._on_classification_failed)
     viewmodel.error_occurred.connect(main_window._on_error_occurred)
+    viewmodel.extension_profile_changed.connect(main_window._on_extension_profile_changed)
 
     main_window.show()
 
@@ -1,3 +1,42 @@
-from .file_classifier import DelimiterClassifier, ExtensionClassifier, FileClassifier
+from .classification_plan import ClassificationPlan, PlanOperation, TargetDirectoryIndex
+from .classifier_registry import (
+    available_classifiers,
+    check_classifier_options,
+    create_classifier,
+    get_classifier_class,
+    load_plugins,
+    register_classifier,
+)
+from .failures import build_failure, count_failures, describe_failure
+from .file_classifier import DateClassifier, DelimiterClassifier, ExtensionClassifier, FileClassifier
+from .job_spec import JobSpec
+from .progress import ProgressReporter, ProgressSnapshot
+from .run_journal import JournalUndoer, RunJournal, list_journals
+from .source_scan import SourceScan, scan_sources
 
-__all__ = ["FileClassifier", "ExtensionClassifier", "DelimiterClassifier"]
+__all__ = [
+    "FileClassifier",
+    "ExtensionClassifier",
+    "DelimiterClassifier",
+    "DateClassifier",
+    "ClassificationPlan",
+    "PlanOperation",
+    "TargetDirectoryIndex",
+    "register_classifier",
+    "get_classifier_class",
+    "available_classifiers",
+    "create_classifier",
+    "check_classifier_options",
+    "load_plugins",
+    "JobSpec",
+    "build_failure",
+    "describe_failure",
+    "count_failures",
+    "ProgressReporter",
+    "ProgressSnapshot",
+    "RunJournal",
+    "JournalUndoer",
+    "list_journals",
+    "SourceScan",
+    "scan_sources",
+]
@@ -0,0 +1,388 @@
+"""分类计划：先在内存中计算完整的移动方案，再按方案执行"""
+
+import os
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from utils.file_utils import (
+    OP_COPY,
+    OP_MKDIR,
+    FileOperationError,
+    create_dir_if_not_exists,
+    remove_source_file,
+    transfer_file,
+)
+from utils.job_control import JobCancelled, JobControl
+from utils.retry_queue import RetryQueue
+
+from .failures import build_copy_failure
+
+
+def execute_operation(
+    source_path: str,
+    target_path: str,
+    delete_source: bool,
+    created_dirs: dict,
+    control: Optional[JobControl] = None,
+    journal=None,
+    copied_path: str = ""
+) -> Optional[FileOperationError]:
+    """
+    执行单个复制/移动操作
+
+    Args:
+        source_path: 源文件路径
+        target_path: 目标文件路径
+        delete_source: 是否删除源文件
+        created_dirs: 目录创建结果缓存，键为目录路径，值为创建失败的异常，可用时为 None
+        control: 任务控制句柄，大文件复制时在数据块之间检查暂停和取消
+        journal: 运行日志（RunJournal），成功后记录实际写入的路径，用于撤销
+        copied_path: 重试删除源文件时为上次已复制完成的目标路径，只删除源文件不再复制
+
+    Returns:
+        失败时返回错误，成功时为 None
+
+    Raises:
+        JobCancelled: 任务被取消
+    """
+    if copied_path:
+        try:
+            remove_source_file(source_path, copied_path)
+        except FileOperationError as e:
+            return e
+        if journal is not None:
+            journal.record(source_path, copied_path, True)
+        return None
+
+    category_dir = os.path.dirname(target_path)
+    if category_dir not in created_dirs:
+        try:
+            create_dir_if_not_exists(category_dir)
+            created_dirs[category_dir] = None
+        except OSError as e:
+            created_dirs[category_dir] = e
+
+    dir_error = created_dirs[category_dir]
+    if dir_error is not None:
+        return FileOperationError(OP_MKDIR, dir_error)
+
+    checkpoint = control.checkpoint if control is not None else None
+    try:
+        actual_path = transfer_file(source_path, target_path, delete_source, checkpoint=checkpoint)
+    except JobCancelled:
+        raise
+    except FileOperationError as e:
+        return e
+    except Exception as e:
+        return FileOperationError(OP_COPY, e)
+
+    if journal is not None:
+        journal.record(source_path, actual_path, delete_source)
+    return None
+
+
+def defer_operation(
+    retry_queue: RetryQueue,
+    item,
+    error: FileOperationError,
+    attempts: int,
+    created_dirs: dict
+) -> bool:
+    """
+    暂时性错误放入延迟重试队列
+
+    Args:
+        retry_queue: 延迟重试队列
+        item: 重试所需的数据，由调用方定义
+        error: 本次失败的错误
+        attempts: 已尝试的次数
+        created_dirs: 目录创建结果缓存，创建目录失败时清除缓存，重试时重新创建
+
+    Returns:
+        已放入队列时返回 True，否则应记为失败
+    """
+    if not retry_queue.defer(item, error, attempts):
+        return False
+    if error.operation == OP_MKDIR:
+        for directory, dir_error in list(created_dirs.items()):
+            if dir_error is error.error:
+                del created_dirs[directory]
+    return True
+
+
+def abandon_operation(source_path: str, error: FileOperationError, journal=None):
+    """
+    放弃操作（最终失败或取消时仍在重试队列中）
+
+    删除源文件失败时目标文件已完整复制，按复制记入运行日志，撤销时删除该副本。
+    """
+    if journal is not None and error.target_path:
+        journal.record(source_path, error.target_path, False)
+
+
+def build_operation_failure(
+    file_path: str,
+    file_name: str,
+    error: FileOperationError,
+    attempts: int,
+    target_category: str = ""
+) -> dict:
+    """构建操作失败记录，错误码为失败的操作（mkdir、copy 或 remove）"""
+    return build_copy_failure(file_path, file_name, error.operation, error.errno, attempts, target_category)
+
+
+@dataclass
+class PlanOperation:
+    """单个文件的复制/移动操作"""
+    source_path: str
+    file_name: str
+    category: str
+    target_path: str
+    size: int
+    mtime: float
+
+    @property
+    def is_renamed(self) -> bool:
+        """是否因目标目录重名而改名"""
+        return os.path.basename(self.target_path) != self.file_name
+
+
+class TargetDirectoryIndex:
+    """
+    目标目录文件名索引，用于在内存中解决重名
+
+    每个目录只列举一次，之后的重名判断只查内存；索引可在多次计划之间复用。
+    复用时在每次计划前调用 refresh_stale、执行后调用 mark_current，
+    只有被其他程序改动过的目录才会重新列举。
+    """
+
+    def __init__(self):
+        self._names: dict[str, set[str]] = {}
+        self._mtimes: dict[str, int] = {}
+
+    @staticmethod
+    def _get_mtime(directory: str) -> int:
+        try:
+            return os.stat(directory).st_mtime_ns
+        except OSError:
+            return -1
+
+    def _get_names(self, directory: str) -> set[str]:
+        """获取目录中已占用的文件名（按平台规则规范化大小写）"""
+        names = self._names.get(directory)
+        if names is None:
+            self._mtimes[directory] = self._get_mtime(directory)
+            try:
+                names = {os.path.normcase(name) for name in os.listdir(directory)}
+            except OSError:
+                names = set()
+            self._names[directory] = names
+        return names
+
+    def refresh_stale(self):
+        """丢弃列举之后被修改过的目录，下次使用时重新列举"""
+        for directory, mtime in list(self._mtimes.items()):
+            if self._get_mtime(directory) != mtime:
+                self.invalidate(directory)
+
+    def mark_current(self):
+        """
+        方案执行完成后记录各目录当前的修改时间
+
+        执行时写入的文件名已在 reserve 时加入索引，因此执行本身造成的修改不会使索引失效。
+        """
+        for directory in self._names:
+            self._mtimes[directory] = self._get_mtime(directory)
+
+    def reserve(self, directory: str, file_name: str) -> str:
+        """
+        在目录中预留文件名，重名时在文件名后添加编号
+
+        Args:
+            directory: 目标目录
+            file_name: 原始文件名
+
+        Returns:
+            预留后的文件名
+        """
+        names = self._get_names(directory)
+        candidate = file_name
+        if os.path.normcase(candidate) in names:
+            name, ext = os.path.splitext(file_name)
+            counter = 1
+            while True:
+                candidate = f"{name} ({counter}){ext}"
+                if os.path.normcase(candidate) not in names:
+                    break
+                counter += 1
+
+        names.add(os.path.normcase(candidate))
+        return candidate
+
+    def invalidate(self, directory: Optional[str] = None):
+        """使缓存的目录列表失效，不指定目录时全部失效"""
+        if directory is None:
+            self._names.clear()
+            self._mtimes.clear()
+        else:
+            self._names.pop(directory, None)
+            self._mtimes.pop(directory, None)
+
+
+@dataclass
+class ClassificationPlan:
+    """完整的分类方案，可直接执行"""
+    target_dir: str
+    delete_source: bool
+    total_files: int = 0
+    operations: list[PlanOperation] = field(default_factory=list)
+    failed_files: list[dict] = field(default_factory=list)
+
+    @property
+    def conflict_count(self) -> int:
+        """重名改名的文件数量"""
+        return sum(1 for operation in self.operations if operation.is_renamed)
+
+    @property
+    def skipped_count(self) -> int:
+        """无需处理的文件数量"""
+        return self.total_files - len(self.operations) - len(self.failed_files)
+
+    def get_summary(self) -> dict:
+        """
+        获取方案摘要
+
+        Returns:
+            包含文件数、字节数、各分类统计和重名数量的字典
+        """
+        categories: dict[str, dict] = {}
+        total_bytes = 0
+        for operation in self.operations:
+            stats = categories.get(operation.category)
+            if stats is None:
+                stats = categories[operation.category] = {"count": 0, "bytes": 0}
+            stats["count"] += 1
+            stats["bytes"] += operation.size
+            total_bytes += operation.size
+
+        return {
+            "total_files": self.total_files,
+            "planned_count": len(self.operations),
+            "failed_count": len(self.failed_files),
+            "skipped_count": self.skipped_count,
+            "total_bytes": total_bytes,
+            "conflict_count": self.conflict_count,
+            "categories": categories,
+        }
+
+    def execute(
+        self,
+        progress_callback: Optional[Callable[[int, str], None]] = None,
+        control: Optional[JobControl] = None,
+        file_done_callback: Optional[Callable[[int, bool], None]] = None,
+        journal=None
+    ) -> dict:
+        """
+        执行方案
+
+        暂时性错误（文件被占用、网络存储超时等）的文件放入延迟重试队列，
+        其余文件处理完后再按指数退避重试。
+
+        Args:
+            progress_callback: 进度回调函数，参数为(已处理数量, 当前文件名)
+            control: 任务控制句柄，每个文件之前及大文件的数据块之间检查暂停和取消
+            file_done_callback: 单个文件完成回调，参数为(文件字节数, 是否成功)
+            journal: 运行日志（RunJournal），记录每个成功的操作，用于撤销
+
+        Returns:
+            处理结果字典，包含进入重试队列的文件数量 retried_count；
+            任务被取消时包含 cancelled 和未处理的 unprocessed_files
+        """
+        result = {
+            "success_count": 0,
+            "failed_count": len(self.failed_files),
+            "failed_files": list(self.failed_files),
+            "success_files": []
+        }
+
+        created_dirs: dict[str, Optional[OSError]] = {}
+        retry_queue = RetryQueue()
+        processed_offset = self.total_files - len(self.operations)
+
+        def finish(operation: PlanOperation, error: Optional[FileOperationError], attempts: int):
+            if error is not None:
+                abandon_operation(operation.source_path, error, journal)
+                result["failed_count"] += 1
+                result["failed_files"].append(
+                    build_operation_failure(
+                        operation.source_path, operation.file_name, error, attempts, operation.category
+                    )
+                )
+            else:
+                result["success_count"] += 1
+                result["success_files"].append({
+                    "file_path": operation.source_path,
+                    "file_name": operation.file_name,
+                    "category": operation.category
+                })
+
+            if file_done_callback:
+                file_done_callback(operation.size, error is None)
+
+        def cancel(remaining: list[PlanOperation]) -> dict:
+            for (operation, error), _ in retry_queue.pending():
+                abandon_operation(operation.source_path, error, journal)
+            result["cancelled"] = True
+            result["unprocessed_files"] = [
+                {"file_path": operation.source_path, "file_name": operation.file_name}
+                for operation in remaining + [operation for (operation, _), _ in retry_queue.pending()]
+            ]
+            result["retried_count"] = retry_queue.deferred_count
+            return result
+
+        for index, operation in enumerate(self.operations):
+            if progress_callback:
+                progress_callback(processed_offset + index + 1, operation.file_name)
+
+            try:
+                if control is not None:
+                    control.checkpoint()
+                error = execute_operation(
+                    operation.source_path,
+                    operation.target_path,
+                    self.delete_source,
+                    created_dirs,
+                    control,
+                    journal
+                )
+            except JobCancelled:
+                return cancel(self.operations[index:])
+
+            if error is not None and defer_operation(retry_queue, (operation, error), error, 1, created_dirs):
+                continue
+            finish(operation, error, 1)
+
+        retrying: list[PlanOperation] = []
+        try:
+            for (operation, previous_error), attempts in retry_queue.drain(control):
+                retrying = [operation]
+                error = execute_operation(
+                    operation.source_path,
+                    operation.target_path,
+                    self.delete_source,
+                    created_dirs,
+                    control,
+                    journal,
+                    copied_path=previous_error.target_path
+                )
+                retrying = []
+                if error is not None and defer_operation(
+                    retry_queue, (operation, error), error, attempts + 1, created_dirs
+                ):
+                    continue
+                finish(operation, error, attempts + 1)
+        except JobCancelled:
+            return cancel(retrying)
+
+        result["retried_count"] = retry_queue.deferred_count
+        return result
@@ -0,0 +1,173 @@
+"""分类器注册表与插件加载"""
+
+import importlib.util
+import inspect
+import sys
+import types
+import typing
+from pathlib import Path
+from typing import Optional
+
+from utils.path_utils import get_plugins_path
+
+_CLASSIFIERS: dict[str, type] = {}
+
+# 由任务规格的同名字段传入，不能出现在分类器参数中
+_RESERVED_OPTIONS = ("target_dir", "delete_source", "path_template")
+
+
+def register_classifier(name: str, display_name: Optional[str] = None):
+    """
+    注册分类器的类装饰器
+
+    Args:
+        name: 分类器名称，任务通过该名称选择分类器
+        display_name: 界面显示名称，默认与名称相同
+
+    Raises:
+        ValueError: 名称为空或已被其他分类器占用
+    """
+    if not name:
+        raise ValueError("分类器名称不能为空")
+
+    def decorator(cls: type) -> type:
+        existing = _CLASSIFIERS.get(name)
+        if existing is not None and existing.__qualname__ != cls.__qualname__:
+            raise ValueError(f"分类器名称 '{name}' 已被注册")
+        cls.name = name
+        cls.display_name = display_name or name
+        _CLASSIFIERS[name] = cls
+        return cls
+
+    return decorator
+
+
+def get_classifier_class(name: str) -> type:
+    """
+    根据名称获取分类器类
+
+    Raises:
+        ValueError: 分类器未注册
+    """
+    if name not in _CLASSIFIERS:
+        raise ValueError(f"未知的分类器: {name}")
+    return _CLASSIFIERS[name]
+
+
+def available_classifiers() -> list[str]:
+    """获取已注册的分类器名称（按注册顺序）"""
+    return list(_CLASSIFIERS.keys())
+
+
+def create_classifier(name: str, target_dir: str, **options):
+    """
+    按名称创建分类器
+
+    Args:
+        name: 分类器名称
+        target_dir: 目标目录
+        options: 传递给分类器构造函数的关键字参数
+
+    Returns:
+        分类器实例
+    """
+    return get_classifier_class(name)(target_dir=target_dir, **options)
+
+
+def _annotation_types(annotation) -> tuple:
+    """把参数注解转换为可用于 isinstance 的类型元组，无法检查的注解返回空元组"""
+    if isinstance(annotation, type):
+        return (float, int) if annotation is float else (annotation,)
+    if typing.get_origin(annotation) in (typing.Union, types.UnionType):
+        result = ()
+        for arg in typing.get_args(annotation):
+            arg_types = _annotation_types(arg)
+            if not arg_types:
+                return ()
+            result += arg_types
+        return result
+    return ()
+
+
+def check_classifier_options(name: str, options: dict):
+    """
+    按分类器构造函数的签名检查参数名和参数类型，供任务提交时提前发现错误
+
+    构造函数接受 **kwargs 时不检查未知参数，注解无法解析时不检查类型。
+
+    Args:
+        name: 分类器名称
+        options: 传递给分类器构造函数的关键字参数
+
+    Raises:
+        ValueError: 分类器未注册，或参数未知、类型不符
+    """
+    init = get_classifier_class(name).__init__
+    parameters = inspect.signature(init).parameters
+    accepts_any = any(parameter.kind == inspect.Parameter.VAR_KEYWORD for parameter in parameters.values())
+    try:
+        hints = typing.get_type_hints(init)
+    except Exception:
+        hints = {}
+
+    for key, value in options.items():
+        if key in _RESERVED_OPTIONS:
+            raise ValueError(f"参数 {key} 不能放在分类器参数中")
+        parameter = parameters.get(key)
+        if parameter is None or parameter.kind not in (
+            inspect.Parameter.POSITIONAL_OR_KEYWORD, inspect.Parameter.KEYWORD_ONLY
+        ):
+            if accepts_any:
+                continue
+            raise ValueError(f"分类器 {name} 不支持参数: {key}")
+        expected = _annotation_types(hints.get(key))
+        if not expected:
+            continue
+        # JSON 的 true/false 不能当作数字
+        if isinstance(value, bool) and bool not in expected:
+            valid = False
+        else:
+            valid = isinstance(value, expected)
+        if not valid:
+            type_names = "、".join(t.__name__ for t in expected if t is not type(None))
+            raise ValueError(f"分类器 {name} 的参数 {key} 类型无效，应为 {type_names}")
+
+
+def load_plugins(plugin_dir: Optional[str] = None) -> tuple[list[str], list[str]]:
+    """
+    加载插件目录下的分类器模块
+
+    插件模块使用 register_classifier 装饰 FileClassifier 子类并实现 categorize_batch。
+    以下划线开头的文件会被忽略，单个插件加载失败不影响其他插件。
+
+    Args:
+        plugin_dir: 插件目录，默认为应用根目录下的 plugins
+
+    Returns:
+        (新注册的分类器名称列表, 错误信息列表)
+    """
+    directory = Path(plugin_dir) if plugin_dir else get_plugins_path()
+    if not directory.is_dir():
+        return [], []
+
+    before = set(_CLASSIFIERS)
+    errors = []
+    for plugin_path in sorted(directory.glob("*.py")):
+        if plugin_path.name.startswith("_"):
+            continue
+
+        module_name = f"easyfc_plugins.{plugin_path.stem}"
+        if module_name in sys.modules:
+            continue
+
+        try:
+            spec = importlib.util.spec_from_file_location(module_name, plugin_path)
+            module = importlib.util.module_from_spec(spec)
+            sys.modules[module_name] = module
+            spec.loader.exec_module(module)
+        except Exception as e:
+            sys.modules.pop(module_name, None)
+            errors.append(f"加载插件 '{plugin_path.name}' 失败: {str(e)}")
+
+    loaded = [name for name in _CLASSIFIERS if name not in before]
+    return loaded, errors
@@ -0,0 +1,269 @@
+"""失败记录：错误码、阶段与按错误码/错误类别/目标分类的统计
+
+失败记录只保存错误码、errno、所处阶段和文件的目标分类，不保存错误说明文字，说明在显示时
+由 describe_failure 按错误码查表生成；统计时按错误码、错误类别或目标分类分组计数即可，
+无需解析文字。记录结构：
+
+    {"file_path": "...", "file_name": "...", "code": "copy", "errno": 13, "phase": "copy",
+     "target_category": "文本文件"}
+
+target_category 为文件要放入的分类目录（相对目标文件夹），生成方案阶段尚未确定分类的
+失败为空字符串。重试过的文件另有 attempts（尝试次数）。
+"""
+
+import errno as errno_codes
+from collections import Counter
+from typing import Iterable, Optional
+
+from utils.file_utils import OP_COPY, OP_MKDIR, OP_REMOVE, TRANSIENT_ERRNOS
+
+from .progress import PHASE_COPY, PHASE_PLAN, PHASE_UNDO
+
+ERR_STAT = "stat"
+ERR_NO_CATEGORY = "no_category"
+ERR_PLAN_FAILED = "plan_failed"
+ERR_SOURCE_MISSING = "source_missing"
+ERR_SOURCE_CHANGED = "source_changed"
+ERR_MKDIR = OP_MKDIR
+ERR_COPY = OP_COPY
+ERR_REMOVE = OP_REMOVE
+ERR_TARGET_MISSING = "target_missing"
+ERR_TARGET_MODIFIED = "target_modified"
+ERR_SOURCE_EXISTS = "source_exists"
+ERR_RESTORE = "restore"
+ERR_UNKNOWN = "unknown"
+
+FAILURE_MESSAGES = {
+    ERR_STAT: "读取文件信息失败",
+    ERR_NO_CATEGORY: "无法提取分类名称：未找到指定位置的分隔符",
+    ERR_PLAN_FAILED: "生成方案时已失败",
+    ERR_SOURCE_MISSING: "源文件不存在",
+    ERR_SOURCE_CHANGED: "源文件在生成方案后已变化",
+    ERR_MKDIR: "创建目录失败",
+    ERR_COPY: "复制文件失败",
+    ERR_REMOVE: "删除源文件失败",
+    ERR_TARGET_MISSING: "分类后的文件不存在",
+    ERR_TARGET_MODIFIED: "文件在分类后已被修改",
+    ERR_SOURCE_EXISTS: "原位置已存在同名文件",
+    ERR_RESTORE: "撤销失败",
+    ERR_UNKNOWN: "未知错误",
+}
+
+CATEGORY_PERMISSION = "permission"
+CATEGORY_NOT_FOUND = "not_found"
+CATEGORY_NO_SPACE = "no_space"
+CATEGORY_BUSY = "busy"
+CATEGORY_INVALID_NAME = "invalid_name"
+CATEGORY_IO = "io"
+CATEGORY_RULE = "rule"
+CATEGORY_CHANGED = "changed"
+CATEGORY_OTHER = "other"
+
+CATEGORY_NAMES = {
+    CATEGORY_PERMISSION: "权限不足",
+    CATEGORY_NOT_FOUND: "文件或目录不存在",
+    CATEGORY_NO_SPACE: "磁盘空间不足",
+    CATEGORY_BUSY: "文件被占用或暂时不可用",
+    CATEGORY_INVALID_NAME: "文件名无效或过长",
+    CATEGORY_IO: "读写错误",
+    CATEGORY_RULE: "不符合分类规则",
+    CATEGORY_CHANGED: "文件已变化",
+    CATEGORY_OTHER: "其他错误",
+}
+
+
+def _errnos(*names: str) -> frozenset:
+    return frozenset(getattr(errno_codes, name) for name in names if hasattr(errno_codes, name))
+
+
+ERRNO_CATEGORIES = (
+    (_errnos("EACCES", "EPERM", "EROFS"), CATEGORY_PERMISSION),
+    (_errnos("ENOENT", "ENOTDIR"), CATEGORY_NOT_FOUND),
+    (_errnos("ENOSPC", "EDQUOT", "EFBIG"), CATEGORY_NO_SPACE),
+    (TRANSIENT_ERRNOS, CATEGORY_BUSY),
+    (_errnos("ENAMETOOLONG", "EINVAL", "EILSEQ"), CATEGORY_INVALID_NAME),
+    (_errnos("EIO"), CATEGORY_IO),
+)
+
+# 没有 errno 时按错误码归类
+CODE_CATEGORIES = {
+    ERR_NO_CATEGORY: CATEGORY_RULE,
+    ERR_SOURCE_MISSING: CATEGORY_NOT_FOUND,
+    ERR_TARGET_MISSING: CATEGORY_NOT_FOUND,
+    ERR_SOURCE_CHANGED: CATEGORY_CHANGED,
+    ERR_TARGET_MODIFIED: CATEGORY_CHANGED,
+    ERR_SOURCE_EXISTS: CATEGORY_CHANGED,
+}
+
+
+def build_failure(
+    file_path: str,
+    file_name: str,
+    code: str,
+    phase: str,
+    errno: Optional[int] = None,
+    attempts: int = 1,
+    target_category: str = ""
+) -> dict:
+    """
+    构建失败记录
+
+    Args:
+        file_path: 文件路径
+        file_name: 文件名
+        code: 错误码（ERR_*）
+        phase: 所处阶段（PHASE_PLAN、PHASE_COPY 或 PHASE_UNDO）
+        errno: 系统错误码，没有时为 None
+        attempts: 尝试次数，大于 1 时才写入记录
+        target_category: 文件的目标分类（相对目标文件夹的分类目录），未确定时为空字符串
+
+    Returns:
+        失败记录字典
+    """
+    record = {
+        "file_path": file_path,
+        "file_name": file_name,
+        "code": code,
+        "errno": errno,
+        "phase": phase,
+        "target_category": target_category,
+    }
+    if attempts > 1:
+        record["attempts"] = attempts
+    return record
+
+
+def build_plan_failure(file_path: str, file_name: str, code: str, errno: Optional[int] = None) -> dict:
+    """构建生成方案阶段的失败记录"""
+    return build_failure(file_path, file_name, code, PHASE_PLAN, errno)
+
+
+def build_copy_failure(
+    file_path: str,
+    file_name: str,
+    code: str,
+    errno: Optional[int] = None,
+    attempts: int = 1,
+    target_category: str = ""
+) -> dict:
+    """构建复制/移动阶段的失败记录"""
+    return build_failure(file_path, file_name, code, PHASE_COPY, errno, attempts, target_category)
+
+
+def build_undo_failure(
+    file_path: str,
+    file_name: str,
+    code: str,
+    errno: Optional[int] = None,
+    target_category: str = ""
+) -> dict:
+    """构建撤销阶段的失败记录"""
+    return build_failure(file_path, file_name, code, PHASE_UNDO, errno, target_category=target_category)
+
+
+def get_failure_category(record: dict) -> str:
+    """
+    失败记录的错误类别：有 errno 时按 errno 归类，否则按错误码归类
+
+    Returns:
+        CATEGORY_* 之一
+    """
+    error_number = record.get("errno")
+    if error_number is not None:
+        for errnos, category in ERRNO_CATEGORIES:
+            if error_number in errnos:
+                return category
+    return CODE_CATEGORIES.get(record.get("code"), CATEGORY_OTHER)
+
+
+def describe_failure(record: dict) -> str:
+    """
+    生成失败记录的说明文字，显示时调用
+
+    Args:
+        record: 失败记录
+
+    Returns:
+        如 "复制文件失败（权限不足）"；旧版本保存的只有说明文字的记录原样返回
+    """
+    if "code" not in record and record.get("error"):
+        return record["error"]
+    message = FAILURE_MESSAGES.get(record.get("code"), FAILURE_MESSAGES[ERR_UNKNOWN])
+    if record.get("errno") is not None:
+        category = get_failure_category(record)
+        if category != CODE_CATEGORIES.get(record.get("code")):
+            message = f"{message}（{CATEGORY_NAMES[category]}）"
+    if record.get("attempts", 1) > 1:
+        message = f"{message}，已尝试 {record['attempts']} 次"
+    return message
+
+
+def count_failures(failed_files: Iterable[dict]) -> dict:
+    """
+    按错误码、错误类别和目标分类统计失败数量
+
+    Args:
+        failed_files: 失败记录列表
+
+    Returns:
+        {"by_code": {错误码: 数量}, "by_category": {错误类别: 数量}, "by_target": {目标分类: 数量}}，
+        按数量从多到少排列；by_target 不包含尚未确定目标分类的失败
+    """
+    by_code = Counter()
+    by_category = Counter()
+    by_target = Counter()
+    for record in failed_files:
+        by_code[record.get("code", ERR_UNKNOWN)] += 1
+        by_category[get_failure_category(record)] += 1
+        if record.get("target_category"):
+            by_target[record["target_category"]] += 1
+    return {
+        "by_code": dict(by_code.most_common()),
+        "by_category": dict(by_category.most_common()),
+        "by_target": dict(by_target.most_common()),
+    }
+
+
+def merge_failure_counts(total: dict, failure_counts: dict) -> dict:
+    """
+    将一批的统计累加到总计中（监视模式逐批累计）
+
+    Args:
+        total: 累计的统计，原地修改
+        failure_counts: count_failures 的结果
+
+    Returns:
+        total
+    """
+    for key in ("by_code", "by_category", "by_target"):
+        counts = total.setdefault(key, {})
+        for name, count in failure_counts.get(key, {}).items():
+            counts[name] = counts.get(name, 0) + count
+    return total
+
+
+def format_failure_counts(failure_counts: dict) -> str:
+    """
+    生成按错误类别统计的说明文字
+
+    Returns:
+        如 "权限不足 12 个，磁盘空间不足 3 个"，没有失败时为空字符串
+    """
+    return "，".join(
+        f"{CATEGORY_NAMES.get(category, category)} {count} 个"
+        for category, count in failure_counts.get("by_category", {}).items()
+    )
+
+
+def format_failure_targets(failure_counts: dict, limit: int = 5) -> str:
+    """
+    生成按目标分类统计的说明文字，只列出失败最多的 limit 个分类
+
+    Returns:
+        如 "文本文件 12 个，2024/03 3 个"，没有失败或目标分类均未确定时为空字符串
+    """
+    by_target = failure_counts.get("by_target", {})
+    text = "，".join(f"{target} {count} 个" for target, count in list(by_target.items())[:limit])
+    if len(by_target) > limit:
+        text += f" 等 {len(by_target)} 个分类"
+    return text
@@ -1,29 +1,52 @@
 """文件分类器模型"""
 
 import os
-from pathlib import Path
-from typing import Callable, Optional
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Optional, Union
 
-from utils.file_utils import (
-    copy_file,
-    create_dir_if_not_exists,
-    get_extension,
-)
+from utils.file_utils import get_extension
+from utils.job_control import JobControl
+from utils.extension_trie import ExtensionSuffixTrie
+from utils.media_date_utils import read_capture_date
+
+from .classification_plan import ClassificationPlan, PlanOperation, TargetDirectoryIndex
+from .classifier_registry import register_classifier
+from .failures import ERR_NO_CATEGORY, ERR_STAT, build_plan_failure
+from .path_template import PathTemplate
 
 
 class FileClassifier:
-    """文件分类器基类"""
+    """
+    文件分类器基类
+
+    子类只需实现 categorize_batch 决定分类，目录创建和文件复制由 classify 统一完成。
+    使用 register_classifier 注册后即可按名称创建，插件目录中的分类器同样适用。
+    """
 
-    def __init__(self, target_dir: str):
+    name = ""
+    display_name = ""
+    CHUNK_SIZE = 512
+
+    def __init__(self, target_dir: str, path_template: Optional[str] = None, delete_source: bool = False):
         """
         初始化分类器
 
         Args:
             target_dir: 目标目录
+            path_template: 目标路径模板，如 "{category}/{year}"，默认为单层分类目录
+            delete_source: 是否删除源文件
         """
         if not target_dir:
             raise ValueError("target_dir参数不能为空")
         self.target_dir = target_dir
+        self.delete_source = delete_source
+        self.path_template = PathTemplate(path_template) if path_template else None
+        if self.path_template and self.path_template.is_default:
+            self.path_template = None
+        self._category_dirs: dict[str, str] = {}
         self.result = {
             "success_count": 0,
             "failed_count": 0,
@@ -31,14 +54,10 @@ class FileClassifier:
             "success_files": []
         }
 
-    def _add_failed_file(self, file_path: str, file_name: str, error: str):
-        """添加失败文件记录"""
+    def _add_failed_file(self, file_path: str, file_name: str, code: str, errno: Optional[int] = None):
+        """添加失败文件记录，code 为 models.failures 中的错误码"""
         self.result["failed_count"] += 1
-        self.result["failed_files"].append({
-            "file_path": file_path,
-            "file_name": file_name,
-            "error": error
-        })
+        self.result["failed_files"].append(build_plan_failure(file_path, file_name, code, errno))
 
     def _add_success_file(self, file_path: str, file_name: str, category: str):
         """添加成功文件记录"""
@@ -49,65 +68,85 @@ class FileClassifier:
             "category": category
         })
 
-    def _create_category_dir(self, category_dir: str) -> bool:
+    def _resolve_category_path(
+        self,
+        category_name: str,
+        file_path: str,
+        file_name: str,
+        **known_fields
+    ) -> tuple[str, str]:
         """
-        创建分类目录
+        解析文件的分类相对路径和目录绝对路径
 
         Args:
-            category_dir: 分类目录路径
+            category_name: 分类名称
+            file_path: 文件路径
+            file_name: 文件名
+            known_fields: 分类器已知的模板字段值
 
         Returns:
-            是否成功
+            (分类相对路径, 分类目录绝对路径)
         """
-        try:
-            create_dir_if_not_exists(category_dir)
-            return True
-        except Exception:
-            return False
+        if self.path_template:
+            category_name = self.path_template.resolve(category_name, file_path, file_name, known_fields)
+
+        category_dir = self._category_dirs.get(category_name)
+        if category_dir is None:
+            category_dir = os.path.join(self.target_dir, category_name)
+            self._category_dirs[category_name] = category_dir
+        return category_name, category_dir
 
-    def _process_file(self, file_path: str, file_name: str, category_dir: str, delete_source: bool = False) -> bool:
+    def categorize_batch(self, records: list) -> list:
         """
-        处理单个文件
+        批量计算分类名称，不执行任何文件复制
 
         Args:
-            file_path: 文件路径
-            file_name: 文件名
-            category_dir: 分类目录
-            delete_source: 是否删除源文件
+            records: 文件记录列表，每个元素为(绝对路径, 文件名, 层级深度)
 
         Returns:
-            是否成功
+            与 records 等长的分类名称列表，无法分类的文件对应 None 或空字符串
         """
-        success, error_msg = copy_file(category_dir, file_path, delete_source)
-        return success
-
-
-class ExtensionClassifier(FileClassifier):
-    """使用扩展名分类文件的分类器"""
+        raise NotImplementedError
 
-    def __init__(self, extensions_map: dict, target_dir: str, delete_source: bool = False):
+    def categorize_batch_with_stat(self, records: list) -> tuple[list, list]:
         """
-        初始化扩展名分类器
+        批量计算分类名称，分类时已读取文件信息的分类器可一并返回，plan 不再重复读取
 
         Args:
-            extensions_map: 扩展名映射表，键为扩展名，值为分类名称
-            target_dir: 目标目录
-            delete_source: 是否删除源文件
+            records: 文件记录列表，每个元素为(绝对路径, 文件名, 层级深度)
+
+        Returns:
+            (分类名称列表, os.stat 结果列表)，均与 records 等长；文件信息为 None 的文件由 plan 读取。
+            默认调用 categorize_batch，文件信息全部为 None
         """
-        super().__init__(target_dir)
-        self.extensions_map = {k.lower(): v for k, v in extensions_map.items()}
-        self.delete_source = delete_source
+        return self.categorize_batch(records), [None] * len(records)
 
-    def classify(self, files: list, progress_callback: Optional[Callable[[int, str], None]] = None) -> dict:
+    def _handle_uncategorized(self, file_path: str, file_name: str):
+        """处理无法分类的文件，默认跳过"""
+
+    def _get_template_fields(self, record: tuple, category_name: str) -> dict:
+        """返回分类过程中已知的模板字段值"""
+        return {}
+
+    def plan(
+        self,
+        files: list,
+        directory_index: Optional[TargetDirectoryIndex] = None,
+        control: Optional[JobControl] = None
+    ) -> ClassificationPlan:
         """
-        使用扩展名分类文件
+        生成分类方案：只做扫描结果的分类计算和重名处理，不读写任何文件数据
 
         Args:
             files: 文件列表，每个元素为(绝对路径, 文件名, 层级深度)
-            progress_callback: 进度回调函数，参数为(已处理数量, 当前文件名)
+            directory_index: 目标目录文件名索引，传入已缓存的索引可避免重复列举目录
+            control: 任务控制句柄，每批文件之前检查暂停和取消
 
         Returns:
-            处理结果字典
+            分类方案
+
+        Raises:
+            JobCancelled: 任务被取消
         """
         self.result = {
             "success_count": 0,
@@ -115,52 +154,188 @@ class ExtensionClassifier(FileClassifier):
             "failed_files": [],
             "success_files": []
         }
+        if directory_index is None:
+            directory_index = TargetDirectoryIndex()
+
+        plan = ClassificationPlan(
+            target_dir=self.target_dir,
+            delete_source=self.delete_source,
+            total_files=len(files)
+        )
+
+        for chunk_start in range(0, len(files), self.CHUNK_SIZE):
+            if control is not None:
+                control.checkpoint()
+            chunk = files[chunk_start:chunk_start + self.CHUNK_SIZE]
+            categories, stat_results = self.categorize_batch_with_stat(chunk)
+
+            for file_info, category_name, stat_result in zip(chunk, categories, stat_results):
+                file_path = file_info[0]
+                file_name = file_info[1]
+
+                if not category_name:
+                    self._handle_uncategorized(file_path, file_name)
+                    continue
+
+                if stat_result is None:
+                    try:
+                        stat_result = os.stat(file_path)
+                    except OSError as e:
+                        self._add_failed_file(file_path, file_name, ERR_STAT, e.errno)
+                        continue
+
+                category_name, category_dir = self._resolve_category_path(
+                    category_name,
+                    file_path,
+                    file_name,
+                    stat=stat_result,
+                    **self._get_template_fields(file_info, category_name)
+                )
+                target_name = directory_index.reserve(category_dir, file_name)
+                plan.operations.append(PlanOperation(
+                    source_path=file_path,
+                    file_name=file_name,
+                    category=category_name,
+                    target_path=os.path.join(category_dir, target_name),
+                    size=stat_result.st_size,
+                    mtime=stat_result.st_mtime
+                ))
+
+        plan.failed_files = self.result["failed_files"]
+        return plan
 
-        total_files = len(files)
-        for index, file_info in enumerate(files):
-            file_path = file_info[0]
-            file_name = file_info[1]
+    def classify(self, files: list, progress_callback: Optional[Callable[[int, str], None]] = None) -> dict:
+        """
+        分类文件：先生成分类方案，再执行方案
 
-            if progress_callback:
-                progress_callback(index + 1, file_name)
+        Args:
+            files: 文件列表，每个元素为(绝对路径, 文件名, 层级深度)
+            progress_callback: 进度回调函数，参数为(已处理数量, 当前文件名)
 
-            extension = get_extension(file_name)
+        Returns:
+            处理结果字典
+        """
+        self.result = self.plan(files).execute(progress_callback)
+        return self.result
 
-            if not extension:
-                continue
 
-            extension_lower = extension.lower()
+@register_classifier("extension", "按扩展名分类")
+class ExtensionClassifier(FileClassifier):
+    """使用扩展名分类文件的分类器"""
+
+    def __init__(
+        self,
+        extensions_map: Union[dict, ExtensionSuffixTrie],
+        target_dir: str,
+        delete_source: bool = False,
+        path_template: Optional[str] = None
+    ):
+        """
+        初始化扩展名分类器
 
-            if extension_lower in self.extensions_map:
-                category_name = self.extensions_map[extension_lower]
-            else:
+        Args:
+            extensions_map: 扩展名映射表，键为扩展名（可含点，如 "tar.gz"），值为分类名称；
+                也可直接传入已构建的后缀树，多个任务共享同一查找表
+            target_dir: 目标目录
+            delete_source: 是否删除源文件
+            path_template: 目标路径模板
+        """
+        super().__init__(target_dir, path_template, delete_source)
+        if isinstance(extensions_map, ExtensionSuffixTrie):
+            self.extension_trie = extensions_map
+        else:
+            self.extension_trie = ExtensionSuffixTrie(extensions_map)
+        self.extensions_map = self.extension_trie.mappings
+
+    def categorize_batch(self, records: list) -> list:
+        """按最长匹配的扩展名计算分类，未配置的扩展名使用其大写形式，无扩展名的文件跳过"""
+        lookup = self.extension_trie.lookup
+        categories = []
+        for record in records:
+            extension, category_name = lookup(record[1])
+            if category_name is None and extension:
                 category_name = extension.upper()
+            categories.append(category_name)
+        return categories
 
-            category_dir = os.path.join(self.target_dir, category_name)
 
-            if not self._create_category_dir(category_dir):
-                self._add_failed_file(file_path, file_name, "创建目录失败")
-                continue
+def find_nth_occurrence(text: str, substring: str, n: int) -> int:
+    """查找字符串中第n个子串的位置"""
+    if n < 1 or not substring:
+        return -1
+
+    index = -len(substring)
+    for _ in range(n):
+        index = text.find(substring, index + len(substring))
+        if index == -1:
+            return -1
+    return index
+
+
+def extract_delimited_category(
+    file_name: str,
+    delimiter_start: str,
+    delimiter_end: str,
+    start_pos: int,
+    end_pos: int
+) -> str:
+    """
+    按分隔符规则从文件名（不含扩展名）中提取分类名称
+
+    Args:
+        file_name: 文件名
+        delimiter_start: 起始分隔符
+        delimiter_end: 结束分隔符
+        start_pos: 起始分隔符位置，-1表示从文件名开头提取
+        end_pos: 结束分隔符位置，-1表示提取到文件名末尾
+
+    Returns:
+        分类名称，无法提取时为空字符串
+    """
+    if not file_name or not delimiter_start:
+        return ""
+
+    file_name_no_ext = os.path.splitext(file_name)[0]
+
+    if end_pos == -1:
+        start_idx = find_nth_occurrence(file_name_no_ext, delimiter_start, start_pos)
+        if start_idx == -1:
+            return ""
+        return file_name_no_ext[start_idx + len(delimiter_start):]
 
-            if self._process_file(file_path, file_name, category_dir, self.delete_source):
-                self._add_success_file(file_path, file_name, category_name)
-            else:
-                self._add_failed_file(file_path, file_name, "复制文件失败")
+    if start_pos == -1:
+        end_idx = find_nth_occurrence(file_name_no_ext, delimiter_end, end_pos)
+        if end_idx == -1:
+            return ""
+        return file_name_no_ext[:end_idx]
+
+    start_idx = find_nth_occurrence(file_name_no_ext, delimiter_start, start_pos)
+    end_idx = find_nth_occurrence(file_name_no_ext, delimiter_end, end_pos)
+
+    if start_idx == -1 or end_idx == -1:
+        return ""
+
+    return file_name_no_ext[start_idx + len(delimiter_start):end_idx]
 
-        return self.result
 
+DEFAULT_DELIMITER = "_"
+DEFAULT_DELIMITER_START_POS = 1
+DEFAULT_DELIMITER_END_POS = 2
 
+
+@register_classifier("delimiter", "按分隔符分类")
 class DelimiterClassifier(FileClassifier):
     """使用分隔符分类文件的分类器"""
 
     def __init__(
         self,
         target_dir: str,
-        delimiter_start_str: str = "_",
-        delimiter_end_str: str = "_",
-        delimiter_start_pos: int = 1,
-        delimiter_end_pos: int = 2,
-        delete_source: bool = False
+        delimiter_start_str: str = DEFAULT_DELIMITER,
+        delimiter_end_str: str = DEFAULT_DELIMITER,
+        delimiter_start_pos: int = DEFAULT_DELIMITER_START_POS,
+        delimiter_end_pos: int = DEFAULT_DELIMITER_END_POS,
+        delete_source: bool = False,
+        path_template: Optional[str] = None
     ):
         """
         初始化分隔符分类器
@@ -172,8 +347,9 @@ class DelimiterClassifier(FileClassifier):
             delimiter_start_pos: 起始分隔符位置
             delimiter_end_pos: 结束分隔符位置
             delete_source: 是否删除源文件
+            path_template: 目标路径模板
         """
-        super().__init__(target_dir)
+        super().__init__(target_dir, path_template, delete_source)
 
         if not delimiter_start_str or not delimiter_end_str:
             raise ValueError("分隔符字符串不能为空")
@@ -184,91 +360,132 @@ class DelimiterClassifier(FileClassifier):
         self.delimiter_end_str = delimiter_end_str
         self.delimiter_start_pos = delimiter_start_pos
         self.delimiter_end_pos = delimiter_end_pos
-        self.delete_source = delete_source
 
     def _find_nth_occurrence(self, text: str, substring: str, n: int) -> int:
         """查找字符串中第n个子串的位置"""
-        if n < 1 or not substring:
-            return -1
-
-        index = -len(substring)
-        for _ in range(n):
-            index = text.find(substring, index + len(substring))
-            if index == -1:
-                return -1
-        return index
+        return find_nth_occurrence(text, substring, n)
 
     def _extract_category_name(self, file_name: str) -> str:
         """从文件名中提取分类名称"""
-        if not file_name or not self.delimiter_start_str:
-            return ""
+        return extract_delimited_category(
+            file_name,
+            self.delimiter_start_str,
+            self.delimiter_end_str,
+            self.delimiter_start_pos,
+            self.delimiter_end_pos
+        )
+
+    def categorize_batch(self, records: list) -> list:
+        """从文件名中提取分类名称"""
+        return [self._extract_category_name(record[1]) for record in records]
 
-        file_name_no_ext = os.path.splitext(file_name)[0]
+    def _handle_uncategorized(self, file_path: str, file_name: str):
+        """无法提取分类名称的文件记为失败"""
+        self._add_failed_file(file_path, file_name, ERR_NO_CATEGORY)
 
-        if self.delimiter_end_pos == -1:
-            start_idx = self._find_nth_occurrence(file_name_no_ext, self.delimiter_start_str, self.delimiter_start_pos)
-            if start_idx == -1:
-                return ""
-            return file_name_no_ext[start_idx + len(self.delimiter_start_str):]
+    def _get_template_fields(self, record: tuple, category_name: str) -> dict:
+        return {"delim": category_name}
 
-        if self.delimiter_start_pos == -1:
-            end_idx = self._find_nth_occurrence(file_name_no_ext, self.delimiter_end_str, self.delimiter_end_pos)
-            if end_idx == -1:
-                return ""
-            return file_name_no_ext[:end_idx]
 
-        start_idx = self._find_nth_occurrence(file_name_no_ext, self.delimiter_start_str, self.delimiter_start_pos)
-        end_idx = self._find_nth_occurrence(file_name_no_ext, self.delimiter_end_str, self.delimiter_end_pos)
+@register_classifier("date", "按日期分类")
+class DateClassifier(FileClassifier):
+    """按拍摄日期分类文件的分类器，目录结构为 YYYY/MM"""
 
-        if start_idx == -1 or end_idx == -1:
-            return ""
+    # 解析结果按(设备, inode, 修改时间)缓存，文件内容未变时跨任务复用；
+    # 监视模式和服务进程长期运行，只保留最近使用的 MAX_DATE_CACHE_SIZE 条
+    MAX_DATE_CACHE_SIZE = 100000
+    _date_cache: OrderedDict = OrderedDict()
+    _date_cache_lock = threading.Lock()
 
-        return file_name_no_ext[start_idx + len(self.delimiter_start_str):end_idx]
+    def __init__(
+        self,
+        target_dir: str,
+        delete_source: bool = False,
+        max_workers: Optional[int] = None,
+        path_template: Optional[str] = None
+    ):
+        """
+        初始化日期分类器
 
-    def classify(self, files: list, progress_callback: Optional[Callable[[int, str], None]] = None) -> dict:
+        Args:
+            target_dir: 目标目录
+            delete_source: 是否删除源文件
+            max_workers: 并行读取文件头的线程数，默认按CPU数量计算
+            path_template: 目标路径模板，year/month 字段取拍摄日期
         """
-        使用分隔符分类文件
+        super().__init__(target_dir, path_template, delete_source)
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) * 4)
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _resolve_year_month(self, file_path: str, file_name: str, stat_result: os.stat_result) -> tuple[int, int]:
+        """获取文件的(年, 月)，优先使用拍摄日期，失败时回退到扫描时读取的修改时间"""
+        cache_key = (stat_result.st_dev, stat_result.st_ino, stat_result.st_mtime_ns)
+        with self._date_cache_lock:
+            cached = self._date_cache.get(cache_key)
+            if cached is not None:
+                self._date_cache.move_to_end(cache_key)
+                return cached
+
+        capture_date = read_capture_date(file_path, get_extension(file_name))
+        if capture_date is None:
+            capture_date = datetime.fromtimestamp(stat_result.st_mtime)
+
+        year_month = (capture_date.year, capture_date.month)
+        with self._date_cache_lock:
+            self._date_cache[cache_key] = year_month
+            while len(self._date_cache) > self.MAX_DATE_CACHE_SIZE:
+                self._date_cache.popitem(last=False)
+        return year_month
+
+    def _categorize_record(self, record: tuple) -> tuple[Optional[str], Optional[os.stat_result]]:
+        """读取单个文件的信息和拍摄日期，返回(YYYY/MM 形式的分类名称, 文件信息)，无法读取时均为 None"""
+        try:
+            stat_result = os.stat(record[0])
+        except OSError:
+            return None, None
+        year, month = self._resolve_year_month(record[0], record[1], stat_result)
+        return os.path.join(f"{year:04d}", f"{month:02d}"), stat_result
+
+    def categorize_batch(self, records: list) -> list:
+        """并行读取文件头，返回 YYYY/MM 形式的分类名称"""
+        return self.categorize_batch_with_stat(records)[0]
+
+    def categorize_batch_with_stat(self, records: list) -> tuple[list, list]:
+        """在读取文件头的线程池中并行读取文件信息和拍摄日期，文件信息交给 plan 使用，不再重复读取"""
+        if self._executor is None:
+            results = [self._categorize_record(record) for record in records]
+        else:
+            results = list(self._executor.map(self._categorize_record, records))
+        return [category for category, _ in results], [stat_result for _, stat_result in results]
+
+    def _handle_uncategorized(self, file_path: str, file_name: str):
+        """无法读取文件信息的文件记为失败"""
+        self._add_failed_file(file_path, file_name, ERR_STAT)
+
+    def _get_template_fields(self, record: tuple, category_name: str) -> dict:
+        year, month = category_name.split(os.sep)
+        return {"year": int(year), "month": int(month)}
+
+    def plan(
+        self,
+        files: list,
+        directory_index: Optional[TargetDirectoryIndex] = None,
+        control: Optional[JobControl] = None
+    ) -> ClassificationPlan:
+        """
+        生成分类方案，期间保持读取文件头的线程池
 
         Args:
             files: 文件列表，每个元素为(绝对路径, 文件名, 层级深度)
-            progress_callback: 进度回调函数，参数为(已处理数量, 当前文件名)
+            directory_index: 目标目录文件名索引
+            control: 任务控制句柄
 
         Returns:
-            处理结果字典
+            分类方案
         """
-        self.result = {
-            "success_count": 0,
-            "failed_count": 0,
-            "failed_files": [],
-            "success_files": []
-        }
-
-        for index, file_info in enumerate(files):
-            file_path = file_info[0]
-            file_name = file_info[1]
-
-            if progress_callback:
-                progress_callback(index + 1, file_name)
-
-            category_name = self._extract_category_name(file_name)
-
-            if not category_name:
-                self._add_failed_file(
-                    file_path,
-                    file_name,
-                    f"无法提取分类名称：起始分隔符位置{self.delimiter_start_pos}或结束分隔符位置{self.delimiter_end_pos}未找到"
-                )
-                continue
-
-            category_dir = os.path.join(self.target_dir, category_name)
-
-            if not self._create_category_dir(category_dir):
-                self._add_failed_file(file_path, file_name, "创建目录失败")
-                continue
-
-            if self._process_file(file_path, file_name, category_dir, self.delete_source):
-                self._add_success_file(file_path, file_name, category_name)
-            else:
-                self._add_failed_file(file_path, file_name, "复制文件失败")
-
-        return self.result
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            self._executor = executor
+            try:
+                return super().plan(files, directory_index, control)
+            finally:
+                self._executor = None
@@ -0,0 +1,139 @@
+"""分类任务规格：创建时校验一次，之后以只读对象传递"""
+
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Mapping
+
+from utils.extension_trie import ExtensionSuffixTrie
+
+from .classifier_registry import create_classifier, get_classifier_class
+from .path_template import PathTemplate
+
+UNLIMITED_SCAN_DEPTH = 100
+
+
+@dataclass(frozen=True)
+class JobSpec:
+    """
+    分类任务规格
+
+    创建时完成全部校验和规范化：扩展名映射转换为后缀树，路径模板预先编译检查。
+    对象不可修改，可在界面线程、工作线程和任务队列之间直接共享引用。
+
+    source_folders 为全部源文件夹（已去重，source_folder 总是其中第一个），
+    多个源文件夹并发扫描后合并为一次分类。
+
+    profile 为分类参数来自的配置方案名称（扩展名或分隔符配置），只用于记录和显示。
+    """
+    classifier_name: str
+    source_folder: str
+    target_folder: str
+    delete_source: bool = False
+    options: Mapping = field(default_factory=dict)
+    scan_subfolder: bool = True
+    specify_depth: bool = False
+    scan_depth: int = 1
+    path_template: str = ""
+    source_folders: tuple[str, ...] = ()
+    profile: str = ""
+
+    def __post_init__(self):
+        """
+        校验并规范化参数
+
+        Raises:
+            ValueError: 参数无效
+        """
+        get_classifier_class(self.classifier_name)
+
+        source_folders = tuple(dict.fromkeys(
+            folder for folder in (self.source_folder, *self.source_folders) if folder
+        ))
+        if not source_folders:
+            raise ValueError("源文件夹不能为空")
+        object.__setattr__(self, "source_folder", source_folders[0])
+        object.__setattr__(self, "source_folders", source_folders)
+        if not self.target_folder:
+            raise ValueError("目标文件夹不能为空")
+        if self.specify_depth and self.scan_depth < 1:
+            raise ValueError("扫描深度必须大于等于1")
+        if self.path_template:
+            PathTemplate(self.path_template)
+
+        options = dict(self.options)
+        if self.classifier_name == "extension":
+            extensions_map = options.get("extensions_map")
+            if isinstance(extensions_map, dict):
+                options["extensions_map"] = ExtensionSuffixTrie(extensions_map)
+            elif not isinstance(extensions_map, ExtensionSuffixTrie):
+                raise ValueError("扩展名映射必须是 JSON 对象")
+        elif self.classifier_name == "delimiter":
+            if not options.get("delimiter_start_str"):
+                raise ValueError("起始分隔符不能为空")
+            if not options.get("delimiter_end_str"):
+                raise ValueError("结束分隔符不能为空")
+            if options.get("delimiter_start_pos") == -1 and options.get("delimiter_end_pos") == -1:
+                raise ValueError("起始分隔符位置和结束分隔符位置不能同时为-1")
+
+        object.__setattr__(self, "options", MappingProxyType(options))
+
+    @property
+    def max_depth(self) -> int:
+        """扫描的最大目录深度"""
+        if not self.scan_subfolder:
+            return 1
+        if self.specify_depth:
+            return self.scan_depth
+        return UNLIMITED_SCAN_DEPTH
+
+    def create_classifier(self):
+        """创建本任务的分类器"""
+        return create_classifier(
+            self.classifier_name,
+            target_dir=self.target_folder,
+            delete_source=self.delete_source,
+            path_template=self.path_template or None,
+            **self.options
+        )
+
+    def to_dict(self) -> dict:
+        """转换为可序列化为 JSON 的字典"""
+        options = {}
+        for key, value in self.options.items():
+            options[key] = dict(value.mappings) if isinstance(value, ExtensionSuffixTrie) else value
+
+        return {
+            "classifier_name": self.classifier_name,
+            "source_folder": self.source_folder,
+            "target_folder": self.target_folder,
+            "delete_source": self.delete_source,
+            "options": options,
+            "scan_subfolder": self.scan_subfolder,
+            "specify_depth": self.specify_depth,
+            "scan_depth": self.scan_depth,
+            "path_template": self.path_template,
+            "source_folders": list(self.source_folders),
+            "profile": self.profile
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "JobSpec":
+        """
+        从字典创建任务规格
+
+        Raises:
+            ValueError: 参数无效
+        """
+        return cls(
+            classifier_name=data.get("classifier_name", "extension"),
+            source_folder=data.get("source_folder", ""),
+            target_folder=data.get("target_folder", ""),
+            delete_source=data.get("delete_source", False),
+            options=data.get("options", data.get("classifier_options", {})),
+            scan_subfolder=data.get("scan_subfolder", True),
+            specify_depth=data.get("specify_depth", False),
+            scan_depth=data.get("scan_depth", 1),
+            path_template=data.get("path_template", ""),
+            source_folders=tuple(data.get("source_folders") or ()),
+            profile=data.get("profile") or ""
+        )
@@ -0,0 +1,172 @@
+"""目标路径模板"""
+
+import os
+from collections import OrderedDict
+from datetime import datetime
+from string import Formatter
+from typing import Optional
+
+from utils.file_utils import get_extension
+
+MISSING_FIELD_VALUE = "未知"
+NO_EXTENSION_VALUE = "无扩展名"
+
+SIZE_BUCKETS = (
+    (1024 ** 2, "小于1MB"),
+    (10 * 1024 ** 2, "1MB-10MB"),
+    (100 * 1024 ** 2, "10MB-100MB"),
+    (1024 ** 3, "100MB-1GB"),
+)
+SIZE_BUCKET_MAX = "大于1GB"
+
+TEMPLATE_FIELDS = {
+    "category": "分类名称",
+    "ext": "扩展名",
+    "ext_upper": "扩展名（大写）",
+    "year": "年份",
+    "month": "月份",
+    "day": "日期",
+    "size_bucket": "文件大小区间",
+    "delim": "分隔符提取内容",
+}
+
+_STAT_FIELDS = frozenset({"year", "month", "day", "size_bucket"})
+
+
+def get_size_bucket(size: int) -> str:
+    """获取文件大小所属区间名称"""
+    for upper_bound, bucket_name in SIZE_BUCKETS:
+        if size < upper_bound:
+            return bucket_name
+    return SIZE_BUCKET_MAX
+
+
+class PathTemplate:
+    """
+    目标路径模板，如 "{category}/{year}/{delim}"
+
+    模板在构造时编译一次；解析结果按字段取值缓存，相同取值不会重复拼接路径。
+    {delim}、{day} 等取值较多的字段可能使缓存不断增长，只保留最近使用的 MAX_CACHE_SIZE 条。
+    """
+
+    DEFAULT_TEMPLATE = "{category}"
+    MAX_CACHE_SIZE = 4096
+
+    def __init__(self, template: str):
+        """
+        编译路径模板
+
+        Args:
+            template: 模板字符串，字段见 TEMPLATE_FIELDS
+
+        Raises:
+            ValueError: 模板为空、语法错误或包含未知字段
+        """
+        if not template or not template.strip():
+            raise ValueError("路径模板不能为空")
+
+        try:
+            parsed = list(Formatter().parse(template))
+        except ValueError as e:
+            raise ValueError(f"路径模板格式错误: {str(e)}")
+
+        self.template = template
+        self._parts: list[tuple[str, Optional[str], str]] = []
+        fields = []
+        for literal, field_name, format_spec, _ in parsed:
+            if field_name is not None and field_name not in TEMPLATE_FIELDS:
+                raise ValueError(f"路径模板包含未知字段: {{{field_name}}}")
+            if field_name is not None and field_name not in fields:
+                fields.append(field_name)
+            self._parts.append((literal, field_name, format_spec or ""))
+
+        if os.path.isabs(template) or ".." in template.replace("\\", "/").split("/"):
+            raise ValueError("路径模板必须是目标目录下的相对路径")
+
+        self.fields = tuple(fields)
+        self.needs_stat = bool(_STAT_FIELDS.intersection(fields))
+        self._resolved_cache: OrderedDict[tuple, str] = OrderedDict()
+
+    @property
+    def is_default(self) -> bool:
+        """是否为默认的单层分类模板"""
+        return self.fields == ("category",) and self.template == self.DEFAULT_TEMPLATE
+
+    def _collect_values(
+        self,
+        category: str,
+        file_path: str,
+        file_name: str,
+        known_fields: dict
+    ) -> dict:
+        """计算模板用到的字段值，已知字段优先"""
+        values = {}
+        stat_result = known_fields.get("stat")
+        mtime = None
+
+        if self.needs_stat and stat_result is None:
+            try:
+                stat_result = os.stat(file_path)
+            except OSError:
+                stat_result = None
+
+        for field_name in self.fields:
+            if field_name in known_fields:
+                values[field_name] = known_fields[field_name]
+            elif field_name == "category":
+                values[field_name] = category
+            elif field_name in ("ext", "ext_upper"):
+                extension = get_extension(file_name) or NO_EXTENSION_VALUE
+                values[field_name] = extension.upper() if field_name == "ext_upper" else extension
+            elif field_name == "size_bucket":
+                values[field_name] = get_size_bucket(stat_result.st_size) if stat_result else MISSING_FIELD_VALUE
+            elif field_name in ("year", "month", "day"):
+                if stat_result is None:
+                    values[field_name] = MISSING_FIELD_VALUE
+                    continue
+                if mtime is None:
+                    mtime = datetime.fromtimestamp(stat_result.st_mtime)
+                values[field_name] = getattr(mtime, field_name)
+            else:
+                values[field_name] = MISSING_FIELD_VALUE
+        return values
+
+    def resolve(self, category: str, file_path: str, file_name: str, known_fields: Optional[dict] = None) -> str:
+        """
+        解析文件对应的相对目录
+
+        Args:
+            category: 分类器计算出的分类名称
+            file_path: 文件路径
+            file_name: 文件名
+            known_fields: 分类器已知的字段值，可包含 stat（os.stat_result）
+
+        Returns:
+            相对于目标目录的路径
+        """
+        values = self._collect_values(category, file_path, file_name, known_fields or {})
+        cache_key = tuple(values[field_name] for field_name in self.fields)
+
+        resolved = self._resolved_cache.get(cache_key)
+        if resolved is not None:
+            self._resolved_cache.move_to_end(cache_key)
+            return resolved
+
+        rendered = []
+        for literal, field_name, format_spec in self._parts:
+            rendered.append(literal)
+            if field_name is None:
+                continue
+            value = values[field_name]
+            if format_spec and not isinstance(value, str):
+                rendered.append(format(value, format_spec))
+            elif field_name in ("month", "day") and isinstance(value, int):
+                rendered.append(f"{value:02d}")
+            else:
+                rendered.append(str(value))
+
+        resolved = os.path.normpath("".join(rendered))
+        self._resolved_cache[cache_key] = resolved
+        if len(self._resolved_cache) > self.MAX_CACHE_SIZE:
+            self._resolved_cache.popitem(last=False)
+        return resolved
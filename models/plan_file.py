@@ -0,0 +1,395 @@
+"""分类方案文件：生成与执行分离，支持断点续执行
+
+方案文件为 JSON Lines 格式，可用 grep、jq、文本编辑器直接审阅或修改：
+
+    {"format": "easyfc-plan", "version": 1, "target_dir": "...", "total_files": 3, "record_count": 3, "total_bytes": 3072}
+    {"op": "copy", "src": "...", "dst": "...", "size": 1024, "mtime": 1700000000.0, "category": "文本文件"}
+    {"op": "move", "src": "...", "dst": "...", "size": 2048, "mtime": 1700000000.0, "category": "PDF 文件"}
+    {"op": "fail", "src": "...", "code": "stat", "errno": 2, "error": "..."}
+
+copy 只复制，move 复制后删除源文件，fail 为生成方案时已确定失败的文件，执行时直接计入失败；
+fail 的 code、errno 见 models.failures，error 为便于阅读的说明。
+"""
+
+import json
+import os
+from typing import Callable, Iterator, Optional, Union
+
+from utils.file_utils import FileOperationError, atomic_write_text, remove_source_file
+from utils.job_control import JobCancelled, JobControl
+from utils.retry_queue import RetryQueue
+
+from .classification_plan import (
+    ClassificationPlan,
+    abandon_operation,
+    build_operation_failure,
+    defer_operation,
+    execute_operation,
+)
+from .failures import (
+    ERR_PLAN_FAILED,
+    ERR_SOURCE_CHANGED,
+    ERR_SOURCE_MISSING,
+    build_copy_failure,
+    build_plan_failure,
+    describe_failure,
+)
+
+PLAN_FORMAT = "easyfc-plan"
+PLAN_VERSION = 1
+CHECKPOINT_SUFFIX = ".checkpoint"
+
+
+def write_plan_file(plan: ClassificationPlan, plan_path: str):
+    """
+    将分类方案逐行写入方案文件
+
+    Args:
+        plan: 分类方案
+        plan_path: 方案文件路径
+    """
+    op_name = "move" if plan.delete_source else "copy"
+    with open(plan_path, "w", encoding="utf-8", newline="\n") as f:
+        header = {
+            "format": PLAN_FORMAT,
+            "version": PLAN_VERSION,
+            "target_dir": plan.target_dir,
+            "total_files": plan.total_files,
+            "record_count": len(plan.failed_files) + len(plan.operations),
+            "total_bytes": sum(operation.size for operation in plan.operations),
+        }
+        f.write(json.dumps(header, ensure_ascii=False) + "\n")
+
+        for failed in plan.failed_files:
+            record = {
+                "op": "fail",
+                "src": failed["file_path"],
+                "code": failed["code"],
+                "errno": failed["errno"],
+                "error": describe_failure(failed),
+            }
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+        for operation in plan.operations:
+            record = {
+                "op": op_name,
+                "src": operation.source_path,
+                "dst": operation.target_path,
+                "size": operation.size,
+                "mtime": operation.mtime,
+                "category": operation.category,
+            }
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def read_plan_header(plan_path: str) -> dict:
+    """
+    读取方案文件头
+
+    Raises:
+        ValueError: 文件不是有效的方案文件
+    """
+    with open(plan_path, "r", encoding="utf-8") as f:
+        first_line = f.readline()
+
+    try:
+        header = json.loads(first_line)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"方案文件格式错误: {str(e)}")
+
+    if not isinstance(header, dict) or header.get("format") != PLAN_FORMAT:
+        raise ValueError("不是有效的分类方案文件")
+    if header.get("version") != PLAN_VERSION:
+        raise ValueError(f"不支持的方案文件版本: {header.get('version')}")
+    return header
+
+
+def iter_plan_records(plan_path: str) -> Iterator[tuple[int, dict]]:
+    """
+    逐行读取方案记录，不会一次性加载整个文件
+
+    Yields:
+        (记录序号, 记录字典)，序号从0开始，不含文件头
+
+    Raises:
+        ValueError: 记录格式错误
+    """
+    with open(plan_path, "r", encoding="utf-8") as f:
+        f.readline()
+        index = 0
+        for line_number, line in enumerate(f, start=2):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"方案文件第 {line_number} 行格式错误: {str(e)}")
+            if not isinstance(record, dict) or record.get("op") not in ("copy", "move", "fail"):
+                raise ValueError(f"方案文件第 {line_number} 行不是有效的操作")
+            yield index, record
+            index += 1
+
+
+class PlanFileExecutor:
+    """
+    方案文件执行器
+
+    只按方案复制/移动文件，不做任何分类计算。进度定期写入检查点文件，
+    中断后再次执行同一方案会从检查点继续；中断时仍在重试队列中的记录序号
+    保存在检查点的 retry 中，继续执行时一并处理。
+    """
+
+    CHECKPOINT_INTERVAL = 200
+
+    def __init__(self, plan_path: str, checkpoint_path: Optional[str] = None):
+        """
+        初始化执行器
+
+        Args:
+            plan_path: 方案文件路径
+            checkpoint_path: 检查点文件路径，默认为方案文件路径加 .checkpoint
+
+        Raises:
+            ValueError: 方案文件无效
+        """
+        self.plan_path = plan_path
+        self.checkpoint_path = checkpoint_path or plan_path + CHECKPOINT_SUFFIX
+        self.header = read_plan_header(plan_path)
+
+    @property
+    def total_files(self) -> int:
+        return int(self.header.get("total_files", 0))
+
+    @property
+    def total_bytes(self) -> int:
+        """方案中所有操作的总字节数，旧方案文件没有该字段时为0"""
+        return int(self.header.get("total_bytes", 0))
+
+    def _load_checkpoint(self) -> dict:
+        """读取检查点，不存在或损坏时从头开始"""
+        try:
+            with open(self.checkpoint_path, "r", encoding="utf-8") as f:
+                checkpoint = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {"completed": 0, "success_count": 0, "failed_count": 0, "retry": []}
+
+        if not isinstance(checkpoint, dict) or not isinstance(checkpoint.get("completed"), int):
+            return {"completed": 0, "success_count": 0, "failed_count": 0, "retry": []}
+        if not isinstance(checkpoint.get("retry"), list):
+            checkpoint["retry"] = []
+        return checkpoint
+
+    def _save_checkpoint(self, completed: int, result: dict, retry_indexes: Optional[list[int]] = None):
+        """写入检查点，先写临时文件再替换，避免中断时损坏"""
+        checkpoint = {
+            "completed": completed,
+            "success_count": result["success_count"],
+            "failed_count": result["failed_count"],
+            "retry": sorted(retry_indexes or []),
+        }
+        atomic_write_text(self.checkpoint_path, json.dumps(checkpoint), durable=False)
+
+    @staticmethod
+    def _is_already_copied(record: dict) -> bool:
+        """目标已存在且大小、修改时间与方案一致，说明上次中断前已复制完成"""
+        try:
+            target_stat = os.stat(record["dst"])
+        except OSError:
+            return False
+        return target_stat.st_size == record.get("size") and abs(target_stat.st_mtime - record.get("mtime", 0)) < 1
+
+    def _execute_record(
+        self,
+        record: dict,
+        created_dirs: dict,
+        control: Optional[JobControl] = None,
+        journal=None,
+        copied_path: str = ""
+    ) -> Union[dict, FileOperationError, None]:
+        """
+        执行单条记录
+
+        Returns:
+            成功时为 None；方案或源文件校验失败时为失败记录，复制/移动失败时为 FileOperationError
+        """
+        source_path = record["src"]
+        if record["op"] == "fail":
+            # 旧版本方案文件的 fail 记录只有说明文字
+            return build_plan_failure(
+                source_path,
+                os.path.basename(source_path),
+                record.get("code") or ERR_PLAN_FAILED,
+                record.get("errno")
+            )
+
+        delete_source = record["op"] == "move"
+
+        if copied_path:
+            return execute_operation(
+                source_path, record["dst"], delete_source, created_dirs, control, journal, copied_path
+            )
+
+        if self._is_already_copied(record):
+            if delete_source and os.path.exists(source_path):
+                try:
+                    remove_source_file(source_path, record["dst"])
+                except FileOperationError as e:
+                    return e
+            if journal is not None:
+                journal.record(source_path, record["dst"], delete_source)
+            return None
+
+        try:
+            source_stat = os.stat(source_path)
+        except OSError as e:
+            return build_copy_failure(
+                source_path,
+                os.path.basename(source_path),
+                ERR_SOURCE_MISSING,
+                e.errno,
+                target_category=record.get("category", "")
+            )
+
+        if source_stat.st_size != record.get("size") or abs(source_stat.st_mtime - record.get("mtime", 0)) >= 1:
+            return build_copy_failure(
+                source_path,
+                os.path.basename(source_path),
+                ERR_SOURCE_CHANGED,
+                target_category=record.get("category", "")
+            )
+
+        return execute_operation(source_path, record["dst"], delete_source, created_dirs, control, journal)
+
+    def _collect_unprocessed(self, start_index: int, retry_indexes: Optional[set[int]] = None) -> list[dict]:
+        """收集从指定序号开始尚未执行的文件，以及仍在重试队列中的文件"""
+        retry_indexes = retry_indexes or set()
+        return [
+            {"file_path": record["src"], "file_name": os.path.basename(record["src"])}
+            for index, record in iter_plan_records(self.plan_path)
+            if (index >= start_index or index in retry_indexes) and record["op"] != "fail"
+        ]
+
+    def execute(
+        self,
+        progress_callback: Optional[Callable[[int, str], None]] = None,
+        control: Optional[JobControl] = None,
+        file_done_callback: Optional[Callable[[int, bool], None]] = None,
+        journal=None
+    ) -> dict:
+        """
+        执行方案文件，从检查点继续
+
+        暂时性错误（文件被占用、网络存储超时等）的记录放入延迟重试队列，
+        其余记录执行完后再按指数退避重试。
+
+        Args:
+            progress_callback: 进度回调函数，参数为(已处理数量, 当前文件名)
+            control: 任务控制句柄，取消时写入检查点，之后可从取消处继续
+            file_done_callback: 单个文件完成回调，参数为(文件字节数, 是否成功)
+            journal: 运行日志（RunJournal），记录每个成功的操作，用于撤销
+
+        Returns:
+            处理结果字典，计数包含之前中断前已完成的部分，文件列表只包含本次执行的部分，
+            retried_count 为本次进入重试队列的文件数量；
+            任务被取消时包含 cancelled 和未处理的 unprocessed_files
+        """
+        checkpoint = self._load_checkpoint()
+        completed = checkpoint["completed"]
+        resumed_retry = set(checkpoint["retry"])
+        result = {
+            "success_count": checkpoint.get("success_count", 0),
+            "failed_count": checkpoint.get("failed_count", 0),
+            "failed_files": [],
+            "success_files": [],
+            "resumed_from": completed,
+        }
+
+        created_dirs: dict[str, Optional[OSError]] = {}
+        retry_queue = RetryQueue()
+        # 不在方案中的文件（如无扩展名被跳过）计入已处理数量，使进度与扫描总数一致
+        processed_offset = self.total_files - int(self.header.get("record_count", self.total_files))
+        completed_now = completed
+
+        def pending_indexes() -> set[int]:
+            return {index for (index, _, _), _ in retry_queue.pending()}
+
+        def finish(record: dict, error: Union[dict, FileOperationError, None], attempts: int):
+            file_name = os.path.basename(record["src"])
+            if isinstance(error, FileOperationError):
+                abandon_operation(record["src"], error, journal)
+                result["failed_count"] += 1
+                result["failed_files"].append(
+                    build_operation_failure(record["src"], file_name, error, attempts, record.get("category", ""))
+                )
+            elif error is not None:
+                result["failed_count"] += 1
+                result["failed_files"].append(error)
+            else:
+                result["success_count"] += 1
+                result["success_files"].append({
+                    "file_path": record["src"],
+                    "file_name": file_name,
+                    "category": record.get("category", "")
+                })
+
+            if file_done_callback:
+                file_done_callback(record.get("size", 0), error is None)
+
+        def cancel(next_index: int, retry_indexes: set[int]) -> dict:
+            for (_, record, error), _ in retry_queue.pending():
+                abandon_operation(record["src"], error, journal)
+            self._save_checkpoint(next_index, result, list(retry_indexes))
+            result["cancelled"] = True
+            result["unprocessed_files"] = self._collect_unprocessed(next_index, retry_indexes)
+            result["total_files"] = self.total_files
+            result["retried_count"] = retry_queue.deferred_count
+            return result
+
+        for index, record in iter_plan_records(self.plan_path):
+            if index < completed and index not in resumed_retry:
+                continue
+
+            file_name = os.path.basename(record["src"])
+            if progress_callback:
+                progress_callback(processed_offset + index + 1, file_name)
+
+            try:
+                if control is not None:
+                    control.checkpoint()
+                error = self._execute_record(record, created_dirs, control, journal)
+            except JobCancelled:
+                retry_indexes = pending_indexes() | {i for i in resumed_retry if i >= index}
+                return cancel(max(index, completed), retry_indexes)
+
+            if isinstance(error, FileOperationError) and defer_operation(
+                retry_queue, (index, record, error), error, 1, created_dirs
+            ):
+                continue
+            finish(record, error, 1)
+
+            if index >= completed:
+                completed_now = index + 1
+                if completed_now % self.CHECKPOINT_INTERVAL == 0:
+                    self._save_checkpoint(completed_now, result, list(pending_indexes()))
+
+        retrying: set[int] = set()
+        try:
+            for (index, record, previous_error), attempts in retry_queue.drain(control):
+                retrying = {index}
+                error = self._execute_record(
+                    record, created_dirs, control, journal, copied_path=previous_error.target_path
+                )
+                retrying = set()
+                if isinstance(error, FileOperationError) and defer_operation(
+                    retry_queue, (index, record, error), error, attempts + 1, created_dirs
+                ):
+                    continue
+                finish(record, error, attempts + 1)
+        except JobCancelled:
+            return cancel(completed_now, pending_indexes() | retrying)
+
+        self._save_checkpoint(completed_now, result)
+        result["total_files"] = self.total_files
+        result["retried_count"] = retry_queue.deferred_count
+        return result
@@ -0,0 +1,191 @@
+"""进度汇总与限频发布"""
+
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+PHASE_SCAN = "scan"
+PHASE_PLAN = "plan"
+PHASE_COPY = "copy"
+PHASE_UNDO = "undo"
+
+PHASE_NAMES = {
+    PHASE_SCAN: "扫描",
+    PHASE_PLAN: "生成方案",
+    PHASE_COPY: "复制",
+    PHASE_UNDO: "撤销",
+}
+
+
+def format_duration(seconds: float) -> str:
+    """
+    格式化时长
+
+    Args:
+        seconds: 秒数
+
+    Returns:
+        如 "1小时02分"、"3分05秒"、"12秒"
+    """
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}小时{seconds % 3600 // 60:02d}分"
+    if seconds >= 60:
+        return f"{seconds // 60}分{seconds % 60:02d}秒"
+    return f"{seconds}秒"
+
+
+@dataclass(frozen=True)
+class ProgressSnapshot:
+    """某一时刻的进度快照"""
+    processed: int
+    total: int
+    current_file: str
+    elapsed: float
+    files_per_second: float
+    phase: str = PHASE_COPY
+    bytes_done: int = 0
+    bytes_total: int = 0
+    bytes_per_second: float = 0.0
+    failed_count: int = 0
+
+    @property
+    def ratio(self) -> float:
+        """完成比例（0~1）"""
+        if self.total <= 0:
+            return 1.0
+        return min(1.0, self.processed / self.total)
+
+    @property
+    def bytes_remaining(self) -> int:
+        return max(0, self.bytes_total - self.bytes_done)
+
+    @property
+    def eta(self) -> Optional[float]:
+        """预计剩余秒数，速度未知时为 None；有字节总量时按字节速度估算"""
+        if self.bytes_total > 0 and self.bytes_per_second > 0:
+            return self.bytes_remaining / self.bytes_per_second
+        if self.files_per_second > 0:
+            return max(0, self.total - self.processed) / self.files_per_second
+        return None
+
+
+class ProgressReporter:
+    """
+    在工作线程内汇总逐文件进度，按固定间隔发布快照
+
+    update 和 file_done 每个文件各调用一次，只累加计数并比较时间；只有距上次发布超过
+    interval 秒时才构造快照并调用 publish，因此发布次数与文件数量无关。
+    update 的已处理数量包含跳过和续传前已完成的文件，速度只按本阶段 file_done 的文件数计算。
+    """
+
+    DEFAULT_INTERVAL = 0.1
+
+    def __init__(
+        self,
+        total: int,
+        publish: Callable[[ProgressSnapshot], None],
+        interval: float = DEFAULT_INTERVAL,
+        phase: str = PHASE_COPY,
+        bytes_total: int = 0,
+        failed_count: int = 0
+    ):
+        """
+        初始化进度汇总器
+
+        Args:
+            total: 文件总数
+            publish: 发布快照的回调
+            interval: 最小发布间隔（秒）
+            phase: 当前阶段
+            bytes_total: 需要处理的总字节数
+            failed_count: 开始前已确定失败的文件数
+        """
+        self.total = total
+        self._publish = publish
+        self._interval = interval
+        self._phase = phase
+        self._start_time = time.monotonic()
+        self._last_publish_time = 0.0
+        self._processed = 0
+        self._files_done = 0
+        self._current_file = ""
+        self._bytes_total = bytes_total
+        self._bytes_done = 0
+        self._failed_count = failed_count
+
+    def start_phase(self, phase: str, total: int, bytes_total: int = 0, failed_count: int = 0):
+        """
+        进入新阶段，重置计时并立即发布一次快照
+
+        Args:
+            phase: 阶段名称
+            total: 该阶段的文件总数
+            bytes_total: 该阶段需要处理的总字节数
+            failed_count: 进入该阶段前已确定失败的文件数
+        """
+        self._phase = phase
+        self.total = total
+        self._bytes_total = bytes_total
+        self._bytes_done = 0
+        self._failed_count = failed_count
+        self._processed = 0
+        self._files_done = 0
+        self._current_file = ""
+        self._start_time = time.monotonic()
+        self._last_publish_time = self._start_time
+        self._publish(self.snapshot(self._start_time))
+
+    def update(self, processed: int, current_file: str):
+        """
+        记录进度，到达发布间隔时发布快照
+
+        Args:
+            processed: 已处理数量
+            current_file: 当前文件名
+        """
+        self._processed = processed
+        self._current_file = current_file
+        self._maybe_publish()
+
+    def file_done(self, size: int, success: bool):
+        """
+        记录单个文件处理完成
+
+        Args:
+            size: 文件字节数
+            success: 是否成功
+        """
+        self._files_done += 1
+        self._bytes_done += size
+        if not success:
+            self._failed_count += 1
+        self._maybe_publish()
+
+    def _maybe_publish(self):
+        now = time.monotonic()
+        if now - self._last_publish_time >= self._interval:
+            self._last_publish_time = now
+            self._publish(self.snapshot(now))
+
+    def snapshot(self, now: Optional[float] = None) -> ProgressSnapshot:
+        """获取当前进度快照"""
+        if now is None:
+            now = time.monotonic()
+        elapsed = now - self._start_time
+        return ProgressSnapshot(
+            processed=self._processed,
+            total=self.total,
+            current_file=self._current_file,
+            elapsed=elapsed,
+            files_per_second=self._files_done / elapsed if elapsed > 0 else 0.0,
+            phase=self._phase,
+            bytes_done=self._bytes_done,
+            bytes_total=self._bytes_total,
+            bytes_per_second=self._bytes_done / elapsed if elapsed > 0 else 0.0,
+            failed_count=self._failed_count
+        )
+
+    def finish(self):
+        """发布最终快照，保证最后的进度可见"""
+        self._publish(self.snapshot())
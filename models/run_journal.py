@@ -0,0 +1,503 @@
+"""运行日志：记录每次分类实际执行的操作，用于撤销
+
+每次运行写一个 JSON Lines 文件，第一行为文件头，之后每个成功的文件一行紧凑数组：
+
+    {"format": "easyfc-journal", "version": 1, "target_dir": "...", "delete_source": true, "created_at": 1700000000.0}
+    ["源路径", "实际目标路径", 1, 1024, 1700000000000000000]
+
+数组依次为源路径、实际写入的目标路径（重名改名后的路径）、是否删除了源文件、目标文件大小和
+修改时间（纳秒）。每条记录写入后立即刷新，程序中途退出时已完成的操作仍然可以撤销。
+
+撤销对每条记录是幂等的：目标已不存在且源位置已有文件视为已撤销，因此撤销中断后再次执行
+会从未完成的记录继续。日志目录只保留最近 MAX_JOURNALS 份日志，创建新日志时删除更早的。
+"""
+
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Iterable, Optional
+
+from utils.file_utils import atomic_write_text
+from utils.job_control import JobCancelled, JobControl
+from utils.path_utils import get_journals_path
+
+from .failures import (
+    ERR_RESTORE,
+    ERR_SOURCE_EXISTS,
+    ERR_TARGET_MISSING,
+    ERR_TARGET_MODIFIED,
+    build_undo_failure,
+)
+
+JOURNAL_FORMAT = "easyfc-journal"
+JOURNAL_VERSION = 1
+JOURNAL_SUFFIX = ".jsonl"
+UNDONE_SUFFIX = ".undone"
+UNDO_MAX_WORKERS = 8
+MAX_JOURNALS = 50
+COUNT_CHUNK_SIZE = 1024 * 1024
+
+
+class RunJournal:
+    """
+    单次运行的操作日志
+
+    在第一条记录时才创建文件，没有成功操作的运行不留下日志。可在多个线程中同时调用 record。
+    日志无法写入时不影响分类本身，错误信息保存在 error 中。
+    """
+
+    def __init__(
+        self,
+        journal_path: str,
+        target_dir: str,
+        delete_source: bool,
+        source_folders: Iterable[str] = (),
+        profile: str = ""
+    ):
+        """
+        初始化运行日志
+
+        Args:
+            journal_path: 日志文件路径
+            target_dir: 目标文件夹，撤销时清理空目录不会越过该目录
+            delete_source: 本次运行是否删除源文件
+            source_folders: 源文件夹列表，只用于显示
+            profile: 使用的配置方案名称，只用于显示
+        """
+        self.journal_path = journal_path
+        self.header = {
+            "format": JOURNAL_FORMAT,
+            "version": JOURNAL_VERSION,
+            "target_dir": target_dir,
+            "delete_source": delete_source,
+            "source_folders": list(source_folders),
+            "profile": profile,
+            "created_at": time.time(),
+        }
+        self._lock = threading.Lock()
+        self._file = None
+        self._record_count = 0
+        self._error: Optional[str] = None
+
+    @classmethod
+    def create(
+        cls,
+        target_dir: str,
+        delete_source: bool,
+        source_folders: Iterable[str] = (),
+        profile: str = "",
+        journal_dir: Optional[str] = None
+    ) -> "RunJournal":
+        """
+        在日志目录中为新的运行创建日志，文件名包含开始时间，同时删除超出保留数量的旧日志
+
+        Args:
+            journal_dir: 日志目录，默认为配置目录下的 journals
+        """
+        directory = journal_dir or str(get_journals_path())
+        prune_journals(directory, MAX_JOURNALS - 1)
+        timestamp = time.strftime("%Y%m%d-%H%M%S")
+        journal_path = os.path.join(directory, f"run-{timestamp}-{uuid.uuid4().hex[:8]}{JOURNAL_SUFFIX}")
+        return cls(journal_path, target_dir, delete_source, source_folders, profile)
+
+    @property
+    def record_count(self) -> int:
+        """已记录的操作数"""
+        return self._record_count
+
+    @property
+    def error(self) -> Optional[str]:
+        """日志写入错误，写入失败后不再记录"""
+        return self._error
+
+    def add_to_result(self, result: dict) -> dict:
+        """在处理结果中加入日志路径（有记录时）和写入错误"""
+        if self._record_count:
+            result["journal_path"] = self.journal_path
+        if self._error:
+            result["journal_error"] = self._error
+        return result
+
+    def record(self, source_path: str, target_path: str, moved: bool):
+        """
+        记录一个已完成的操作
+
+        Args:
+            source_path: 源文件路径
+            target_path: 实际写入的目标路径
+            moved: 是否已删除源文件
+        """
+        try:
+            target_stat = os.stat(target_path)
+            size, mtime_ns = target_stat.st_size, target_stat.st_mtime_ns
+        except OSError:
+            size, mtime_ns = -1, 0
+
+        line = json.dumps([source_path, target_path, int(moved), size, mtime_ns], ensure_ascii=False) + "\n"
+        with self._lock:
+            if self._error:
+                return
+            try:
+                if self._file is None:
+                    os.makedirs(os.path.dirname(self.journal_path) or ".", exist_ok=True)
+                    self._file = open(self.journal_path, "w", encoding="utf-8", newline="\n")
+                    self._file.write(json.dumps(self.header, ensure_ascii=False) + "\n")
+                self._file.write(line)
+                self._file.flush()
+            except OSError as e:
+                self._error = f"写入运行日志失败，本次运行无法完整撤销: {str(e)}"
+                return
+            self._record_count += 1
+
+    def close(self):
+        """关闭日志文件"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self) -> "RunJournal":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def _parse_header(line: str) -> dict:
+    """
+    解析并校验日志文件头
+
+    Raises:
+        ValueError: 文件头无效
+    """
+    try:
+        header = json.loads(line)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"运行日志格式错误: {str(e)}")
+    if not isinstance(header, dict) or header.get("format") != JOURNAL_FORMAT:
+        raise ValueError("不是有效的运行日志")
+    if header.get("version") != JOURNAL_VERSION:
+        raise ValueError(f"不支持的运行日志版本: {header.get('version')}")
+    return header
+
+
+def read_journal_summary(journal_path: str) -> tuple[dict, int]:
+    """
+    读取运行日志的文件头和记录数，只解析文件头，记录按换行符计数而不逐行解析
+
+    Returns:
+        (文件头, 记录数)；最后一行不完整（写入时中断）时不计入
+
+    Raises:
+        ValueError: 文件不是有效的运行日志
+    """
+    try:
+        with open(journal_path, "rb") as f:
+            header_line = f.readline()
+            record_count = 0
+            while True:
+                chunk = f.read(COUNT_CHUNK_SIZE)
+                if not chunk:
+                    break
+                record_count += chunk.count(b"\n")
+    except OSError as e:
+        raise ValueError(f"读取运行日志失败: {str(e)}")
+
+    try:
+        header_text = header_line.decode("utf-8")
+    except UnicodeDecodeError:
+        raise ValueError("不是有效的运行日志")
+    return _parse_header(header_text), record_count
+
+
+def read_journal(journal_path: str) -> tuple[dict, list[list]]:
+    """
+    读取运行日志
+
+    Returns:
+        (文件头, 记录列表)；最后一行不完整（写入时中断）时忽略该行
+
+    Raises:
+        ValueError: 文件不是有效的运行日志
+    """
+    try:
+        with open(journal_path, "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    except OSError as e:
+        raise ValueError(f"读取运行日志失败: {str(e)}")
+
+    if not lines:
+        raise ValueError("不是有效的运行日志")
+    header = _parse_header(lines[0])
+
+    records = []
+    for line_number, line in enumerate(lines[1:], start=2):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            if line_number == len(lines):
+                break
+            raise ValueError(f"运行日志第 {line_number} 行格式错误: {str(e)}")
+        if not isinstance(record, list) or len(record) != 5:
+            raise ValueError(f"运行日志第 {line_number} 行不是有效的操作")
+        records.append(record)
+    return header, records
+
+
+def is_journal_undone(journal_path: str) -> bool:
+    """运行日志是否已完整撤销"""
+    return os.path.exists(journal_path + UNDONE_SUFFIX)
+
+
+def list_journals(journal_dir: Optional[str] = None, include_undone: bool = False) -> list[str]:
+    """
+    列出运行日志，最新的在前
+
+    Args:
+        journal_dir: 日志目录，默认为配置目录下的 journals
+        include_undone: 是否包含已撤销的日志
+    """
+    directory = journal_dir or str(get_journals_path())
+    try:
+        entries = list(os.scandir(directory))
+    except OSError:
+        return []
+
+    journals = []
+    for entry in entries:
+        if not entry.name.endswith(JOURNAL_SUFFIX) or not entry.is_file():
+            continue
+        if not include_undone and is_journal_undone(entry.path):
+            continue
+        journals.append((entry.stat().st_mtime, entry.path))
+    return [path for _, path in sorted(journals, reverse=True)]
+
+
+def prune_journals(journal_dir: Optional[str] = None, keep: int = MAX_JOURNALS) -> int:
+    """
+    删除超出保留数量的旧运行日志（包括已撤销的）及其撤销标记
+
+    Args:
+        journal_dir: 日志目录，默认为配置目录下的 journals
+        keep: 保留最近的日志份数
+
+    Returns:
+        删除的日志数
+    """
+    removed = 0
+    for journal_path in list_journals(journal_dir, include_undone=True)[max(0, keep):]:
+        try:
+            os.remove(journal_path)
+        except OSError:
+            continue
+        removed += 1
+        try:
+            os.remove(journal_path + UNDONE_SUFFIX)
+        except OSError:
+            pass
+    return removed
+
+
+class JournalUndoer:
+    """
+    按运行日志撤销一次分类
+
+    移动过的文件移回原位置：与原位置在同一设备时直接改名，否则复制回去再删除目标文件；
+    只复制的文件在源文件仍存在时删除副本。分类后被修改过的文件不会被撤销。
+    各文件在线程池中并发处理，完成后删除目标文件夹中变空的分类目录。
+    """
+
+    def __init__(self, journal_path: str, max_workers: int = UNDO_MAX_WORKERS):
+        """
+        初始化撤销器
+
+        Raises:
+            ValueError: 运行日志无效
+        """
+        self.journal_path = journal_path
+        self.header, self.records = read_journal(journal_path)
+        self.max_workers = max(1, max_workers)
+
+    @property
+    def total_files(self) -> int:
+        return len(self.records)
+
+    @property
+    def target_dir(self) -> str:
+        return self.header.get("target_dir", "")
+
+    def _get_target_category(self, target_path: str) -> str:
+        """目标文件所在的分类目录（相对目标文件夹），不在目标文件夹中时为空字符串"""
+        if not self.target_dir:
+            return ""
+        category = os.path.relpath(os.path.dirname(target_path), self.target_dir)
+        return "" if category == os.curdir or category.startswith(os.pardir) else category
+
+    @staticmethod
+    def _restore_by_copy(target_path: str, source_path: str):
+        """跨设备复制回原位置，先写临时文件再改名，中断时不会留下不完整的源文件"""
+        temp_path = f"{source_path}.easyfc-undo.tmp"
+        try:
+            shutil.copy2(target_path, temp_path)
+            os.replace(temp_path, source_path)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+        os.remove(target_path)
+
+    @classmethod
+    def undo_record(cls, record: list) -> Optional[tuple[str, Optional[int]]]:
+        """
+        撤销单条记录
+
+        Returns:
+            失败时为(错误码, errno)，成功或已撤销时为 None
+        """
+        source_path, target_path, moved, size, mtime_ns = record
+        try:
+            target_stat = os.stat(target_path)
+        except OSError as e:
+            return None if os.path.exists(source_path) else (ERR_TARGET_MISSING, e.errno)
+
+        if size >= 0 and (target_stat.st_size != size or target_stat.st_mtime_ns != mtime_ns):
+            return ERR_TARGET_MODIFIED, None
+
+        source_exists = os.path.exists(source_path)
+        try:
+            if not moved and source_exists:
+                os.remove(target_path)
+                return None
+            if source_exists:
+                return ERR_SOURCE_EXISTS, None
+
+            source_dir = os.path.dirname(source_path)
+            os.makedirs(source_dir, exist_ok=True)
+            if os.stat(source_dir).st_dev == target_stat.st_dev:
+                try:
+                    os.rename(target_path, source_path)
+                    return None
+                except OSError:
+                    if os.path.exists(source_path):
+                        return ERR_SOURCE_EXISTS, None
+            cls._restore_by_copy(target_path, source_path)
+        except OSError as e:
+            return ERR_RESTORE, e.errno
+        return None
+
+    def _remove_empty_dirs(self) -> int:
+        """删除目标文件夹中变空的分类目录，返回删除的目录数"""
+        if not self.target_dir:
+            return 0
+
+        target_dir = os.path.normcase(os.path.abspath(self.target_dir))
+        directories = {os.path.abspath(os.path.dirname(record[1])) for record in self.records}
+        removed = 0
+        for directory in sorted(directories, key=len, reverse=True):
+            current = directory
+            while os.path.normcase(current).startswith(target_dir + os.sep):
+                try:
+                    os.rmdir(current)
+                except OSError:
+                    break
+                removed += 1
+                current = os.path.dirname(current)
+        return removed
+
+    def _mark_undone(self, result: dict):
+        """撤销全部成功后写入标记，之后不再列为可撤销"""
+        summary = {"undone_at": time.time(), "success_count": result["success_count"]}
+        try:
+            atomic_write_text(self.journal_path + UNDONE_SUFFIX, json.dumps(summary))
+        except OSError:
+            pass
+
+    def execute(
+        self,
+        progress_callback: Optional[Callable[[int, str], None]] = None,
+        control: Optional[JobControl] = None,
+        file_done_callback: Optional[Callable[[int, bool], None]] = None
+    ) -> dict:
+        """
+        执行撤销
+
+        Args:
+            progress_callback: 进度回调函数，参数为(已处理数量, 当前文件名)
+            control: 任务控制句柄，提交每个文件之前检查暂停和取消
+            file_done_callback: 单个文件完成回调，参数为(文件字节数, 是否成功)
+
+        Returns:
+            处理结果字典，success_files 的分类为恢复到的文件夹；任务被取消时包含
+            cancelled 和未处理的 unprocessed_files，再次执行可继续
+        """
+        result = {
+            "success_count": 0,
+            "failed_count": 0,
+            "failed_files": [],
+            "success_files": [],
+            "total_files": self.total_files,
+        }
+
+        processed = 0
+        next_index = 0
+        pending = {}
+        max_pending = self.max_workers * 4
+
+        def collect(done_futures):
+            nonlocal processed
+            for future in done_futures:
+                record = pending.pop(future)
+                error = future.result()
+                processed += 1
+                file_name = os.path.basename(record[0])
+                if progress_callback:
+                    progress_callback(processed, file_name)
+                if error is not None:
+                    result["failed_count"] += 1
+                    result["failed_files"].append(
+                        build_undo_failure(record[1], file_name, *error, self._get_target_category(record[1]))
+                    )
+                else:
+                    result["success_count"] += 1
+                    result["success_files"].append({
+                        "file_path": record[1],
+                        "file_name": file_name,
+                        "category": os.path.dirname(record[0])
+                    })
+                if file_done_callback:
+                    file_done_callback(max(record[3], 0), error is None)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="easyfc-undo") as executor:
+            try:
+                while next_index < len(self.records):
+                    if control is not None:
+                        control.checkpoint()
+                    record = self.records[next_index]
+                    pending[executor.submit(self.undo_record, record)] = record
+                    next_index += 1
+                    if len(pending) >= max_pending:
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        collect(done)
+            except JobCancelled:
+                result["cancelled"] = True
+                result["unprocessed_files"] = [
+                    {"file_path": record[1], "file_name": os.path.basename(record[0])}
+                    for record in self.records[next_index:]
+                ]
+            collect(wait(pending).done)
+
+        if result.get("cancelled"):
+            return result
+
+        result["removed_dir_count"] = self._remove_empty_dirs()
+        if result["failed_count"] == 0:
+            self._mark_undone(result)
+        return result
@@ -0,0 +1,98 @@
+"""多源文件夹扫描：并发扫描、合并为一个文件列表，并按来源统计结果"""
+
+from dataclasses import dataclass, field
+from typing import Optional
+
+from utils.file_utils import get_folders_files_by_depth
+
+
+@dataclass
+class SourceScan:
+    """
+    多个源文件夹的合并扫描结果
+
+    所有来源的文件合并为一个列表交给同一个分类器，共享目标目录索引和目录创建缓存；
+    同一文件出现在多个来源中（来源互相嵌套）时只保留一次，归属第一个来源。
+    """
+    source_folders: tuple[str, ...]
+    files: list = field(default_factory=list)
+    source_counts: list[int] = field(default_factory=list)
+    _file_sources: dict[str, int] = field(default_factory=dict, repr=False)
+
+    def source_of(self, file_path: str) -> Optional[int]:
+        """文件所属来源的序号，未知文件返回 None"""
+        if len(self.source_folders) == 1:
+            return 0
+        return self._file_sources.get(file_path)
+
+    def build_breakdown(self, result: dict) -> list[dict]:
+        """
+        按来源统计处理结果
+
+        Args:
+            result: 合并后的处理结果字典
+
+        Returns:
+            每个来源一项，包含 source_folder、total_files、success_count、failed_count、unprocessed_count
+        """
+        breakdown = [
+            {
+                "source_folder": source_folder,
+                "total_files": count,
+                "success_count": 0,
+                "failed_count": 0,
+                "unprocessed_count": 0,
+            }
+            for source_folder, count in zip(self.source_folders, self.source_counts)
+        ]
+
+        for key, count_key in (
+            ("success_files", "success_count"),
+            ("failed_files", "failed_count"),
+            ("unprocessed_files", "unprocessed_count"),
+        ):
+            for record in result.get(key, []):
+                index = self.source_of(record.get("file_path", ""))
+                if index is not None:
+                    breakdown[index][count_key] += 1
+        return breakdown
+
+    def add_breakdown(self, result: dict) -> dict:
+        """有多个来源时在结果中加入 source_breakdown"""
+        if len(self.source_folders) > 1:
+            result["source_breakdown"] = self.build_breakdown(result)
+        return result
+
+
+def scan_sources(source_folders: tuple[str, ...], max_depth: int = 1) -> SourceScan:
+    """
+    并发扫描多个源文件夹并合并
+
+    Args:
+        source_folders: 源文件夹列表
+        max_depth: 最大扫描深度
+
+    Returns:
+        合并扫描结果
+
+    Raises:
+        ValueError: 任一源文件夹不存在或不是目录
+    """
+    folder_files = get_folders_files_by_depth(list(source_folders), max_depth=max_depth)
+    scan = SourceScan(source_folders=tuple(source_folders))
+
+    if len(folder_files) == 1:
+        scan.files = folder_files[0]
+        scan.source_counts = [len(scan.files)]
+        return scan
+
+    for index, files in enumerate(folder_files):
+        count = 0
+        for file_info in files:
+            if file_info[0] in scan._file_sources:
+                continue
+            scan._file_sources[file_info[0]] = index
+            scan.files.append(file_info)
+            count += 1
+        scan.source_counts.append(count)
+    return scan
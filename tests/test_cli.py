@@ -0,0 +1,47 @@
+"""命令行入口的测试"""
+
+import io
+import json
+
+from easyfc.cli import EXIT_OK, main
+
+
+def run_cli(argv: list[str]) -> tuple[int, list[dict]]:
+    """运行命令行，返回(退出码, 输出的事件列表)"""
+    stdout = io.StringIO()
+    exit_code = main(argv, stdout=stdout)
+    return exit_code, [json.loads(line) for line in stdout.getvalue().splitlines()]
+
+
+def test_delimiter_mode_without_profile_uses_classifier_defaults(tmp_path):
+    """delimiter 模式不指定配置方案时使用分类器的默认分隔符和位置"""
+    source_dir = tmp_path / "src"
+    source_dir.mkdir()
+    (source_dir / "a_cat_b.txt").write_text("a", encoding="utf-8")
+    (source_dir / "x_dog_y.jpg").write_text("x", encoding="utf-8")
+    target_dir = tmp_path / "dst"
+
+    exit_code, events = run_cli(["-m", "delimiter", str(source_dir), str(target_dir), "--no-journal"])
+
+    assert exit_code == EXIT_OK
+    result = events[-1]
+    assert result["event"] == "result"
+    assert result["success_count"] == 2
+    assert (target_dir / "cat" / "a_cat_b.txt").exists()
+    assert (target_dir / "dog" / "x_dog_y.jpg").exists()
+
+
+def test_delimiter_mode_with_explicit_delimiters(tmp_path):
+    """只指定分隔符时结束位置仍为默认的第 2 个分隔符"""
+    source_dir = tmp_path / "src"
+    source_dir.mkdir()
+    (source_dir / "a-cat-b.txt").write_text("a", encoding="utf-8")
+    target_dir = tmp_path / "dst"
+
+    exit_code, _ = run_cli([
+        "-m", "delimiter", str(source_dir), str(target_dir),
+        "--delimiter-start", "-", "--delimiter-end", "-", "--no-journal"
+    ])
+
+    assert exit_code == EXIT_OK
+    assert (target_dir / "cat" / "a-cat-b.txt").exists()
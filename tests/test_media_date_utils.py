@@ -0,0 +1,38 @@
+"""拍摄日期读取的测试"""
+
+import io
+import struct
+
+import pytest
+
+from utils.media_date_utils import _read_jpeg_datetime
+
+
+def jpeg_with_exif_datetime(value: bytes) -> bytes:
+    """构造只含 APP1(Exif) 段的 JPEG，IFD0 中只有 DateTime 标签"""
+    ifd_offset = 8
+    value_offset = ifd_offset + 2 + 12 + 4
+    tiff = b"II*\x00" + struct.pack("<I", ifd_offset)
+    tiff += struct.pack("<H", 1) + struct.pack("<HHII", 0x0132, 2, len(value), value_offset) + b"\x00" * 4
+    tiff += value
+    segment = b"Exif\x00\x00" + tiff
+    return b"\xff\xd8\xff\xe1" + struct.pack(">H", len(segment) + 2) + segment + b"\xff\xd9"
+
+
+def test_reads_exif_datetime():
+    """读取 APP1 段中的拍摄日期"""
+    data = jpeg_with_exif_datetime(b"2021:07:15 10:20:30\x00")
+
+    capture_date = _read_jpeg_datetime(io.BytesIO(data))
+
+    assert (capture_date.year, capture_date.month, capture_date.day) == (2021, 7, 15)
+
+
+@pytest.mark.parametrize("marker", [b"\xff\xe1", b"\xff\xe0"])
+@pytest.mark.parametrize("length", [0, 1])
+def test_segment_length_below_two_returns_none(marker, length):
+    """段长度小于 2 的损坏文件返回 None，不读取整个文件或回退读取位置"""
+    exif_segment = jpeg_with_exif_datetime(b"2021:07:15 10:20:30\x00")[6:]
+    data = b"\xff\xd8" + marker + struct.pack(">H", length) + exif_segment
+
+    assert _read_jpeg_datetime(io.BytesIO(data)) is None
@@ -0,0 +1,40 @@
+"""进度汇总的测试"""
+
+import pytest
+
+from models import progress
+from models.progress import PHASE_COPY, ProgressReporter
+
+
+class FakeClock:
+    """可手动推进的 time.monotonic"""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(progress.time, "monotonic", clock)
+    return clock
+
+
+def test_rate_excludes_files_processed_before_this_run(clock):
+    """已处理数量包含跳过和续传前完成的文件，速度和剩余时间只按本次处理的文件计算"""
+    snapshots = []
+    reporter = ProgressReporter(0, snapshots.append, interval=0.0)
+    reporter.start_phase(PHASE_COPY, 100)
+
+    clock.now += 10.0
+    for index in range(10):
+        reporter.update(60 + index + 1, f"{index}.txt")
+        reporter.file_done(0, True)
+
+    snapshot = reporter.snapshot()
+    assert snapshot.processed == 70
+    assert snapshot.files_per_second == pytest.approx(1.0)
+    assert snapshot.eta == pytest.approx(30.0)
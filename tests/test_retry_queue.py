@@ -0,0 +1,269 @@
+"""延迟重试队列与分类方案重试流程的测试"""
+
+import errno
+import os
+import shutil
+
+import pytest
+
+import models.classification_plan as classification_plan
+from models.classification_plan import ClassificationPlan, PlanOperation
+from models.failures import ERR_COPY, ERR_REMOVE
+from utils.file_utils import OP_COPY
+from utils.job_control import JobCancelled, JobControl
+from utils.retry_queue import RETRY_MAX_ATTEMPTS, RetryQueue
+
+
+def busy_error() -> OSError:
+    """暂时性错误：文件被占用"""
+    return OSError(errno.EBUSY, os.strerror(errno.EBUSY))
+
+
+class RecordingJournal:
+    """只记录调用参数的运行日志"""
+
+    def __init__(self):
+        self.records = []
+
+    def record(self, source_path: str, target_path: str, moved: bool):
+        self.records.append((source_path, target_path, moved))
+
+
+@pytest.fixture(autouse=True)
+def fast_retry(monkeypatch):
+    """方案执行时使用不等待的重试队列"""
+    monkeypatch.setattr(classification_plan, "RetryQueue", lambda: RetryQueue(base_delay=0.0))
+
+
+def make_plan(tmp_path, names, delete_source=False, category="文本文件") -> ClassificationPlan:
+    """在 tmp_path/src 中创建源文件，返回复制到 tmp_path/dst/category 的方案"""
+    source_dir = tmp_path / "src"
+    source_dir.mkdir(exist_ok=True)
+    plan = ClassificationPlan(
+        target_dir=str(tmp_path / "dst"),
+        delete_source=delete_source,
+        total_files=len(names)
+    )
+    for name in names:
+        source_path = source_dir / name
+        source_path.write_text(name, encoding="utf-8")
+        stat_result = source_path.stat()
+        plan.operations.append(PlanOperation(
+            source_path=str(source_path),
+            file_name=name,
+            category=category,
+            target_path=str(tmp_path / "dst" / category / name),
+            size=stat_result.st_size,
+            mtime=stat_result.st_mtime
+        ))
+    return plan
+
+
+def test_defer_only_transient_errors():
+    """非暂时性错误和达到最大尝试次数的项目不入队"""
+    queue = RetryQueue(max_attempts=3, base_delay=0.0)
+
+    assert not queue.defer("denied", OSError(errno.EACCES, "denied"), 1)
+    assert queue.defer("busy", busy_error(), 1)
+    assert queue.defer("busy", busy_error(), 2)
+    assert not queue.defer("busy", busy_error(), 3)
+    assert len(queue) == 2
+    assert queue.deferred_count == 1
+
+
+def test_drain_yields_items_in_ready_order():
+    """按就绪时间取出，迭代中再次入队的项目随后取出"""
+    queue = RetryQueue(base_delay=0.0)
+    queue.defer("a", busy_error(), 1)
+    queue.defer("b", busy_error(), 1)
+
+    drained = []
+    for item, attempts in queue.drain():
+        drained.append((item, attempts))
+        if item == "a" and attempts == 1:
+            queue.defer(item, busy_error(), attempts + 1)
+
+    assert drained == [("a", 1), ("b", 1), ("a", 2)]
+    assert queue.deferred_count == 2
+
+
+def test_drain_stops_when_cancelled():
+    """等待期间任务被取消时抛出 JobCancelled，项目仍在队列中"""
+    queue = RetryQueue(base_delay=0.0)
+    queue.defer("a", busy_error(), 1)
+    control = JobControl()
+    control.cancel()
+
+    with pytest.raises(JobCancelled):
+        next(queue.drain(control))
+    assert queue.pending() == [("a", 1)]
+
+
+def test_transient_copy_error_is_retried(tmp_path, monkeypatch):
+    """复制暂时失败的文件在主流程之后重试成功"""
+    plan = make_plan(tmp_path, ["a.txt", "b.txt"])
+    real_copy2 = shutil.copy2
+    failures = {"a.txt": 2}
+
+    def flaky_copy2(source, target, *args, **kwargs):
+        name = os.path.basename(source)
+        if failures.get(name):
+            failures[name] -= 1
+            raise busy_error()
+        return real_copy2(source, target, *args, **kwargs)
+
+    monkeypatch.setattr(shutil, "copy2", flaky_copy2)
+    result = plan.execute()
+
+    assert result["success_count"] == 2
+    assert result["failed_count"] == 0
+    assert result["retried_count"] == 1
+    assert [record["file_name"] for record in result["success_files"]] == ["b.txt", "a.txt"]
+    assert (tmp_path / "dst" / "文本文件" / "a.txt").read_text(encoding="utf-8") == "a.txt"
+
+
+def test_transient_copy_error_fails_after_max_attempts(tmp_path, monkeypatch):
+    """一直失败的文件达到最大尝试次数后记为失败，不留下部分目标文件"""
+    plan = make_plan(tmp_path, ["a.txt"])
+    calls = []
+
+    def busy_copy2(source, target, *args, **kwargs):
+        calls.append(target)
+        with open(target, "wb") as f:
+            f.write(b"partial")
+        raise busy_error()
+
+    monkeypatch.setattr(shutil, "copy2", busy_copy2)
+    result = plan.execute()
+
+    assert len(calls) == RETRY_MAX_ATTEMPTS
+    assert result["success_count"] == 0
+    assert result["retried_count"] == 1
+    [failure] = result["failed_files"]
+    assert failure["code"] == ERR_COPY
+    assert failure["errno"] == errno.EBUSY
+    assert failure["attempts"] == RETRY_MAX_ATTEMPTS
+    assert failure["target_category"] == "文本文件"
+    assert os.listdir(tmp_path / "dst" / "文本文件") == []
+
+
+def test_remove_retry_does_not_copy_again(tmp_path, monkeypatch):
+    """删除源文件暂时失败时，重试只删除源文件，不再复制出第二个副本"""
+    plan = make_plan(tmp_path, ["a.txt"], delete_source=True)
+    source_path = plan.operations[0].source_path
+    target_path = plan.operations[0].target_path
+    real_copy2 = shutil.copy2
+    real_remove = os.remove
+    copies = []
+    remove_failures = {"count": 1}
+
+    def counting_copy2(source, target, *args, **kwargs):
+        copies.append(target)
+        return real_copy2(source, target, *args, **kwargs)
+
+    def flaky_remove(path, *args, **kwargs):
+        if path == source_path and remove_failures["count"]:
+            remove_failures["count"] -= 1
+            raise busy_error()
+        return real_remove(path, *args, **kwargs)
+
+    monkeypatch.setattr(shutil, "copy2", counting_copy2)
+    monkeypatch.setattr(os, "remove", flaky_remove)
+    journal = RecordingJournal()
+    result = plan.execute(journal=journal)
+
+    assert result["success_count"] == 1
+    assert copies == [target_path]
+    assert not os.path.exists(source_path)
+    assert os.listdir(tmp_path / "dst" / "文本文件") == ["a.txt"]
+    assert journal.records == [(source_path, target_path, True)]
+
+
+def test_remove_failure_is_journaled_as_copy_when_given_up(tmp_path, monkeypatch):
+    """删除源文件最终失败时，已完成的副本按复制记入运行日志"""
+    plan = make_plan(tmp_path, ["a.txt"], delete_source=True)
+    source_path = plan.operations[0].source_path
+    target_path = plan.operations[0].target_path
+    real_remove = os.remove
+
+    def busy_remove(path, *args, **kwargs):
+        if path == source_path:
+            raise busy_error()
+        return real_remove(path, *args, **kwargs)
+
+    monkeypatch.setattr(os, "remove", busy_remove)
+    journal = RecordingJournal()
+    result = plan.execute(journal=journal)
+
+    [failure] = result["failed_files"]
+    assert failure["code"] == ERR_REMOVE
+    assert failure["attempts"] == RETRY_MAX_ATTEMPTS
+    assert os.path.exists(source_path)
+    assert journal.records == [(source_path, target_path, False)]
+
+
+def test_cancel_abandons_pending_retries(tmp_path, monkeypatch):
+    """取消时仍在重试队列中的文件计为未处理，已完成的副本按复制记入运行日志"""
+    plan = make_plan(tmp_path, ["a.txt"], delete_source=True)
+    source_path = plan.operations[0].source_path
+    target_path = plan.operations[0].target_path
+    real_remove = os.remove
+    control = JobControl()
+
+    def remove_then_cancel(path, *args, **kwargs):
+        if path == source_path:
+            control.cancel()
+            raise busy_error()
+        return real_remove(path, *args, **kwargs)
+
+    monkeypatch.setattr(os, "remove", remove_then_cancel)
+    journal = RecordingJournal()
+    result = plan.execute(control=control, journal=journal)
+
+    assert result["cancelled"] is True
+    assert result["failed_count"] == 0
+    assert result["retried_count"] == 1
+    assert result["unprocessed_files"] == [{"file_path": source_path, "file_name": "a.txt"}]
+    assert journal.records == [(source_path, target_path, False)]
+
+
+def test_mkdir_error_is_not_cached_for_retry(tmp_path, monkeypatch):
+    """创建目录暂时失败时清除目录缓存，同目录的下一个文件和重试时都会重新创建目录"""
+    plan = make_plan(tmp_path, ["a.txt", "b.txt"])
+    (tmp_path / "dst").mkdir()
+    real_makedirs = os.makedirs
+    calls = []
+
+    def flaky_makedirs(path, *args, **kwargs):
+        calls.append(path)
+        if len(calls) == 1:
+            raise busy_error()
+        return real_makedirs(path, *args, **kwargs)
+
+    monkeypatch.setattr(os, "makedirs", flaky_makedirs)
+    result = plan.execute()
+
+    assert result["success_count"] == 2
+    assert result["failed_count"] == 0
+    assert result["retried_count"] == 1
+    assert calls == [str(tmp_path / "dst" / "文本文件")] * 2
+    assert sorted(os.listdir(tmp_path / "dst" / "文本文件")) == ["a.txt", "b.txt"]
+
+
+def test_non_transient_error_is_not_retried(tmp_path, monkeypatch):
+    """非暂时性错误直接记为失败"""
+    plan = make_plan(tmp_path, ["a.txt"])
+    calls = []
+
+    def denied_copy2(source, target, *args, **kwargs):
+        calls.append(target)
+        raise OSError(errno.EACCES, os.strerror(errno.EACCES))
+
+    monkeypatch.setattr(shutil, "copy2", denied_copy2)
+    result = plan.execute()
+
+    assert len(calls) == 1
+    assert result["retried_count"] == 0
+    [failure] = result["failed_files"]
+    assert failure["code"] == OP_COPY
+    assert "attempts" not in failure
@@ -0,0 +1,84 @@
+"""本地 HTTP 服务的测试"""
+
+import http.client
+import json
+import threading
+
+import pytest
+
+from easyfc.server import ClassificationService, ServiceHTTPServer
+
+TOKEN = "test-token"
+
+
+@pytest.fixture
+def service():
+    service = ClassificationService(max_workers=1)
+    yield service
+    service.shutdown()
+
+
+@pytest.fixture
+def server(service):
+    """在随机端口启动服务，返回端口"""
+    server = ServiceHTTPServer(("127.0.0.1", 0), service, TOKEN)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server.server_address[1]
+    server.shutdown()
+    server.server_close()
+
+
+def post_jobs(port: int, body: bytes, content_length: str) -> tuple[int, dict]:
+    """向 /jobs 发送指定 Content-Length 的请求，返回(状态码, 响应)"""
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    connection.putrequest("POST", "/jobs")
+    connection.putheader("Authorization", f"Bearer {TOKEN}")
+    connection.putheader("Content-Type", "application/json")
+    connection.putheader("Content-Length", content_length)
+    connection.endheaders(body)
+    response = connection.getresponse()
+    data = json.loads(response.read())
+    connection.close()
+    return response.status, data
+
+
+@pytest.mark.parametrize("options, message", [
+    ({"bogus": 1}, "不支持参数: bogus"),
+    ({"delimiter_start_str": "_", "delimiter_end_str": "_", "delimiter_start_pos": "1"}, "类型无效"),
+    ({"delimiter_start_str": "_", "delimiter_end_str": "_", "delimiter_end_pos": True}, "类型无效"),
+    ({"delimiter_start_str": "_", "delimiter_end_str": "_", "delete_source": True}, "不能放在分类器参数中"),
+])
+def test_invalid_options_are_rejected_on_submit(tmp_path, service, options, message):
+    """未知或类型不符的分类器参数在提交时报错，不创建任务"""
+    with pytest.raises(ValueError, match=message):
+        service.submit({
+            "classifier_name": "delimiter",
+            "source_folder": str(tmp_path),
+            "target_folder": str(tmp_path / "dst"),
+            "options": options
+        })
+    assert service.list_jobs() == []
+
+
+def test_invalid_options_return_bad_request(tmp_path, server):
+    """参数无效的请求返回 400"""
+    body = json.dumps({
+        "classifier_name": "date",
+        "source_folder": str(tmp_path),
+        "target_folder": str(tmp_path / "dst"),
+        "options": {"max_workers": "4"}
+    }).encode("utf-8")
+
+    status, data = post_jobs(server, body, str(len(body)))
+
+    assert status == 400
+    assert "max_workers" in data["error"]
+
+
+def test_negative_content_length_returns_bad_request(server):
+    """Content-Length 为负数时直接返回 400，不阻塞在读取请求体上"""
+    status, data = post_jobs(server, b"", "-1")
+
+    assert status == 400
+    assert "Content-Length" in data["error"]
@@ -1,11 +1,21 @@
 """工具函数模块"""
 
 from .file_utils import (
+    FileOperationError,
+    atomic_write_bytes,
+    atomic_write_text,
     copy_file,
+    copy_file_to,
     create_dir_if_not_exists,
+    format_file_size,
     get_extension,
     get_files_by_extension,
     get_folder_files,
     get_folder_files_by_depth,
     get_folder_files_recursive,
+    get_folders_files_by_depth,
+    is_transient_error,
+    remove_source_file,
+    sample_folder_file_names,
+    transfer_file,
 )
@@ -0,0 +1,169 @@
+"""进程内共享的配置缓存
+
+每个配置文件只解析一次，解析和规范化后的结果按文件路径缓存；每次取用时只比较文件的
+修改时间和大小，变化后才重新解析。配置管理器、界面对话框、命令行监视模式和本地服务
+共用同一份缓存，配置文件被编辑后下次取用即生效，无需重启。
+
+缓存的对象由所有调用方共享，调用方不能修改，需要修改时先复制。
+
+编译缓存（配置文件旁的 .cache 文件）保存编译后的结果及配置文件的(修改时间, 大小)
+和内容的 SHA-256。进程首次启动时先比较修改时间和大小，相同时不读取配置文件；不同时
+才读取并计算 SHA-256，内容未变化（如只是被复制或 touch）时仍使用缓存并更新签名。
+缓存文件损坏、版本不符或无法写入时直接回退到解析原文件。
+"""
+
+import hashlib
+import marshal
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+
+from .file_utils import atomic_write_bytes
+
+FileSignature = tuple[int, int]
+
+COMPILED_CACHE_SUFFIX = ".cache"
+COMPILED_CACHE_VERSION = 2
+
+
+def get_file_signature(path: Union[str, Path]) -> Optional[FileSignature]:
+    """
+    获取文件的(修改时间, 大小)
+
+    Returns:
+        文件不存在或无法访问时返回 None
+    """
+    try:
+        stat_result = os.stat(path)
+    except OSError:
+        return None
+    return stat_result.st_mtime_ns, stat_result.st_size
+
+
+def get_compiled_cache_path(path: Union[str, Path]) -> Path:
+    """配置文件对应的编译缓存文件路径"""
+    path = Path(path)
+    return path.with_name(path.name + COMPILED_CACHE_SUFFIX)
+
+
+def get_content_digest(data: bytes) -> str:
+    """配置文件内容的 SHA-256"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def read_compiled_cache(path: Union[str, Path], kind: str) -> Optional[dict]:
+    """
+    读取编译缓存
+
+    Args:
+        path: 配置文件路径
+        kind: 缓存内容的类型，编译格式变化时随之修改
+
+    Returns:
+        包含 signature（配置文件的(修改时间, 大小)）、digest（内容的 SHA-256）和
+        value（编译结果）的字典；缓存不存在、损坏或版本、类型不符时返回 None
+    """
+    try:
+        with open(get_compiled_cache_path(path), "rb") as f:
+            cached = marshal.loads(f.read())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+    if (
+        not isinstance(cached, dict)
+        or cached.get("version") != COMPILED_CACHE_VERSION
+        or cached.get("kind") != kind
+        or not isinstance(cached.get("signature"), tuple)
+        or not isinstance(cached.get("digest"), str)
+    ):
+        return None
+    return cached
+
+
+def write_compiled_cache(
+    path: Union[str, Path],
+    kind: str,
+    signature: FileSignature,
+    digest: str,
+    value: Any
+):
+    """
+    写入编译缓存，只能包含 marshal 支持的内置类型；写入失败（如目录只读）时忽略
+
+    Args:
+        path: 配置文件路径
+        kind: 缓存内容的类型
+        signature: 读取配置文件之前获取的(修改时间, 大小)
+        digest: 配置文件内容的 SHA-256
+        value: 编译结果
+    """
+    payload = {
+        "version": COMPILED_CACHE_VERSION,
+        "kind": kind,
+        "signature": tuple(signature),
+        "digest": digest,
+        "value": value,
+    }
+    try:
+        atomic_write_bytes(get_compiled_cache_path(path), marshal.dumps(payload), durable=False)
+    except (OSError, ValueError):
+        pass
+
+
+class ConfigService:
+    """按文件签名失效的配置缓存"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._entries: dict[tuple[str, str], tuple[FileSignature, Any]] = {}
+
+    def load(self, path: Union[str, Path], parser: Callable[[Path], Any], key: Optional[str] = None) -> Any:
+        """
+        读取配置文件，文件未变化时直接返回缓存
+
+        Args:
+            path: 配置文件路径
+            parser: 解析函数，参数为文件路径，返回解析结果；出错时抛出异常，异常不会被缓存
+            key: 同一文件的不同解析结果（如按方案构建的查找表）用不同的键区分，默认为解析函数名称
+
+        Returns:
+            解析结果
+        """
+        path = Path(path)
+        cache_key = (os.path.normcase(os.path.abspath(path)), key or parser.__qualname__)
+
+        with self._lock:
+            signature = get_file_signature(path)
+            if signature is not None:
+                cached = self._entries.get(cache_key)
+                if cached is not None and cached[0] == signature:
+                    return cached[1]
+
+            value = parser(path)
+            if signature is not None and get_file_signature(path) == signature:
+                self._entries[cache_key] = (signature, value)
+            return value
+
+    def invalidate(self, path: Optional[Union[str, Path]] = None):
+        """
+        使缓存失效，写入配置文件后调用
+
+        Args:
+            path: 配置文件路径，不指定时全部失效
+        """
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+                return
+            normalized = os.path.normcase(os.path.abspath(path))
+            for cache_key in [cache_key for cache_key in self._entries if cache_key[0] == normalized]:
+                del self._entries[cache_key]
+
+
+_config_service = ConfigService()
+
+
+def get_config_service() -> ConfigService:
+    """获取进程内共享的配置缓存"""
+    return _config_service
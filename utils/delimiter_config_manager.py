@@ -2,10 +2,12 @@
 
 import json
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from pathlib import Path
 from typing import List, Optional
 
+from .config_service import get_config_service
+from .file_utils import atomic_write_text
 from .path_utils import get_config_path
 
 
@@ -72,6 +74,15 @@ class DelimiterConfig:
 
         return True, ""
 
+    def to_classifier_options(self) -> dict:
+        """转换为分隔符分类器的参数"""
+        return {
+            "delimiter_start_str": self.delimiter_start,
+            "delimiter_end_str": self.delimiter_end,
+            "delimiter_start_pos": self.start_pos,
+            "delimiter_end_pos": self.end_pos,
+        }
+
 
 class DelimiterConfigManager:
     """分隔符配置管理器"""
@@ -92,6 +103,13 @@ class DelimiterConfigManager:
 
         self._configs: List[DelimiterConfig] = []
         self._load_error: Optional[str] = None
+        self._batch_depth: int = 0
+        self._has_pending_changes: bool = False
+
+    @property
+    def has_pending_changes(self) -> bool:
+        """批量编辑中是否有尚未写入文件的修改"""
+        return self._has_pending_changes
 
     @property
     def configs(self) -> List[DelimiterConfig]:
@@ -108,50 +126,62 @@ class DelimiterConfigManager:
         """获取配置文件路径"""
         return self.config_dir / self.DEFAULT_CONFIG_FILE
 
-    def load_configs(self) -> bool:
+    @staticmethod
+    def _parse_config_file(path: Path) -> tuple[DelimiterConfig, ...]:
         """
-        加载配置文件
-        
+        解析并验证配置文件
+
         Returns:
-            是否加载成功
-        """
-        self._configs = []
-        self._load_error = None
+            配置元组
 
-        if not self.config_file_path.exists():
-            self._load_error = f"配置文件不存在: {self.config_file_path}"
-            return False
+        Raises:
+            ValueError: 文件不存在、无法读取、格式错误或某个配置项验证失败
+        """
+        if not path.exists():
+            raise ValueError(f"配置文件不存在: {path}")
 
         try:
-            with open(self.config_file_path, "r", encoding="utf-8") as f:
+            with open(path, "r", encoding="utf-8") as f:
                 data = json.load(f)
         except json.JSONDecodeError as e:
-            self._load_error = f"配置文件JSON格式错误: {str(e)}"
-            return False
+            raise ValueError(f"配置文件JSON格式错误: {str(e)}")
         except IOError as e:
-            self._load_error = f"读取配置文件失败: {str(e)}"
-            return False
+            raise ValueError(f"读取配置文件失败: {str(e)}")
 
         if not isinstance(data, list):
-            self._load_error = "配置文件格式错误: 根元素必须是数组"
-            return False
+            raise ValueError("配置文件格式错误: 根元素必须是数组")
 
         valid_configs = []
         for index, item in enumerate(data):
             if not isinstance(item, dict):
-                self._load_error = f"配置项 {index + 1} 格式错误: 必须是对象"
-                return False
+                raise ValueError(f"配置项 {index + 1} 格式错误: 必须是对象")
 
             config = DelimiterConfig.from_dict(item)
             is_valid, error_msg = config.validate()
 
             if not is_valid:
-                self._load_error = f"配置项 '{config.name or index + 1}' 验证失败: {error_msg}"
-                return False
+                raise ValueError(f"配置项 '{config.name or index + 1}' 验证失败: {error_msg}")
 
             valid_configs.append(config)
+        return tuple(valid_configs)
 
-        self._configs = valid_configs
+    def load_configs(self) -> bool:
+        """
+        加载配置文件；文件自上次读取后未修改时直接使用缓存，不重新解析和验证
+        
+        Returns:
+            是否加载成功
+        """
+        self._configs = []
+        self._load_error = None
+
+        try:
+            configs = get_config_service().load(self.config_file_path, self._parse_config_file)
+        except ValueError as e:
+            self._load_error = str(e)
+            return False
+
+        self._configs = [replace(config) for config in configs]
         return True
 
     def get_config_by_name(self, name: str) -> Optional[DelimiterConfig]:
@@ -192,14 +222,43 @@ class DelimiterConfigManager:
         data = [config.to_dict() for config in configs]
 
         try:
-            with open(self.config_file_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=4)
-        except IOError as e:
+            atomic_write_text(self.config_file_path, json.dumps(data, ensure_ascii=False, indent=4))
+        except OSError as e:
             return False, f"写入配置文件失败: {str(e)}"
+        finally:
+            get_config_service().invalidate(self.config_file_path)
 
         self._configs = configs
+        self._has_pending_changes = False
         return True, ""
 
+    def begin_batch(self):
+        """
+        开始批量编辑，之后的 add_config、update_config、delete_config 只修改内存中的配置，
+        调用 flush 时一次写入文件。可以嵌套，最外层的 flush 才写入。
+        """
+        self._batch_depth += 1
+
+    def flush(self) -> tuple[bool, str]:
+        """
+        结束批量编辑并写入修改，没有修改时不写文件
+
+        Returns:
+            (是否成功, 错误信息)
+        """
+        if self._batch_depth > 0:
+            self._batch_depth -= 1
+        if self._batch_depth > 0 or not self._has_pending_changes:
+            return True, ""
+        return self.save_configs(self._configs)
+
+    def _commit_changes(self) -> tuple[bool, str]:
+        """批量编辑时只标记修改，否则立即写入"""
+        if self._batch_depth > 0:
+            self._has_pending_changes = True
+            return True, ""
+        return self.save_configs(self._configs)
+
     def add_config(self, config: DelimiterConfig) -> tuple[bool, str]:
         """
         添加新配置
@@ -218,7 +277,7 @@ class DelimiterConfigManager:
             return False, f"配置名称 '{config.name}' 已存在"
 
         self._configs.append(config)
-        return self.save_configs(self._configs)
+        return self._commit_changes()
 
     def update_config(self, old_name: str, config: DelimiterConfig) -> tuple[bool, str]:
         """
@@ -240,7 +299,7 @@ class DelimiterConfigManager:
                 if old_name != config.name and self.get_config_by_name(config.name):
                     return False, f"配置名称 '{config.name}' 已存在"
                 self._configs[i] = config
-                return self.save_configs(self._configs)
+                return self._commit_changes()
 
         return False, f"未找到配置 '{old_name}'"
 
@@ -257,6 +316,6 @@ class DelimiterConfigManager:
         for i, config in enumerate(self._configs):
             if config.name == name:
                 self._configs.pop(i)
-                return self.save_configs(self._configs)
+                return self._commit_changes()
 
         return False, f"未找到配置 '{name}'"
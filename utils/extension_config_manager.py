@@ -5,6 +5,15 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+from .config_service import (
+    get_config_service,
+    get_content_digest,
+    get_file_signature,
+    read_compiled_cache,
+    write_compiled_cache,
+)
+from .extension_trie import ExtensionSuffixTrie
+from .file_utils import atomic_write_text
 from .path_utils import get_config_path
 
 
@@ -27,8 +36,11 @@ class ExtensionMapping:
         if not self.category:
             return False, "分类名称不能为空"
 
-        if not all(c.isalnum() or c == '_' for c in self.extension):
-            return False, "扩展名只能包含字母、数字和下划线"
+        if not all(c.isalnum() or c in "_." for c in self.extension):
+            return False, "扩展名只能包含字母、数字、下划线和点"
+
+        if "" in self.extension.split("."):
+            return False, "多段扩展名的每一段都不能为空，如 tar.gz"
 
         return True, ""
 
@@ -38,6 +50,7 @@ class ExtensionConfigManager:
 
     DEFAULT_CONFIG_FILE = "extension_configs.json"
     DEFAULT_PROFILE = "default"
+    COMPILED_CACHE_KIND = "extension_lookups"
 
     def __init__(self, config_dir: Optional[str] = None):
         """
@@ -81,9 +94,110 @@ class ExtensionConfigManager:
         """获取当前配置方案名称"""
         return self._current_profile
 
+    @classmethod
+    def _parse_config_file(cls, path: Path) -> dict:
+        """
+        解析并编译配置文件：所有方案的扩展名统一转为小写、去掉开头的点，并为每个有效方案构建后缀树
+
+        编译结果保存到编译缓存。文件的修改时间和大小未变化时直接读取缓存，不读取配置文件；
+        变化后才读取并计算 SHA-256，内容未变化时仍使用缓存，不再解析 JSON、逐项检查和构建后缀树。
+
+        Returns:
+            {"profiles": 方案名称到映射表的字典（格式错误的方案为 None），
+             "lookups": 方案名称到后缀树结构（ExtensionSuffixTrie.to_state）的字典}
+
+        Raises:
+            ValueError: 文件不存在、无法读取或格式错误
+        """
+        signature = get_file_signature(path)
+        if signature is None:
+            raise ValueError(f"配置文件不存在: {path}")
+
+        cached = read_compiled_cache(path, cls.COMPILED_CACHE_KIND)
+        if cached is not None and not cls._is_compiled(cached["value"]):
+            cached = None
+        if cached is not None and cached["signature"] == signature:
+            return cached["value"]
+
+        try:
+            with open(path, "rb") as f:
+                raw = f.read()
+        except IOError as e:
+            raise ValueError(f"读取配置文件失败: {str(e)}")
+
+        digest = get_content_digest(raw)
+        if cached is not None and cached["digest"] == digest:
+            write_compiled_cache(path, cls.COMPILED_CACHE_KIND, signature, digest, cached["value"])
+            return cached["value"]
+
+        try:
+            data = json.loads(raw.decode("utf-8"))
+        except json.JSONDecodeError as e:
+            raise ValueError(f"配置文件JSON格式错误: {str(e)}")
+
+        if not isinstance(data, dict):
+            raise ValueError("配置文件格式错误: 根元素必须是对象")
+
+        profiles = {}
+        lookups = {}
+        for profile_name, profile_data in data.items():
+            if not isinstance(profile_data, dict):
+                profiles[profile_name] = None
+                continue
+
+            valid_mappings = {}
+            for ext, category in profile_data.items():
+                if not isinstance(ext, str) or not isinstance(category, str):
+                    continue
+                valid_mappings[ext.lower().lstrip(".")] = category
+            profiles[profile_name] = valid_mappings
+            lookups[profile_name] = ExtensionSuffixTrie(valid_mappings).to_state()
+
+        compiled = {"profiles": profiles, "lookups": lookups}
+        write_compiled_cache(path, cls.COMPILED_CACHE_KIND, signature, digest, compiled)
+        return compiled
+
+    @staticmethod
+    def _is_compiled(value) -> bool:
+        """编译缓存中的结果是否为 _parse_config_file 的格式"""
+        return (
+            isinstance(value, dict)
+            and isinstance(value.get("profiles"), dict)
+            and isinstance(value.get("lookups"), dict)
+        )
+
+    def _load_compiled(self) -> dict:
+        """
+        通过共享配置缓存读取编译结果，返回的字典不能修改
+
+        Raises:
+            ValueError: 文件不存在、无法读取或格式错误
+        """
+        return get_config_service().load(self.config_file_path, self._parse_config_file)
+
+    def _load_profiles(self) -> Dict[str, Optional[Dict[str, str]]]:
+        """
+        通过共享配置缓存读取全部方案，返回的字典不能修改
+
+        Raises:
+            ValueError: 文件不存在、无法读取或格式错误
+        """
+        return self._load_compiled()["profiles"]
+
+    def _get_profile_mappings(self, profiles: dict, profile: str) -> Dict[str, str]:
+        """
+        Raises:
+            ValueError: 方案不存在或格式错误
+        """
+        if profile not in profiles:
+            raise ValueError(f"配置方案 '{profile}' 不存在")
+        if profiles[profile] is None:
+            raise ValueError(f"配置方案 '{profile}' 格式错误: 必须是对象")
+        return profiles[profile]
+
     def load_configs(self, profile: Optional[str] = None) -> bool:
         """
-        加载配置文件
+        加载配置文件；文件自上次读取后未修改时直接使用缓存，不重新解析
         
         Args:
             profile: 配置方案名称，默认为 default
@@ -95,45 +209,68 @@ class ExtensionConfigManager:
         self._load_error = None
         target_profile = profile or self.DEFAULT_PROFILE
 
-        if not self.config_file_path.exists():
-            self._load_error = f"配置文件不存在: {self.config_file_path}"
-            return False
-
         try:
-            with open(self.config_file_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-        except json.JSONDecodeError as e:
-            self._load_error = f"配置文件JSON格式错误: {str(e)}"
-            return False
-        except IOError as e:
-            self._load_error = f"读取配置文件失败: {str(e)}"
+            profiles = self._load_profiles()
+            self._profiles = list(profiles.keys())
+            self._mappings = dict(self._get_profile_mappings(profiles, target_profile))
+        except ValueError as e:
+            self._load_error = str(e)
             return False
 
-        if not isinstance(data, dict):
-            self._load_error = "配置文件格式错误: 根元素必须是对象"
-            return False
+        self._current_profile = target_profile
+        return True
 
-        self._profiles = list(data.keys())
+    def load_lookup(self, profile: Optional[str] = None) -> ExtensionSuffixTrie:
+        """
+        获取配置方案的扩展名后缀树，直接由编译结果中的后缀树结构恢复，同一方案在配置文件修改前只恢复一次
 
-        if target_profile not in data:
-            self._load_error = f"配置方案 '{target_profile}' 不存在"
-            return False
+        Args:
+            profile: 配置方案名称，默认为 default
 
-        profile_data = data[target_profile]
-        if not isinstance(profile_data, dict):
-            self._load_error = f"配置方案 '{target_profile}' 格式错误: 必须是对象"
-            return False
+        Returns:
+            共享的只读后缀树
 
-        valid_mappings = {}
-        for ext, category in profile_data.items():
-            if not isinstance(ext, str) or not isinstance(category, str):
-                continue
-            ext_lower = ext.lower().lstrip(".")
-            valid_mappings[ext_lower] = category
+        Raises:
+            ValueError: 配置文件或方案无效
+        """
+        target_profile = profile or self.DEFAULT_PROFILE
 
-        self._mappings = valid_mappings
-        self._current_profile = target_profile
-        return True
+        def build_lookup(path: Path) -> ExtensionSuffixTrie:
+            compiled = self._load_compiled()
+            mappings = self._get_profile_mappings(compiled["profiles"], target_profile)
+            state = compiled["lookups"].get(target_profile)
+            if state is None:
+                return ExtensionSuffixTrie(mappings)
+            return ExtensionSuffixTrie.from_state(state)
+
+        return get_config_service().load(
+            self.config_file_path,
+            build_lookup,
+            key=f"extension_lookup:{target_profile}"
+        )
+
+    def create_profile(self, name: str, copy_current: bool = True) -> Tuple[bool, str]:
+        """
+        新建配置方案并切换到该方案，调用 save_configs 后写入文件
+        
+        Args:
+            name: 方案名称
+            copy_current: 是否以当前方案的映射为初始内容
+            
+        Returns:
+            (是否成功, 错误信息)
+        """
+        name = name.strip()
+        if not name:
+            return False, "方案名称不能为空"
+
+        if name in self._profiles:
+            return False, f"配置方案 '{name}' 已存在"
+
+        self._mappings = dict(self._mappings) if copy_current else {}
+        self._profiles.append(name)
+        self._current_profile = name
+        return True, ""
 
     def get_category(self, extension: str) -> Optional[str]:
         """
@@ -210,9 +347,23 @@ class ExtensionConfigManager:
         del self._mappings[ext_lower]
         return True, ""
 
+    def _read_raw_profiles(self, names: List[str]) -> Dict[str, object]:
+        """读取格式错误的方案的原始内容，保存时原样保留"""
+        try:
+            with open(self.config_file_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, IOError, ValueError):
+            return {}
+        if not isinstance(data, dict):
+            return {}
+        return {name: data[name] for name in names if name in data}
+
     def save_configs(self) -> Tuple[bool, str]:
         """
-        保存配置到文件
+        保存当前方案到文件
+
+        其他方案取自共享配置缓存，文件未被修改时不重新读取；先写临时文件再替换，
+        写入中断时原配置文件保持完整。
         
         Returns:
             (是否成功, 错误信息)
@@ -223,25 +374,29 @@ class ExtensionConfigManager:
             except OSError as e:
                 return False, f"创建配置目录失败: {str(e)}"
 
-        existing_data = {}
-        if self.config_file_path.exists():
-            try:
-                with open(self.config_file_path, "r", encoding="utf-8") as f:
-                    existing_data = json.load(f)
-            except (json.JSONDecodeError, IOError):
-                existing_data = {}
+        try:
+            profiles = self._load_profiles()
+        except ValueError:
+            profiles = {}
 
-        if not isinstance(existing_data, dict):
-            existing_data = {}
+        existing_data: Dict[str, object] = dict(profiles)
+        invalid_profiles = [name for name, mappings in profiles.items() if mappings is None]
+        if invalid_profiles:
+            existing_data.update(self._read_raw_profiles(invalid_profiles))
 
         existing_data[self._current_profile] = self._mappings
 
         try:
-            with open(self.config_file_path, "w", encoding="utf-8") as f:
-                json.dump(existing_data, f, ensure_ascii=False, indent=4)
-        except IOError as e:
+            atomic_write_text(
+                self.config_file_path,
+                json.dumps(existing_data, ensure_ascii=False, indent=4)
+            )
+        except OSError as e:
             return False, f"写入配置文件失败: {str(e)}"
+        finally:
+            get_config_service().invalidate(self.config_file_path)
 
+        self._profiles = list(existing_data.keys())
         return True, ""
 
     def import_from_dict(self, mappings: Dict[str, str]) -> Tuple[bool, str]:
@@ -0,0 +1,126 @@
+"""多段扩展名后缀树"""
+
+from types import MappingProxyType
+from typing import Mapping, Optional
+
+
+class ExtensionSuffixTrie:
+    """
+    按扩展名分段倒序构建的后缀树，用于匹配 tar.gz、nii.gz、d.ts 等多段扩展名
+
+    查找时从文件名末段向前逐段匹配，返回最长的已配置后缀。映射表中只有单段扩展名时，
+    查找退化为一次 rsplit 加一次字典查询。
+    """
+
+    def __init__(self, mappings: dict):
+        """
+        构建后缀树
+
+        Args:
+            mappings: 扩展名映射表，键为扩展名（可含点，如 "tar.gz"），值为分类名称
+        """
+        self._root: dict[str, tuple[Optional[str], dict]] = {}
+        self._max_depth = 1
+        self._size = 0
+        normalized: dict[str, str] = {}
+
+        for extension, category in mappings.items():
+            segments = [segment for segment in extension.lower().strip(".").split(".") if segment]
+            if not segments:
+                continue
+            self._insert(segments, category)
+            normalized[".".join(segments)] = category
+
+        self._mappings = MappingProxyType(normalized)
+
+    def to_state(self) -> tuple:
+        """
+        导出后缀树的内部结构，只包含内置类型，可保存到编译缓存
+
+        Returns:
+            (树根, 最大段数, 扩展名数量, 规范化后的映射表)
+        """
+        return self._root, self._max_depth, self._size, dict(self._mappings)
+
+    @classmethod
+    def from_state(cls, state: tuple) -> "ExtensionSuffixTrie":
+        """
+        由 to_state 导出的结构直接恢复后缀树，不再逐项插入
+
+        Raises:
+            ValueError: 结构无效
+        """
+        try:
+            root, max_depth, size, mappings = state
+        except (TypeError, ValueError):
+            raise ValueError("后缀树结构无效")
+        if not isinstance(root, dict) or not isinstance(mappings, dict):
+            raise ValueError("后缀树结构无效")
+
+        trie = cls.__new__(cls)
+        trie._root = root
+        trie._max_depth = max_depth
+        trie._size = size
+        trie._mappings = MappingProxyType(mappings)
+        return trie
+
+    def _insert(self, segments: list[str], category: str):
+        """插入一条映射，segments 为正序分段"""
+        children = self._root
+        depth = len(segments)
+        for index, segment in enumerate(reversed(segments)):
+            node_category, node_children = children.get(segment, (None, {}))
+            if index == depth - 1:
+                if node_category is None:
+                    self._size += 1
+                node_category = category
+            children[segment] = (node_category, node_children)
+            children = node_children
+        self._max_depth = max(self._max_depth, depth)
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def mappings(self) -> Mapping[str, str]:
+        """规范化后的映射表（小写、无首尾点），只读"""
+        return self._mappings
+
+    @property
+    def max_depth(self) -> int:
+        """最长扩展名的段数"""
+        return self._max_depth
+
+    def lookup(self, file_name: str) -> tuple[str, Optional[str]]:
+        """
+        查找文件名匹配的最长扩展名
+
+        Args:
+            file_name: 文件名
+
+        Returns:
+            (扩展名, 分类名称)；没有匹配的映射时扩展名为最后一段、分类为None，
+            文件名不含点时扩展名为空字符串
+        """
+        if "." not in file_name:
+            return "", None
+
+        parts = file_name.lower().rsplit(".", self._max_depth)
+        best_extension = parts[-1]
+        best_category = None
+
+        children = self._root
+        # parts[0] 是主文件名，不参与扩展名匹配
+        for depth in range(1, len(parts)):
+            node = children.get(parts[-depth])
+            if node is None:
+                break
+            category, children = node
+            if category is not None:
+                best_category = category
+                if depth > 1:
+                    best_extension = ".".join(parts[-depth:])
+            if not children:
+                break
+
+        return best_extension, best_category
@@ -1,9 +1,79 @@
 """文件操作工具类"""
 
+import errno
 import os
 import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Literal
+from typing import Callable, Literal, Optional
+
+from .job_control import JobCancelled
+
+COPY_CHUNK_SIZE = 4 * 1024 * 1024
+SCAN_MAX_WORKERS = 8
+
+OP_MKDIR = "mkdir"
+OP_COPY = "copy"
+OP_REMOVE = "remove"
+
+# 文件被占用、资源暂时不可用、网络存储超时或断开等，稍后重试可能成功
+TRANSIENT_ERRNOS = frozenset(
+    code for code in (
+        getattr(errno, name, None)
+        for name in (
+            "EBUSY", "EAGAIN", "EWOULDBLOCK", "EINTR", "ETIMEDOUT", "ETXTBSY", "EDEADLK", "ENOLCK",
+            "ESTALE", "ECONNRESET", "ECONNABORTED", "ENETDOWN", "ENETRESET", "ENETUNREACH", "EHOSTUNREACH",
+        )
+    )
+    if code is not None
+)
+# Windows 上文件被其他进程打开或锁定（ERROR_SHARING_VIOLATION、ERROR_LOCK_VIOLATION）
+TRANSIENT_WINERRORS = frozenset({32, 33})
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """
+    判断错误是否为暂时性错误
+
+    Args:
+        error: 异常
+
+    Returns:
+        稍后重试可能成功时返回 True
+    """
+    if isinstance(error, FileOperationError):
+        error = error.error
+    if not isinstance(error, OSError):
+        return False
+    if getattr(error, "winerror", None) in TRANSIENT_WINERRORS:
+        return True
+    return error.errno in TRANSIENT_ERRNOS
+
+
+class FileOperationError(Exception):
+    """
+    文件操作失败
+
+    Attributes:
+        operation: 失败的操作，OP_MKDIR、OP_COPY 或 OP_REMOVE
+        error: 原始异常
+        target_path: 删除源文件失败时为已复制完成的目标路径，否则为空
+    """
+
+    def __init__(self, operation: str, error: BaseException, target_path: str = ""):
+        super().__init__(str(error))
+        self.operation = operation
+        self.error = error
+        self.target_path = target_path
+
+    @property
+    def errno(self) -> Optional[int]:
+        return getattr(self.error, "errno", None)
+
+    @property
+    def is_transient(self) -> bool:
+        return is_transient_error(self.error)
 
 
 def get_folder_files(folder_path: str) -> list[tuple[str, str]]:
@@ -146,6 +216,65 @@ def get_folder_files_by_depth(
     return files
 
 
+def get_folders_files_by_depth(
+    folder_paths: list[str],
+    max_depth: int = 1,
+    max_workers: Optional[int] = None
+) -> list[list[tuple[str, str, int]]]:
+    """
+    并发扫描多个文件夹，不同磁盘上的文件夹可同时遍历
+
+    Args:
+        folder_paths: 文件夹绝对路径列表
+        max_depth: 最大遍历深度，1表示仅当前目录
+        max_workers: 最大并发数，默认为文件夹数量（最多 SCAN_MAX_WORKERS 个）
+
+    Returns:
+        与 folder_paths 顺序对应的文件列表，每个元素格式同 get_folder_files_by_depth
+
+    Raises:
+        ValueError: 任一文件夹路径不存在或不是目录
+    """
+    if len(folder_paths) <= 1:
+        return [get_folder_files_by_depth(folder_path, max_depth) for folder_path in folder_paths]
+
+    workers = max_workers or min(SCAN_MAX_WORKERS, len(folder_paths))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(lambda folder_path: get_folder_files_by_depth(folder_path, max_depth), folder_paths))
+
+
+def sample_folder_file_names(folder_path: str, limit: int = 500, max_depth: int = 100) -> list[str]:
+    """
+    按广度优先顺序采样文件夹中的文件名，达到数量上限后立即停止遍历
+
+    Args:
+        folder_path: 文件夹绝对路径
+        limit: 最多采样的文件数量
+        max_depth: 最大遍历深度，1表示仅当前目录
+
+    Returns:
+        文件名列表，无法访问的目录会被跳过
+    """
+    names = []
+    pending = [(folder_path, 1)]
+    while pending and len(names) < limit:
+        next_pending = []
+        for directory, depth in pending:
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_file():
+                            names.append(entry.name)
+                            if len(names) >= limit:
+                                return names
+                        elif entry.is_dir() and depth < max_depth:
+                            next_pending.append((entry.path, depth + 1))
+            except OSError:
+                continue
+        pending = next_pending
+    return names
+
+
 def get_extension(file_name: str) -> str:
     """
     获取文件扩展名（从后往前遇到的第一个点到文件名末尾）
@@ -161,6 +290,24 @@ def get_extension(file_name: str) -> str:
     return file_name.rsplit(".", 1)[-1].lower()
 
 
+def format_file_size(size: int) -> str:
+    """
+    格式化文件大小
+
+    Args:
+        size: 字节数
+
+    Returns:
+        带单位的大小字符串，如 "1.5 MB"
+    """
+    value = float(size)
+    for unit in ("B", "KB", "MB", "GB"):
+        if value < 1024:
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} TB"
+
+
 def create_dir_if_not_exists(dir_path: str) -> None:
     """
     如果目录不存在，则创建它。
@@ -172,6 +319,47 @@ def create_dir_if_not_exists(dir_path: str) -> None:
         os.makedirs(dir_path)
 
 
+def atomic_write_bytes(file_path, data: bytes, durable: bool = True) -> None:
+    """
+    原子写入文件：先写同目录下的临时文件，刷新到磁盘后再替换原文件，
+    写入过程中程序崩溃或断电时原文件保持完整。
+
+    Args:
+        file_path: 文件路径
+        data: 文件内容
+        durable: 替换前是否调用 fsync，可再生成的缓存文件可以关闭
+
+    Raises:
+        OSError: 写入或替换失败，临时文件会被删除
+    """
+    file_path = os.fspath(file_path)
+    directory = os.path.dirname(file_path) or "."
+    fd, temp_path = tempfile.mkstemp(prefix=f".{os.path.basename(file_path)}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(temp_path, file_path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def atomic_write_text(file_path, text: str, encoding: str = "utf-8", durable: bool = True) -> None:
+    """
+    原子写入文本文件，见 atomic_write_bytes
+
+    Raises:
+        OSError: 写入或替换失败
+    """
+    atomic_write_bytes(file_path, text.encode(encoding), durable=durable)
+
+
 def _generate_unique_filename(file_path: str) -> str:
     """
     生成唯一的文件名，如果文件已存在则在文件名后添加数字编号
@@ -208,21 +396,128 @@ def copy_file(target_dir: str, file: str, delete_source: bool = False) -> tuple[
     Returns:
         (是否成功, 错误信息)
     """
-    try:
-        file_name = os.path.basename(file)
-        target_path = os.path.join(target_dir, file_name)
+    file_name = os.path.basename(file)
+    return copy_file_to(file, os.path.join(target_dir, file_name), delete_source)
 
+
+def _copy_with_checkpoints(file: str, target_path: str, checkpoint: Callable[[], None]) -> None:
+    """
+    分块复制大文件，每个数据块之间调用检查点
+
+    Raises:
+        JobCancelled: 复制过程中任务被取消，已写入的部分目标文件会被删除
+    """
+    try:
+        with open(file, "rb") as src, open(target_path, "xb") as dst:
+            while True:
+                checkpoint()
+                chunk = src.read(COPY_CHUNK_SIZE)
+                if not chunk:
+                    break
+                dst.write(chunk)
+    except JobCancelled:
         if os.path.exists(target_path):
-            target_path = _generate_unique_filename(target_path)
+            os.remove(target_path)
+        raise
+    shutil.copystat(file, target_path)
+
+
+def copy_file_to(
+    file: str,
+    target_path: str,
+    delete_source: bool = False,
+    checkpoint: Optional[Callable[[], None]] = None
+) -> tuple[bool, str]:
+    """
+    复制文件到指定路径，目标已存在时自动改名，不会覆盖已有文件。
+
+    Args:
+        file: 源文件路径
+        target_path: 目标文件路径
+        delete_source: 是否删除源文件
+        checkpoint: 检查点函数，传入时大文件按块复制并在块之间调用
 
-        shutil.copy2(file, target_path)
-        if delete_source:
-            os.remove(file)
+    Returns:
+        (是否成功, 错误信息)
+
+    Raises:
+        JobCancelled: 复制过程中任务被取消
+    """
+    try:
+        transfer_file(file, target_path, delete_source, checkpoint)
         return True, ""
+    except JobCancelled:
+        raise
     except Exception as e:
         return False, str(e)
 
 
+def transfer_file(
+    file: str,
+    target_path: str,
+    delete_source: bool = False,
+    checkpoint: Optional[Callable[[], None]] = None
+) -> str:
+    """
+    复制文件到指定路径，目标已存在时自动改名，不会覆盖已有文件。
+
+    Args:
+        file: 源文件路径
+        target_path: 目标文件路径
+        delete_source: 是否删除源文件
+        checkpoint: 检查点函数，传入时大文件按块复制并在块之间调用
+
+    Returns:
+        实际写入的目标路径（改名后的路径）
+
+    Raises:
+        FileOperationError: 复制或删除失败；复制失败时已写入的部分目标文件会被删除，
+            删除源文件失败时目标文件已完整，target_path 为其路径
+        JobCancelled: 复制过程中任务被取消
+    """
+    if os.path.exists(target_path):
+        target_path = _generate_unique_filename(target_path)
+
+    try:
+        if checkpoint is not None and os.path.getsize(file) > COPY_CHUNK_SIZE:
+            _copy_with_checkpoints(file, target_path, checkpoint)
+        else:
+            shutil.copy2(file, target_path)
+    except OSError as e:
+        if not isinstance(e, FileExistsError):
+            _remove_partial_target(target_path)
+        raise FileOperationError(OP_COPY, e) from e
+
+    if delete_source:
+        remove_source_file(file, target_path)
+    return target_path
+
+
+def remove_source_file(file: str, target_path: str) -> None:
+    """
+    复制完成后删除源文件
+
+    Args:
+        file: 源文件路径
+        target_path: 已复制完成的目标路径
+
+    Raises:
+        FileOperationError: 删除失败，target_path 为已复制完成的目标路径
+    """
+    try:
+        os.remove(file)
+    except OSError as e:
+        raise FileOperationError(OP_REMOVE, e, target_path) from e
+
+
+def _remove_partial_target(target_path: str) -> None:
+    """删除复制失败时留下的部分目标文件，以便重试时使用原文件名"""
+    try:
+        os.remove(target_path)
+    except OSError:
+        pass
+
+
 def get_extension(file_name: str) -> str:
     """
     获取文件扩展名（从后往前遇到的第一个点到文件名末尾）
@@ -0,0 +1,488 @@
+"""文件夹监视：持续发现新到达且已写完的文件
+
+Linux 上通过 ctypes 调用 inotify，只在文件系统有变化时被唤醒；其他平台或 inotify
+不可用时退回到定时用 os.scandir 对比目录快照。两种方式发现的文件都要先经过稳定性
+检查（大小和修改时间在 stable_seconds 秒内不变）才会交给分类器，避免处理写了一半的文件。
+
+长时间运行时内存只与被监视的目录数、文件数和尚未稳定的文件数有关，不随运行时间增长。
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from typing import Callable, Iterable, Optional
+
+from .job_control import JobControl
+
+WATCH_BACKEND_INOTIFY = "inotify"
+WATCH_BACKEND_POLLING = "polling"
+
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+
+_WATCH_MASK = _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_ONLYDIR
+_EVENT_HEADER = struct.Struct("iIII")
+_READ_SIZE = 64 * 1024
+
+
+def _normalize(path: str) -> str:
+    return os.path.normcase(os.path.abspath(path))
+
+
+class _PathFilter:
+    """判断路径是否位于排除目录（例如位于源文件夹内的目标文件夹）之内"""
+
+    def __init__(self, excluded: Iterable[str]):
+        self._prefixes = tuple(_normalize(path) + os.sep for path in excluded if path)
+        self._excluded = tuple(prefix[:-1] for prefix in self._prefixes)
+
+    def is_excluded(self, path: str) -> bool:
+        if not self._prefixes:
+            return False
+        path = _normalize(path)
+        return path in self._excluded or path.startswith(self._prefixes)
+
+
+class StabilityTracker:
+    """
+    文件写入完成检测
+
+    记录每个候选文件最近一次的(大小, 修改时间)和开始保持不变的时间，
+    保持不变超过 stable_seconds 秒即视为写完；文件消失时直接丢弃。
+    """
+
+    def __init__(self, stable_seconds: float):
+        self.stable_seconds = stable_seconds
+        self._pending: dict[str, tuple[Optional[tuple[int, int]], float]] = {}
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def touch(self, path: str, now: float):
+        """文件出现或被写入，重新开始计时"""
+        self._pending[path] = (None, now)
+
+    def pop_stable(self, now: float) -> list[str]:
+        """
+        取出已经稳定的文件
+
+        Returns:
+            稳定文件路径列表，取出后不再跟踪
+        """
+        stable = []
+        for path, (signature, since) in list(self._pending.items()):
+            try:
+                stat_result = os.stat(path)
+            except OSError:
+                del self._pending[path]
+                continue
+
+            current = (stat_result.st_size, stat_result.st_mtime_ns)
+            if current != signature:
+                self._pending[path] = (current, now)
+            elif now - since >= self.stable_seconds:
+                del self._pending[path]
+                stable.append(path)
+        return stable
+
+
+class PollingBackend:
+    """定时扫描目录并与上一次的快照对比"""
+
+    name = WATCH_BACKEND_POLLING
+
+    def __init__(self, root: str, max_depth: int, path_filter: _PathFilter):
+        self._root = root
+        self._max_depth = max_depth
+        self._filter = path_filter
+        self._snapshot: dict[str, tuple[int, int]] = {}
+        self._closed = threading.Event()
+
+    def _scan(self) -> dict[str, tuple[int, int]]:
+        snapshot = {}
+        pending = [(self._root, 1)]
+        while pending:
+            directory, depth = pending.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if self._filter.is_excluded(entry.path):
+                            continue
+                        try:
+                            if entry.is_file():
+                                stat_result = entry.stat()
+                                snapshot[entry.path] = (stat_result.st_size, stat_result.st_mtime_ns)
+                            elif entry.is_dir() and depth < self._max_depth:
+                                pending.append((entry.path, depth + 1))
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+        return snapshot
+
+    def start(self):
+        """记录初始快照，已存在的文件不会被报告"""
+        self._snapshot = self._scan()
+
+    def read_changes(self, timeout: float) -> set[str]:
+        """
+        等待 timeout 秒后扫描一次
+
+        Returns:
+            新出现或大小、修改时间有变化的文件路径
+        """
+        if self._closed.wait(timeout):
+            return set()
+
+        snapshot = self._scan()
+        previous = self._snapshot
+        self._snapshot = snapshot
+        return {path for path, signature in snapshot.items() if previous.get(path) != signature}
+
+    def close(self):
+        self._closed.set()
+        self._snapshot = {}
+
+
+def _load_libc():
+    """
+    加载提供 inotify 的 C 库
+
+    Raises:
+        OSError: 当前平台不支持 inotify
+    """
+    if not sys.platform.startswith("linux"):
+        raise OSError(errno.ENOSYS, "inotify 仅在 Linux 上可用")
+
+    libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    if not hasattr(libc, "inotify_init1"):
+        raise OSError(errno.ENOSYS, "C 库不支持 inotify")
+
+    libc.inotify_init1.argtypes = [ctypes.c_int]
+    libc.inotify_init1.restype = ctypes.c_int
+    libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    libc.inotify_add_watch.restype = ctypes.c_int
+    libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+    libc.inotify_rm_watch.restype = ctypes.c_int
+    return libc
+
+
+class InotifyBackend:
+    """
+    基于 inotify 的监视
+
+    每个目录一个监视描述符，新建或移入的子目录自动加入监视；
+    事件队列溢出时重新扫描，补报上次读取之后修改过的文件。
+    """
+
+    name = WATCH_BACKEND_INOTIFY
+
+    def __init__(self, root: str, max_depth: int, path_filter: _PathFilter):
+        """
+        Raises:
+            OSError: inotify 不可用
+        """
+        self._root = root
+        self._max_depth = max_depth
+        self._filter = path_filter
+        self._libc = _load_libc()
+        self._fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+        self._watches: dict[int, tuple[str, int]] = {}
+        self._watched_paths: dict[str, int] = {}
+        self._last_read_time = time.time()
+
+    def _add_watch(self, path: str, depth: int) -> bool:
+        """
+        监视单个目录
+
+        Raises:
+            OSError: 监视数量达到系统上限
+        """
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), _WATCH_MASK)
+        if wd < 0:
+            error = ctypes.get_errno()
+            if error == errno.ENOSPC:
+                raise OSError(error, "inotify 监视数量达到上限 (fs.inotify.max_user_watches)")
+            return False
+        self._watches[wd] = (path, depth)
+        self._watched_paths[path] = wd
+        return True
+
+    def _add_tree(self, path: str, depth: int, changes: Optional[set] = None, since: float = 0.0):
+        """
+        监视目录及其子目录
+
+        Args:
+            path: 目录路径
+            depth: 目录中文件的层级深度
+            changes: 不为 None 时把目录中修改时间不早于 since 的文件加入其中
+            since: 时间戳
+        """
+        pending = [(path, depth)]
+        while pending:
+            directory, current_depth = pending.pop()
+            if self._filter.is_excluded(directory) or not self._add_watch(directory, current_depth):
+                continue
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if current_depth < self._max_depth:
+                                    pending.append((entry.path, current_depth + 1))
+                            elif changes is not None and entry.is_file():
+                                if entry.stat().st_mtime >= since:
+                                    changes.add(entry.path)
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+
+    def _remove_tree(self, path: str):
+        """取消目录及其子目录的监视（目录被移走时，旧的路径不再有效）"""
+        prefix = path + os.sep
+        for watched_path in [p for p in self._watched_paths if p == path or p.startswith(prefix)]:
+            wd = self._watched_paths.pop(watched_path)
+            self._watches.pop(wd, None)
+            self._libc.inotify_rm_watch(self._fd, wd)
+
+    def start(self):
+        """
+        开始监视
+
+        Raises:
+            OSError: 监视数量达到系统上限
+        """
+        self._add_tree(self._root, 1)
+        if not self._watches:
+            raise OSError(errno.ENOENT, f"无法监视目录: {self._root}")
+
+    def _read_events(self) -> bytes:
+        chunks = []
+        while True:
+            try:
+                data = os.read(self._fd, _READ_SIZE)
+            except BlockingIOError:
+                break
+            if not data:
+                break
+            chunks.append(data)
+        return b"".join(chunks)
+
+    def read_changes(self, timeout: float) -> set[str]:
+        """
+        等待最多 timeout 秒，读取期间发生的事件
+
+        Returns:
+            新建、写入完成或移入的文件路径
+        """
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+
+        since = self._last_read_time - 1
+        self._last_read_time = time.time()
+        data = self._read_events()
+        changes = set()
+        overflow = False
+
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _, name_length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + name_length].rstrip(b"\0"))
+            offset += name_length
+
+            if mask & _IN_Q_OVERFLOW:
+                overflow = True
+                continue
+            if mask & _IN_IGNORED:
+                watched = self._watches.pop(wd, None)
+                if watched is not None and self._watched_paths.get(watched[0]) == wd:
+                    del self._watched_paths[watched[0]]
+                continue
+
+            watched = self._watches.get(wd)
+            if watched is None or not name:
+                continue
+            directory, depth = watched
+            path = os.path.join(directory, name)
+
+            if mask & _IN_ISDIR:
+                if mask & _IN_MOVED_FROM:
+                    self._remove_tree(path)
+                elif mask & (_IN_CREATE | _IN_MOVED_TO) and depth < self._max_depth:
+                    self._add_tree_safely(path, depth + 1, changes)
+            elif mask & (_IN_CREATE | _IN_CLOSE_WRITE | _IN_MOVED_TO):
+                if not self._filter.is_excluded(path):
+                    changes.add(path)
+
+        if overflow:
+            self._add_tree_safely(self._root, 1, changes, since)
+        return changes
+
+    def _add_tree_safely(self, path: str, depth: int, changes: set, since: float = 0.0):
+        """运行中加入新目录；监视数量超出上限时跳过，已监视的目录不受影响"""
+        try:
+            self._add_tree(path, depth, changes, since)
+        except OSError:
+            pass
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+        self._watches.clear()
+        self._watched_paths.clear()
+
+
+class FolderWatcher:
+    """
+    文件夹监视器
+
+    start 之后已存在的文件不会被报告，只报告新到达（或被重新写入）且已经稳定的文件。
+    """
+
+    DEFAULT_STABLE_SECONDS = 2.0
+    DEFAULT_POLL_INTERVAL = 1.0
+
+    def __init__(
+        self,
+        folder: str,
+        max_depth: int = 1,
+        stable_seconds: float = DEFAULT_STABLE_SECONDS,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        exclude: Iterable[str] = (),
+        backend: Optional[str] = None
+    ):
+        """
+        初始化监视器
+
+        Args:
+            folder: 被监视的文件夹
+            max_depth: 最大监视深度，1表示仅当前目录
+            stable_seconds: 大小和修改时间保持不变多少秒后视为写完
+            poll_interval: 轮询间隔（秒），inotify 方式下为检查稳定性的间隔
+            exclude: 不监视的目录，例如位于源文件夹内的目标文件夹
+            backend: 指定 "inotify" 或 "polling"，默认优先使用 inotify
+
+        Raises:
+            ValueError: 文件夹不存在或参数无效
+        """
+        if not os.path.isdir(folder):
+            raise ValueError(f"不是有效目录: {folder}")
+        if max_depth < 1:
+            raise ValueError(f"max_depth必须大于等于1，当前值: {max_depth}")
+        if stable_seconds < 0 or poll_interval <= 0:
+            raise ValueError("稳定时间不能为负数，轮询间隔必须大于0")
+        if backend not in (None, WATCH_BACKEND_INOTIFY, WATCH_BACKEND_POLLING):
+            raise ValueError(f"未知的监视方式: {backend}")
+
+        self.folder = os.path.abspath(folder)
+        self.max_depth = max_depth
+        self.poll_interval = poll_interval
+        self._requested_backend = backend
+        self._filter = _PathFilter(exclude)
+        self._tracker = StabilityTracker(stable_seconds)
+        self._backend = None
+        self._root_depth = self.folder.rstrip(os.sep).count(os.sep)
+
+    @property
+    def backend_name(self) -> str:
+        """实际使用的监视方式，start 之前为空"""
+        return self._backend.name if self._backend is not None else ""
+
+    @property
+    def stable_seconds(self) -> float:
+        return self._tracker.stable_seconds
+
+    @property
+    def pending_count(self) -> int:
+        """等待写入完成的文件数"""
+        return len(self._tracker)
+
+    def start(self):
+        """开始监视；inotify 不可用或监视数量超出系统上限时自动改用轮询"""
+        if self._requested_backend != WATCH_BACKEND_POLLING:
+            try:
+                backend = InotifyBackend(self.folder, self.max_depth, self._filter)
+                try:
+                    backend.start()
+                except OSError:
+                    backend.close()
+                    raise
+                self._backend = backend
+                return
+            except OSError:
+                if self._requested_backend == WATCH_BACKEND_INOTIFY:
+                    raise
+
+        self._backend = PollingBackend(self.folder, self.max_depth, self._filter)
+        self._backend.start()
+
+    def poll(self) -> list[tuple[str, str, int]]:
+        """
+        等待一个轮询间隔，返回期间已经稳定的新文件
+
+        Returns:
+            (绝对路径, 文件名, 层级深度) 列表，格式与 get_folder_files_by_depth 相同
+        """
+        if self._backend is None:
+            self.start()
+
+        changes = self._backend.read_changes(self.poll_interval)
+        now = time.monotonic()
+        for path in changes:
+            self._tracker.touch(path, now)
+
+        files = []
+        for path in self._tracker.pop_stable(now):
+            depth = os.path.dirname(path).rstrip(os.sep).count(os.sep) - self._root_depth + 1
+            files.append((path, os.path.basename(path), depth))
+        return files
+
+    def run(self, on_files: Callable[[list], None], control: Optional[JobControl] = None):
+        """
+        持续监视，直到任务被取消
+
+        Args:
+            on_files: 发现稳定的新文件时调用，参数为文件列表
+            control: 任务控制句柄，每个轮询间隔检查一次暂停和取消
+
+        Raises:
+            JobCancelled: 任务被取消
+        """
+        if self._backend is None:
+            self.start()
+        try:
+            while True:
+                if control is not None:
+                    control.checkpoint()
+                files = self.poll()
+                if files:
+                    on_files(files)
+        finally:
+            self.close()
+
+    def close(self):
+        """停止监视并释放资源"""
+        if self._backend is not None:
+            self._backend.close()
+            self._backend = None
@@ -0,0 +1,55 @@
+"""任务控制：协作式暂停、继续与取消"""
+
+import threading
+
+
+class JobCancelled(Exception):
+    """任务已被取消"""
+
+
+class JobControl:
+    """
+    任务控制句柄
+
+    控制方（界面线程）调用 pause/resume/cancel，执行方（工作线程）在文件之间
+    和大文件的数据块之间调用 checkpoint：暂停时在此阻塞，取消时抛出 JobCancelled。
+    """
+
+    def __init__(self):
+        self._running = threading.Event()
+        self._running.set()
+        self._cancelled = threading.Event()
+
+    @property
+    def is_paused(self) -> bool:
+        return not self._running.is_set()
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def pause(self):
+        """暂停任务，执行方在下一个检查点阻塞"""
+        if not self.is_cancelled:
+            self._running.clear()
+
+    def resume(self):
+        """继续已暂停的任务"""
+        self._running.set()
+
+    def cancel(self):
+        """取消任务，暂停中的任务也会立即唤醒"""
+        self._cancelled.set()
+        self._running.set()
+
+    def checkpoint(self):
+        """
+        检查点：暂停时阻塞直到继续或取消
+
+        Raises:
+            JobCancelled: 任务已被取消
+        """
+        if not self._running.is_set():
+            self._running.wait()
+        if self._cancelled.is_set():
+            raise JobCancelled()
@@ -0,0 +1,345 @@
+"""媒体文件拍摄日期解析工具
+
+只读取解析所需的文件头字节：JPEG 的 APP1 段、TIFF 的 IFD、HEIF 的 meta/iloc
+以及 MP4/MOV 的 moov/mvhd，不加载整个文件。
+"""
+
+import os
+import struct
+from datetime import datetime, timedelta, timezone
+from typing import BinaryIO, Optional
+
+JPEG_EXTENSIONS = frozenset({"jpg", "jpeg", "jpe", "jfif"})
+TIFF_EXTENSIONS = frozenset({"tif", "tiff", "dng", "nef", "cr2", "arw", "orf", "rw2", "pef", "srw"})
+HEIF_EXTENSIONS = frozenset({"heic", "heif", "hif", "avif"})
+MP4_EXTENSIONS = frozenset({"mp4", "m4v", "mov", "3gp", "3g2", "qt"})
+
+MEDIA_EXTENSIONS = JPEG_EXTENSIONS | TIFF_EXTENSIONS | HEIF_EXTENSIONS | MP4_EXTENSIONS
+
+_TIFF_HEADER_READ_SIZE = 128 * 1024
+_JPEG_MAX_SCAN_BYTES = 256 * 1024
+_BOX_HEADER_SIZE = 8
+
+_TAG_DATETIME = 0x0132
+_TAG_EXIF_IFD = 0x8769
+_TAG_DATETIME_ORIGINAL = 0x9003
+_TAG_DATETIME_DIGITIZED = 0x9004
+
+_MP4_EPOCH = datetime(1904, 1, 1, tzinfo=timezone.utc)
+
+
+def _parse_exif_datetime(raw: bytes) -> Optional[datetime]:
+    """解析 EXIF 日期字符串（YYYY:MM:DD HH:MM:SS）"""
+    text = raw.split(b"\x00", 1)[0].decode("ascii", errors="ignore").strip()
+    if len(text) < 10:
+        return None
+    try:
+        return datetime.strptime(text[:19], "%Y:%m:%d %H:%M:%S")
+    except ValueError:
+        pass
+    try:
+        return datetime.strptime(text[:10], "%Y:%m:%d")
+    except ValueError:
+        return None
+
+
+def _read_ifd_entries(data: bytes, offset: int, endian: str) -> dict:
+    """读取 IFD 中的条目，返回 {标签: (类型, 数量, 值或偏移字段)}"""
+    entries = {}
+    if offset + 2 > len(data):
+        return entries
+
+    count = struct.unpack_from(endian + "H", data, offset)[0]
+    position = offset + 2
+    for _ in range(count):
+        if position + 12 > len(data):
+            break
+        tag, value_type, value_count = struct.unpack_from(endian + "HHI", data, position)
+        entries[tag] = (value_type, value_count, data[position + 8:position + 12])
+        position += 12
+    return entries
+
+
+def _read_ascii_value(data: bytes, entry: tuple, endian: str) -> bytes:
+    """读取 ASCII 类型条目的值"""
+    _, value_count, value_field = entry
+    if value_count <= 4:
+        return value_field[:value_count]
+    offset = struct.unpack(endian + "I", value_field)[0]
+    return data[offset:offset + value_count]
+
+
+def parse_tiff_datetime(data: bytes) -> Optional[datetime]:
+    """
+    从 TIFF 结构（EXIF 负载）中解析拍摄日期
+
+    Args:
+        data: 以 TIFF 头开始的字节
+
+    Returns:
+        拍摄日期，解析失败返回None
+    """
+    if len(data) < 8:
+        return None
+
+    byte_order = data[:2]
+    if byte_order == b"II":
+        endian = "<"
+    elif byte_order == b"MM":
+        endian = ">"
+    else:
+        return None
+
+    if struct.unpack_from(endian + "H", data, 2)[0] != 42:
+        return None
+
+    ifd0_offset = struct.unpack_from(endian + "I", data, 4)[0]
+    ifd0 = _read_ifd_entries(data, ifd0_offset, endian)
+
+    exif_pointer = ifd0.get(_TAG_EXIF_IFD)
+    if exif_pointer:
+        exif_offset = struct.unpack(endian + "I", exif_pointer[2])[0]
+        exif_ifd = _read_ifd_entries(data, exif_offset, endian)
+        for tag in (_TAG_DATETIME_ORIGINAL, _TAG_DATETIME_DIGITIZED):
+            if tag in exif_ifd:
+                parsed = _parse_exif_datetime(_read_ascii_value(data, exif_ifd[tag], endian))
+                if parsed:
+                    return parsed
+
+    if _TAG_DATETIME in ifd0:
+        return _parse_exif_datetime(_read_ascii_value(data, ifd0[_TAG_DATETIME], endian))
+    return None
+
+
+def _read_jpeg_datetime(f: BinaryIO) -> Optional[datetime]:
+    """遍历 JPEG 段，仅读取 APP1(Exif) 段"""
+    if f.read(2) != b"\xff\xd8":
+        return None
+
+    while f.tell() < _JPEG_MAX_SCAN_BYTES:
+        marker = f.read(2)
+        if len(marker) < 2 or marker[0] != 0xFF:
+            return None
+        if marker[1] in (0xD9, 0xDA):
+            return None
+
+        length_bytes = f.read(2)
+        if len(length_bytes) < 2:
+            return None
+        # 段长度包含长度字段本身的 2 字节，小于 2 的文件已损坏
+        segment_length = struct.unpack(">H", length_bytes)[0] - 2
+        if segment_length < 0:
+            return None
+
+        if marker[1] == 0xE1:
+            segment = f.read(segment_length)
+            if segment.startswith(b"Exif\x00\x00"):
+                return parse_tiff_datetime(segment[6:])
+        else:
+            f.seek(segment_length, os.SEEK_CUR)
+    return None
+
+
+def _iter_boxes(f: BinaryIO, start: int, end: int):
+    """迭代 ISO BMFF 盒子，产出(类型, 负载起始位置, 盒子结束位置)"""
+    position = start
+    while position + _BOX_HEADER_SIZE <= end:
+        f.seek(position)
+        header = f.read(_BOX_HEADER_SIZE)
+        if len(header) < _BOX_HEADER_SIZE:
+            return
+        box_size, box_type = struct.unpack(">I4s", header)
+        payload_start = position + _BOX_HEADER_SIZE
+
+        if box_size == 1:
+            large_size = f.read(8)
+            if len(large_size) < 8:
+                return
+            box_size = struct.unpack(">Q", large_size)[0]
+            payload_start += 8
+        elif box_size == 0:
+            box_size = end - position
+
+        if box_size < payload_start - position:
+            return
+
+        box_end = min(position + box_size, end)
+        yield box_type, payload_start, box_end
+        position = position + box_size
+
+
+def _find_box(f: BinaryIO, start: int, end: int, box_type: bytes) -> Optional[tuple[int, int]]:
+    """查找指定类型的盒子，返回(负载起始位置, 结束位置)"""
+    for current_type, payload_start, box_end in _iter_boxes(f, start, end):
+        if current_type == box_type:
+            return payload_start, box_end
+    return None
+
+
+def _read_mp4_datetime(f: BinaryIO, file_size: int) -> Optional[datetime]:
+    """读取 moov/mvhd 中的创建时间"""
+    moov = _find_box(f, 0, file_size, b"moov")
+    if not moov:
+        return None
+
+    mvhd = _find_box(f, moov[0], moov[1], b"mvhd")
+    if not mvhd:
+        return None
+
+    f.seek(mvhd[0])
+    header = f.read(12)
+    if len(header) < 12:
+        return None
+
+    version = header[0]
+    if version == 1:
+        creation_time = struct.unpack(">Q", header[4:12])[0]
+    else:
+        creation_time = struct.unpack(">I", header[4:8])[0]
+
+    if creation_time == 0:
+        return None
+    try:
+        return (_MP4_EPOCH + timedelta(seconds=creation_time)).astimezone().replace(tzinfo=None)
+    except (OverflowError, ValueError, OSError):
+        return None
+
+
+def _read_uint(data: bytes, offset: int, size: int) -> int:
+    """按字节数读取大端无符号整数"""
+    if size == 0:
+        return 0
+    return int.from_bytes(data[offset:offset + size], "big")
+
+
+def _find_heif_exif_item(iinf: bytes) -> Optional[int]:
+    """在 iinf 负载中查找 Exif 项的 ID"""
+    version = iinf[0]
+    position = 4
+    if version == 0:
+        entry_count = _read_uint(iinf, position, 2)
+        position += 2
+    else:
+        entry_count = _read_uint(iinf, position, 4)
+        position += 4
+
+    for _ in range(entry_count):
+        if position + _BOX_HEADER_SIZE > len(iinf):
+            return None
+        box_size, box_type = struct.unpack_from(">I4s", iinf, position)
+        if box_size < _BOX_HEADER_SIZE:
+            return None
+        if box_type == b"infe":
+            infe_version = iinf[position + 8]
+            field = position + 12
+            if infe_version >= 2:
+                id_size = 2 if infe_version == 2 else 4
+                item_id = _read_uint(iinf, field, id_size)
+                item_type = iinf[field + id_size + 2:field + id_size + 6]
+                if item_type == b"Exif":
+                    return item_id
+        position += box_size
+    return None
+
+
+def _find_heif_item_location(iloc: bytes, target_item_id: int) -> Optional[tuple[int, int]]:
+    """在 iloc 负载中查找指定项的(偏移, 长度)"""
+    version = iloc[0]
+    offset_size = iloc[4] >> 4
+    length_size = iloc[4] & 0x0F
+    base_offset_size = iloc[5] >> 4
+    index_size = iloc[5] & 0x0F if version in (1, 2) else 0
+
+    position = 6
+    id_size = 4 if version == 2 else 2
+    item_count = _read_uint(iloc, position, id_size)
+    position += id_size
+
+    for _ in range(item_count):
+        item_id = _read_uint(iloc, position, id_size)
+        position += id_size
+        if version in (1, 2):
+            position += 2
+        position += 2
+        base_offset = _read_uint(iloc, position, base_offset_size)
+        position += base_offset_size
+        extent_count = _read_uint(iloc, position, 2)
+        position += 2
+
+        first_extent = None
+        for _ in range(extent_count):
+            position += index_size
+            extent_offset = _read_uint(iloc, position, offset_size)
+            position += offset_size
+            extent_length = _read_uint(iloc, position, length_size)
+            position += length_size
+            if first_extent is None:
+                first_extent = (base_offset + extent_offset, extent_length)
+
+        if item_id == target_item_id:
+            return first_extent
+        if position > len(iloc):
+            return None
+    return None
+
+
+def _read_heif_datetime(f: BinaryIO, file_size: int) -> Optional[datetime]:
+    """通过 meta/iinf/iloc 定位 Exif 项并解析"""
+    meta = _find_box(f, 0, file_size, b"meta")
+    if not meta:
+        return None
+
+    # meta 是 FullBox，子盒子从版本/标志字段之后开始
+    children_start = meta[0] + 4
+    iinf = _find_box(f, children_start, meta[1], b"iinf")
+    iloc = _find_box(f, children_start, meta[1], b"iloc")
+    if not iinf or not iloc:
+        return None
+
+    f.seek(iinf[0])
+    exif_item_id = _find_heif_exif_item(f.read(iinf[1] - iinf[0]))
+    if exif_item_id is None:
+        return None
+
+    f.seek(iloc[0])
+    location = _find_heif_item_location(f.read(iloc[1] - iloc[0]), exif_item_id)
+    if not location:
+        return None
+
+    item_offset, item_length = location
+    f.seek(item_offset)
+    item_data = f.read(min(item_length or _TIFF_HEADER_READ_SIZE, _TIFF_HEADER_READ_SIZE))
+    if len(item_data) < 4:
+        return None
+
+    tiff_start = 4 + struct.unpack(">I", item_data[:4])[0]
+    return parse_tiff_datetime(item_data[tiff_start:])
+
+
+def read_capture_date(file_path: str, extension: str) -> Optional[datetime]:
+    """
+    读取媒体文件的拍摄日期
+
+    Args:
+        file_path: 文件路径
+        extension: 小写扩展名（不含点），用于选择解析器
+
+    Returns:
+        拍摄日期，不支持的格式或解析失败返回None
+    """
+    if extension not in MEDIA_EXTENSIONS:
+        return None
+
+    try:
+        with open(file_path, "rb") as f:
+            if extension in JPEG_EXTENSIONS:
+                return _read_jpeg_datetime(f)
+            if extension in TIFF_EXTENSIONS:
+                return parse_tiff_datetime(f.read(_TIFF_HEADER_READ_SIZE))
+
+            file_size = os.fstat(f.fileno()).st_size
+            if extension in HEIF_EXTENSIONS:
+                return _read_heif_datetime(f, file_size)
+            return _read_mp4_datetime(f, file_size)
+    except (OSError, struct.error, ValueError, IndexError):
+        return None
@@ -32,11 +32,21 @@ def get_config_path() -> Path:
     return get_base_path() / "config"
 
 
+def get_journals_path() -> Path:
+    """获取运行日志（撤销记录）目录"""
+    return get_config_path() / "journals"
+
+
 def get_styles_path() -> Path:
     """获取样式文件目录"""
     return get_base_path() / "styles"
 
 
+def get_plugins_path() -> Path:
+    """获取分类器插件目录"""
+    return get_base_path() / "plugins"
+
+
 def get_resource_path(relative_path: str) -> Path:
     """
     获取资源文件的绝对路径
@@ -48,3 +58,20 @@ def get_resource_path(relative_path: str) -> Path:
         资源文件的绝对路径
     """
     return get_base_path() / relative_path
+
+
+SOURCE_FOLDER_SEPARATOR = ";"
+
+
+def split_source_folders(text: str) -> list[str]:
+    """
+    拆分以分号分隔的多个源文件夹
+
+    Args:
+        text: 源文件夹文本，如 "D:\\Downloads; E:\\USB"
+
+    Returns:
+        去除首尾空白和重复项后的文件夹列表
+    """
+    folders = (folder.strip() for folder in text.split(SOURCE_FOLDER_SEPARATOR))
+    return list(dict.fromkeys(folder for folder in folders if folder))
@@ -0,0 +1,101 @@
+"""延迟重试队列：暂时性错误的文件在主流程结束后按指数退避重试
+
+文件被其他进程短暂占用、网络存储超时等暂时性错误不立即记为失败，而是放入队列，
+主流程继续处理其余文件；全部处理完后再按各自的等待时间依次重试，仍失败时
+等待时间加倍，达到最大尝试次数后才记为失败。
+"""
+
+import heapq
+import itertools
+import time
+from typing import Any, Iterator, Optional
+
+from .file_utils import is_transient_error
+from .job_control import JobControl
+
+RETRY_MAX_ATTEMPTS = 4
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 8.0
+RETRY_WAIT_STEP = 0.1
+
+
+class RetryQueue:
+    """按就绪时间排序的延迟重试队列"""
+
+    def __init__(
+        self,
+        max_attempts: int = RETRY_MAX_ATTEMPTS,
+        base_delay: float = RETRY_BASE_DELAY,
+        max_delay: float = RETRY_MAX_DELAY
+    ):
+        """
+        初始化队列
+
+        Args:
+            max_attempts: 每个文件的最大尝试次数（包括第一次）
+            base_delay: 第一次重试前的等待秒数，之后每次加倍
+            max_delay: 单次等待的最大秒数
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._heap: list[tuple[float, int, int, Any]] = []
+        self._sequence = itertools.count()
+        self.deferred_count = 0
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def get_delay(self, attempts: int) -> float:
+        """第 attempts 次尝试失败后的等待秒数"""
+        return min(self.base_delay * (2 ** (attempts - 1)), self.max_delay)
+
+    def defer(self, item: Any, error: BaseException, attempts: int) -> bool:
+        """
+        尝试将失败的项目放入队列
+
+        Args:
+            item: 重试时需要的数据，由调用方定义
+            error: 本次失败的异常
+            attempts: 已尝试的次数
+
+        Returns:
+            已放入队列时返回 True；不是暂时性错误或已达到最大尝试次数时返回 False，调用方应记为失败
+        """
+        if attempts >= self.max_attempts or not is_transient_error(error):
+            return False
+        if attempts == 1:
+            self.deferred_count += 1
+        ready_at = time.monotonic() + self.get_delay(attempts)
+        heapq.heappush(self._heap, (ready_at, next(self._sequence), attempts, item))
+        return True
+
+    def pending(self) -> list[tuple[Any, int]]:
+        """队列中尚未重试的(项目, 已尝试次数)"""
+        return [(item, attempts) for _, _, attempts, item in sorted(self._heap)]
+
+    def drain(self, control: Optional[JobControl] = None) -> Iterator[tuple[Any, int]]:
+        """
+        依次取出到期的项目，未到期时等待；重试仍失败的项目可在迭代中再次 defer
+
+        Args:
+            control: 任务控制句柄，等待期间检查暂停和取消
+
+        Yields:
+            (项目, 已尝试次数)
+
+        Raises:
+            JobCancelled: 等待期间任务被取消，当前项目仍在队列中
+        """
+        while self._heap:
+            ready_at = self._heap[0][0]
+            while True:
+                if control is not None:
+                    control.checkpoint()
+                remaining = ready_at - time.monotonic()
+                if remaining <= 0:
+                    break
+                time.sleep(min(remaining, RETRY_WAIT_STEP))
+
+            _, _, attempts, item = heapq.heappop(self._heap)
+            yield item, attempts
@@ -1,3 +1,4 @@
 from .file_classifier_viewmodel import FileClassifierViewModel
+from .job_queue import ClassificationJob, JobQueue
 
-__all__ = ["FileClassifierViewModel"]
+__all__ = ["FileClassifierViewModel", "ClassificationJob", "JobQueue"]
@@ -0,0 +1,275 @@
+"""分类工作线程"""
+
+import os
+from typing import Optional
+
+from PySide6.QtCore import QObject, Signal, QThread
+
+from models.classification_plan import ClassificationPlan
+from models.plan_file import PlanFileExecutor, write_plan_file
+from models.job_spec import JobSpec
+from models.progress import PHASE_COPY, PHASE_PLAN, PHASE_SCAN, PHASE_UNDO, ProgressReporter, ProgressSnapshot
+from models.run_journal import JournalUndoer, RunJournal
+from models.source_scan import SourceScan, scan_sources
+from utils.job_control import JobCancelled, JobControl
+
+
+class ClassificationWorker(QThread):
+    """分类工作线程"""
+
+    progress_updated = Signal(int, str)
+    metrics_updated = Signal(object)
+    # 不使用 finished 作为名称，以免覆盖 QThread.finished（线程真正结束的信号）
+    result_ready = Signal(dict)
+    plan_ready = Signal(object)
+    error_occurred = Signal(str)
+
+    def __init__(
+        self,
+        spec: Optional[JobSpec] = None,
+        plan_only: bool = False,
+        plan: Optional[ClassificationPlan] = None,
+        plan_file: str = "",
+        undo_journal: str = "",
+        job_plan_file: str = "",
+        parent: Optional[QObject] = None
+    ):
+        """
+        初始化工作线程
+
+        Args:
+            spec: 任务规格，扫描并分类时必需
+            plan_only: 只生成方案，不执行
+            plan: 直接执行已生成的方案
+            plan_file: 直接执行方案文件
+            undo_journal: 按运行日志撤销一次运行
+            job_plan_file: 队列任务的方案文件：生成的方案先写入该文件再按文件执行，进度保存在检查点中；
+                文件已存在时说明任务上次被中断，不再扫描，直接从检查点继续，已复制的文件不会重复复制
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self._spec = spec
+        self._plan_only = plan_only
+        self._plan = plan
+        self._plan_file = plan_file
+        self._undo_journal = undo_journal
+        self._job_plan_file = job_plan_file
+        self._control = JobControl()
+        self._reporter = ProgressReporter(0, self._publish_progress)
+
+    @property
+    def is_paused(self) -> bool:
+        return self._control.is_paused
+
+    def pause(self):
+        """暂停任务，在下一个文件或数据块之前生效"""
+        self._control.pause()
+
+    def resume(self):
+        """继续已暂停的任务"""
+        self._control.resume()
+
+    def cancel(self):
+        """取消任务，已完成的文件保留，返回部分结果"""
+        self._control.cancel()
+
+    def run(self):
+        """执行分类任务"""
+        try:
+            if self._undo_journal:
+                self._undo(self._undo_journal)
+                return
+
+            if self._plan is not None:
+                self._execute_plan(self._plan)
+                return
+
+            if self._plan_file:
+                self._execute_plan_file(self._plan_file)
+                return
+
+            if self._job_plan_file and os.path.exists(self._job_plan_file):
+                self.progress_updated.emit(15, "正在继续上次中断的任务...")
+                self._execute_plan_file(self._job_plan_file)
+                return
+
+            self.progress_updated.emit(10, "正在扫描文件...")
+            self._reporter.start_phase(PHASE_SCAN, 0)
+
+            spec = self._spec
+            scan = scan_sources(spec.source_folders, max_depth=spec.max_depth)
+            files = scan.files
+            total_files = len(files)
+
+            if total_files == 0:
+                self.result_ready.emit({
+                    "success_count": 0,
+                    "failed_count": 0,
+                    "failed_files": [],
+                    "success_files": [],
+                    "total_files": 0
+                })
+                return
+
+            self.progress_updated.emit(15, f"找到 {total_files} 个文件，正在生成分类方案...")
+            self._reporter.start_phase(PHASE_PLAN, total_files)
+
+            classifier = spec.create_classifier()
+            try:
+                plan = classifier.plan(files, control=self._control)
+            except JobCancelled:
+                self._emit_cancelled(scan.add_breakdown({
+                    "success_count": 0,
+                    "failed_count": 0,
+                    "failed_files": [],
+                    "success_files": [],
+                    "cancelled": True,
+                    "unprocessed_files": [
+                        {"file_path": file_path, "file_name": file_name}
+                        for file_path, file_name, _ in files
+                    ],
+                    "total_files": total_files
+                }))
+                return
+
+            if self._plan_only:
+                self.progress_updated.emit(100, "预览完成")
+                self.plan_ready.emit(plan)
+                return
+
+            if self._job_plan_file:
+                temp_path = self._job_plan_file + ".tmp"
+                os.makedirs(os.path.dirname(self._job_plan_file) or ".", exist_ok=True)
+                write_plan_file(plan, temp_path)
+                os.replace(temp_path, self._job_plan_file)
+                self._execute_plan_file(self._job_plan_file, scan)
+                return
+
+            self._execute_plan(plan, scan)
+
+        except Exception as e:
+            self.error_occurred.emit(f"分类失败: {str(e)}")
+
+    def _execute_plan(self, plan: ClassificationPlan, scan: Optional[SourceScan] = None):
+        """执行分类方案，scan 不为空时按来源统计结果"""
+        self.progress_updated.emit(20, f"共 {plan.total_files} 个文件，开始分类...")
+        self._reporter.start_phase(
+            PHASE_COPY,
+            plan.total_files,
+            bytes_total=sum(operation.size for operation in plan.operations),
+            failed_count=len(plan.failed_files)
+        )
+
+        spec = self._spec
+        with RunJournal.create(
+            plan.target_dir,
+            plan.delete_source,
+            spec.source_folders if spec else (),
+            spec.profile if spec else ""
+        ) as journal:
+            result = plan.execute(
+                progress_callback=self._reporter.update,
+                control=self._control,
+                file_done_callback=self._reporter.file_done,
+                journal=journal
+            )
+        journal.add_to_result(result)
+        result["total_files"] = plan.total_files
+        if scan is not None:
+            scan.add_breakdown(result)
+        self._reporter.finish()
+
+        if result.get("cancelled"):
+            self._emit_cancelled(result)
+            return
+
+        self.progress_updated.emit(100, "分类完成")
+        self.result_ready.emit(result)
+
+    def _execute_plan_file(self, plan_file: str, scan: Optional[SourceScan] = None):
+        """执行方案文件，从检查点继续；scan 不为空时按来源统计结果"""
+        executor = PlanFileExecutor(plan_file)
+        self.progress_updated.emit(20, f"共 {executor.total_files} 个文件，开始执行方案...")
+        self._reporter.start_phase(PHASE_COPY, executor.total_files, bytes_total=executor.total_bytes)
+
+        spec = self._spec
+        with RunJournal.create(
+            executor.header.get("target_dir", ""),
+            False,
+            spec.source_folders if spec else (),
+            spec.profile if spec else ""
+        ) as journal:
+            result = executor.execute(
+                progress_callback=self._reporter.update,
+                control=self._control,
+                file_done_callback=self._reporter.file_done,
+                journal=journal
+            )
+        journal.add_to_result(result)
+        if scan is not None:
+            scan.add_breakdown(result)
+        self._reporter.finish()
+
+        if result.get("cancelled"):
+            self._emit_cancelled(result)
+            return
+
+        self.progress_updated.emit(100, "方案执行完成")
+        self.result_ready.emit(result)
+
+    def _undo(self, journal_path: str):
+        """按运行日志撤销，中断后再次撤销同一日志会继续"""
+        undoer = JournalUndoer(journal_path)
+        self.progress_updated.emit(20, f"共 {undoer.total_files} 个文件，开始撤销...")
+        self._reporter.start_phase(PHASE_UNDO, undoer.total_files)
+
+        result = undoer.execute(
+            progress_callback=self._reporter.update,
+            control=self._control,
+            file_done_callback=self._reporter.file_done
+        )
+        result["undone_journal"] = journal_path
+        self._reporter.finish()
+
+        if result.get("cancelled"):
+            self._emit_cancelled(result)
+            return
+
+        self.progress_updated.emit(100, "撤销完成")
+        self.result_ready.emit(result)
+
+    def _emit_cancelled(self, result: dict):
+        """发出已取消任务的部分结果"""
+        unprocessed_count = len(result.get("unprocessed_files", []))
+        self.progress_updated.emit(100, f"已取消，{unprocessed_count} 个文件未处理")
+        self.result_ready.emit(result)
+
+    def _publish_progress(self, snapshot: ProgressSnapshot):
+        """发出进度快照；逐文件进度已在线程内汇总，按固定间隔调用"""
+        self.metrics_updated.emit(snapshot)
+        if snapshot.phase not in (PHASE_COPY, PHASE_UNDO):
+            return
+
+        percent = int(20 + snapshot.ratio * 80)
+        display_name = self._truncate_filename(snapshot.current_file, max_length=40)
+        self.progress_updated.emit(
+            percent,
+            f"正在处理: {display_name}（{snapshot.processed}/{snapshot.total}，"
+            f"{snapshot.files_per_second:.0f} 个/秒）"
+        )
+
+    @staticmethod
+    def _truncate_filename(filename: str, max_length: int = 40) -> str:
+        """截断过长的文件名"""
+        if len(filename) <= max_length:
+            return filename
+
+        name, ext = os.path.splitext(filename)
+        ext_len = len(ext)
+
+        available_len = max_length - ext_len - 3
+        if available_len < 5:
+            return filename[:max_length - 3] + "..."
+
+        truncated_name = name[:available_len] + "..."
+        return truncated_name + ext
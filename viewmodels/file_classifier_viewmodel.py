@@ -1,147 +1,22 @@
 """文件分类器 ViewModel"""
 
-import json
 import os
 from pathlib import Path
 from typing import Optional
 
-from PySide6.QtCore import QObject, Signal, Slot, Property, QThread
+from PySide6.QtCore import QObject, Signal, Slot, Property, QTimer
 
-from models.file_classifier import ExtensionClassifier, DelimiterClassifier
+from models.classification_plan import ClassificationPlan
+from models.plan_file import PlanFileExecutor, write_plan_file
+from models.classifier_registry import available_classifiers, get_classifier_class, load_plugins
+from models.job_spec import JobSpec
+from models.run_journal import list_journals, read_journal_summary
+from utils.extension_config_manager import ExtensionConfigManager
+from utils.extension_trie import ExtensionSuffixTrie
+from utils.path_utils import split_source_folders
 
-
-class ClassificationWorker(QThread):
-    """分类工作线程"""
-
-    progress_updated = Signal(int, str)
-    finished = Signal(dict)
-    error_occurred = Signal(str)
-
-    def __init__(
-        self,
-        classification_mode: int,
-        source_folder: str,
-        target_folder: str,
-        delete_source: bool,
-        extension_map_json: str = "",
-        delimiter_start: str = "_",
-        delimiter_end: str = "_",
-        delimiter_start_pos: int = 1,
-        delimiter_end_pos: int = 2,
-        scan_subfolder: bool = True,
-        specify_depth: bool = False,
-        scan_depth: int = 1,
-        parent: Optional[QObject] = None
-    ):
-        super().__init__(parent)
-        self._classification_mode = classification_mode
-        self._source_folder = source_folder
-        self._target_folder = target_folder
-        self._delete_source = delete_source
-        self._extension_map_json = extension_map_json
-        self._delimiter_start = delimiter_start
-        self._delimiter_end = delimiter_end
-        self._delimiter_start_pos = delimiter_start_pos
-        self._delimiter_end_pos = delimiter_end_pos
-        self._scan_subfolder = scan_subfolder
-        self._specify_depth = specify_depth
-        self._scan_depth = scan_depth
-
-    def run(self):
-        """执行分类任务"""
-        try:
-            from utils.file_utils import get_folder_files_by_depth
-
-            self.progress_updated.emit(10, "正在扫描文件...")
-
-            if self._scan_subfolder:
-                if self._specify_depth:
-                    max_depth = self._scan_depth
-                else:
-                    max_depth = 100
-            else:
-                max_depth = 1
-
-            files = get_folder_files_by_depth(self._source_folder, max_depth=max_depth)
-            total_files = len(files)
-
-            if total_files == 0:
-                self.finished.emit({
-                    "success_count": 0,
-                    "failed_count": 0,
-                    "failed_files": [],
-                    "success_files": [],
-                    "total_files": 0
-                })
-                return
-
-            self.progress_updated.emit(20, f"找到 {total_files} 个文件，开始分类...")
-
-            if self._classification_mode == 0:
-                result = self._classify_by_extension(files, total_files)
-            else:
-                result = self._classify_by_delimiter(files, total_files)
-
-            self.progress_updated.emit(100, "分类完成")
-            self.finished.emit(result)
-
-        except Exception as e:
-            self.error_occurred.emit(f"分类失败: {str(e)}")
-
-    def _classify_by_extension(self, files: list, total_files: int) -> dict:
-        """使用扩展名分类"""
-        extension_map = json.loads(self._extension_map_json)
-
-        classifier = ExtensionClassifier(
-            extensions_map=extension_map,
-            target_dir=self._target_folder,
-            delete_source=self._delete_source
-        )
-
-        result = classifier.classify(files, progress_callback=self._create_progress_callback(total_files))
-        result["total_files"] = total_files
-        return result
-
-    def _classify_by_delimiter(self, files: list, total_files: int) -> dict:
-        """使用分隔符分类"""
-        classifier = DelimiterClassifier(
-            target_dir=self._target_folder,
-            delimiter_start_str=self._delimiter_start,
-            delimiter_end_str=self._delimiter_end,
-            delimiter_start_pos=self._delimiter_start_pos,
-            delimiter_end_pos=self._delimiter_end_pos,
-            delete_source=self._delete_source
-        )
-
-        result = classifier.classify(files, progress_callback=self._create_progress_callback(total_files))
-        result["total_files"] = total_files
-        return result
-
-    def _create_progress_callback(self, total_files: int):
-        """创建进度回调函数"""
-        def callback(processed: int, file_name: str):
-            if total_files > 0:
-                percent = int(20 + (processed / total_files) * 80)
-                display_name = self._truncate_filename(file_name, max_length=40)
-                self.progress_updated.emit(percent, f"正在处理: {display_name}")
-
-        return callback
-
-    @staticmethod
-    def _truncate_filename(filename: str, max_length: int = 40) -> str:
-        """截断过长的文件名"""
-        if len(filename) <= max_length:
-            return filename
-
-        name, ext = os.path.splitext(filename)
-        ext_len = len(ext)
-
-        available_len = max_length - ext_len - 3
-        if available_len < 5:
-            return filename[:max_length - 3] + "..."
-
-        truncated_name = name[:available_len] + "..."
-        return truncated_name + ext
+from .classification_worker import ClassificationWorker
+from .job_queue import JOB_STATE_NAMES, ClassificationJob, JobQueue
 
 
 class FileClassifierViewModel(QObject):
@@ -149,15 +24,21 @@ class FileClassifierViewModel(QObject):
 
     classification_started = Signal()
     classification_finished = Signal(dict)
+    # 工作线程失败，任务已结束；error_occurred 只用于校验、入队、切换方案等不影响运行中任务的错误
+    classification_failed = Signal(str)
+    plan_ready = Signal(object)
     progress_updated = Signal(int, str)
+    metrics_updated = Signal(object)
     error_occurred = Signal(str)
     status_changed = Signal(str)
+    paused_changed = Signal(bool)
 
     source_folder_changed = Signal(str)
     target_folder_changed = Signal(str)
     classification_mode_changed = Signal(int)
     delete_source_changed = Signal(bool)
-    extension_map_changed = Signal(str)
+    extension_map_changed = Signal(dict)
+    extension_profile_changed = Signal(str)
 
     def __init__(self, parent: Optional[QObject] = None):
         super().__init__(parent)
@@ -165,7 +46,11 @@ class FileClassifierViewModel(QObject):
         self._target_folder: str = ""
         self._classification_mode: int = 0
         self._delete_source: bool = False
-        self._extension_map_json: str = self._load_extension_map_from_config()
+        self._extension_profile: str = ExtensionConfigManager.DEFAULT_PROFILE
+        self._extension_profiles: list[str] = []
+        self._extension_map_from_profile: bool = False
+        self._extension_map: dict = self._load_extension_map_from_config()
+        self._extension_lookup: Optional[ExtensionSuffixTrie] = None
         self._delimiter_start: str = "_"
         self._delimiter_end: str = "_"
         self._delimiter_start_pos: int = 1
@@ -176,8 +61,14 @@ class FileClassifierViewModel(QObject):
         self._scan_subfolder: bool = True
         self._specify_depth: bool = False
         self._scan_depth: int = 1
-
-    def _default_extension_map(self) -> str:
+        self._path_template: str = ""
+        self._plugin_errors: list[str] = load_plugins()[1]
+        self._classifier_names: list[str] = available_classifiers()
+        self._job_queue = JobQueue(parent=self)
+        self._job_queue.job_state_changed.connect(self._on_job_state_changed)
+        QTimer.singleShot(0, self._job_queue.start)
+
+    def _default_extension_map(self) -> dict:
         """默认扩展名映射"""
         default_map = {
             "txt": "文本文件",
@@ -520,19 +411,27 @@ class FileClassifierViewModel(QObject):
             "prototxt": "Caffe 配置",
             "weights": "权重文件",
             "safetensors": "SafeTensors 模型",
-            "ds_store": "桌面存储服务"
+            "ds_store": "桌面存储服务",
+            "tar.gz": "Tar 压缩归档",
+            "tar.bz2": "Tar 压缩归档",
+            "tar.xz": "Tar 压缩归档",
+            "tar.zst": "Tar 压缩归档",
+            "nii.gz": "NIfTI 医学影像",
+            "d.ts": "TypeScript 声明文件"
         }
-        return json.dumps(default_map, ensure_ascii=False, indent=4)
+        return default_map
 
-    def _load_extension_map_from_config(self) -> str:
-        """从配置文件加载扩展名映射，失败时使用默认配置"""
+    def _load_extension_map_from_config(self) -> dict:
+        """从配置文件加载当前方案的扩展名映射，失败时使用默认配置"""
         try:
-            from utils.extension_config_manager import ExtensionConfigManager
             config_manager = ExtensionConfigManager()
-            if config_manager.load_configs():
-                return json.dumps(config_manager.mappings, ensure_ascii=False, indent=4)
+            if config_manager.load_configs(self._extension_profile):
+                self._extension_profiles = list(config_manager.profiles)
+                self._extension_map_from_profile = True
+                return dict(config_manager.mappings)
         except Exception:
             pass
+        self._extension_map_from_profile = False
         return self._default_extension_map()
 
     @Property(str)
@@ -571,15 +470,75 @@ class FileClassifierViewModel(QObject):
         self._delete_source = value
         self.delete_source_changed.emit(value)
 
-    @Property(str)
-    def extension_map_json(self) -> str:
-        return self._extension_map_json
-
-    @extension_map_json.setter
-    def extension_map_json(self, value: str):
-        self._extension_map_json = value
+    @property
+    def extension_map(self) -> dict:
+        return self._extension_map
+
+    @extension_map.setter
+    def extension_map(self, value: dict):
+        self._set_extension_map(value)
+
+    def _set_extension_map(self, value: dict):
+        """直接设置扩展名映射（不属于任何配置方案），已构建的查找表随之失效"""
+        self._extension_map = value
+        self._extension_map_from_profile = False
+        self._extension_lookup = None
         self.extension_map_changed.emit(value)
 
+    @property
+    def extension_profiles(self) -> list[str]:
+        """配置文件中的全部扩展名配置方案"""
+        return self._extension_profiles
+
+    @property
+    def extension_profile(self) -> str:
+        return self._extension_profile
+
+    @extension_profile.setter
+    def extension_profile(self, value: str):
+        self.select_extension_profile(value)
+
+    def select_extension_profile(self, profile: str) -> bool:
+        """
+        切换扩展名配置方案
+
+        每个方案的查找表由共享配置缓存分别保存，切换时配置文件未修改则不重新解析和构建。
+
+        Returns:
+            是否切换成功；失败时保持原方案并发出 error_occurred
+        """
+        profile = profile or ExtensionConfigManager.DEFAULT_PROFILE
+        config_manager = ExtensionConfigManager()
+        if not config_manager.load_configs(profile):
+            self.error_occurred.emit(config_manager.load_error or f"无法加载配置方案 '{profile}'")
+            return False
+
+        self._extension_profile = profile
+        self._extension_profiles = list(config_manager.profiles)
+        self._extension_map = dict(config_manager.mappings)
+        self._extension_map_from_profile = True
+        self._extension_lookup = None
+        self.extension_profile_changed.emit(profile)
+        self.extension_map_changed.emit(self._extension_map)
+        return True
+
+    def _get_extension_lookup(self) -> ExtensionSuffixTrie:
+        """当前扩展名映射的查找表，映射不变时所有任务共享同一个"""
+        if self._extension_lookup is None and self._extension_map_from_profile:
+            try:
+                self._extension_lookup = ExtensionConfigManager().load_lookup(self._extension_profile)
+            except ValueError:
+                pass
+        if self._extension_lookup is None:
+            self._extension_lookup = ExtensionSuffixTrie(self._extension_map)
+        return self._extension_lookup
+
+    def _current_profile_name(self) -> str:
+        """当前任务使用的配置方案名称，直接设置的扩展名映射不属于任何方案"""
+        if self._current_classifier_name() == "extension" and self._extension_map_from_profile:
+            return self._extension_profile
+        return ""
+
     @Property(str)
     def delimiter_start(self) -> str:
         return self._delimiter_start
@@ -612,6 +571,38 @@ class FileClassifierViewModel(QObject):
     def delimiter_end_pos(self, value: int):
         self._delimiter_end_pos = value
 
+    @property
+    def classifier_names(self) -> list[str]:
+        """可用分类器名称，索引与 classification_mode 对应"""
+        return self._classifier_names
+
+    @property
+    def plugin_errors(self) -> list[str]:
+        """插件加载错误信息"""
+        return self._plugin_errors
+
+    def get_classifier_display_name(self, name: str) -> str:
+        """获取分类器显示名称"""
+        return get_classifier_class(name).display_name
+
+    def _current_classifier_name(self) -> str:
+        """当前分类方式对应的分类器名称"""
+        return self._classifier_names[self._classification_mode]
+
+    def _build_classifier_options(self) -> dict:
+        """构造当前分类器的参数"""
+        classifier_name = self._current_classifier_name()
+        if classifier_name == "extension":
+            return {"extensions_map": self._get_extension_lookup()}
+        if classifier_name == "delimiter":
+            return {
+                "delimiter_start_str": self._delimiter_start,
+                "delimiter_end_str": self._delimiter_end,
+                "delimiter_start_pos": self._delimiter_start_pos,
+                "delimiter_end_pos": self._delimiter_end_pos,
+            }
+        return {}
+
     @Property(bool)
     def is_classifying(self) -> bool:
         return self._is_classifying
@@ -644,38 +635,232 @@ class FileClassifierViewModel(QObject):
     def scan_depth(self, value: int):
         self._scan_depth = value
 
+    @Property(str)
+    def path_template(self) -> str:
+        return self._path_template
+
+    @path_template.setter
+    def path_template(self, value: str):
+        self._path_template = value.strip()
+
     @Slot()
     def validate_inputs(self) -> tuple[bool, str]:
         """验证输入参数"""
-        if not self._source_folder or not os.path.exists(self._source_folder):
-            return False, "请选择有效的源文件夹"
+        spec, error_msg = self._prepare_job_spec()
+        return spec is not None, error_msg
+
+    def _prepare_job_spec(self) -> tuple[Optional[JobSpec], str]:
+        """
+        校验输入并生成任务规格
+
+        Returns:
+            (任务规格, 错误信息)，校验失败时任务规格为 None
+        """
+        source_folders = split_source_folders(self._source_folder)
+        if not source_folders:
+            return None, "请选择有效的源文件夹"
+        for source_folder in source_folders:
+            if not os.path.isdir(source_folder):
+                return None, f"源文件夹不存在: {source_folder}"
 
         if not self._target_folder:
-            return False, "请选择目标文件夹"
+            return None, "请选择目标文件夹"
 
-        if self._classification_mode == 0:
-            try:
-                extension_map = json.loads(self._extension_map_json)
-                if not isinstance(extension_map, dict):
-                    return False, "扩展名映射必须是 JSON 对象"
-            except json.JSONDecodeError as e:
-                return False, f"JSON 格式错误: {str(e)}"
-        else:
-            if not self._delimiter_start:
-                return False, "起始分隔符不能为空"
-            if not self._delimiter_end:
-                return False, "结束分隔符不能为空"
+        if not 0 <= self._classification_mode < len(self._classifier_names):
+            return None, "未知的分类方式"
 
-        return True, ""
+        try:
+            spec = JobSpec(
+                classifier_name=self._current_classifier_name(),
+                source_folder=source_folders[0],
+                target_folder=self._target_folder,
+                delete_source=self._delete_source,
+                options=self._build_classifier_options(),
+                scan_subfolder=self._scan_subfolder,
+                specify_depth=self._specify_depth,
+                scan_depth=self._scan_depth,
+                path_template=self._path_template,
+                source_folders=tuple(source_folders),
+                profile=self._current_profile_name()
+            )
+        except ValueError as e:
+            return None, str(e)
+        return spec, ""
 
     @Slot()
     def start_classification(self):
         """开始分类"""
+        self._start_worker(plan_only=False)
+
+    @Slot()
+    def start_preview(self):
+        """预览分类方案，不复制任何文件"""
+        self._start_worker(plan_only=True)
+
+    def execute_plan(self, plan: ClassificationPlan):
+        """执行已生成的分类方案"""
+        if self._is_classifying:
+            return
+
+        self._is_classifying = True
+        self.classification_started.emit()
+        self.status_changed.emit("正在执行分类方案...")
+
+        self._worker = ClassificationWorker(plan=plan)
+        self._connect_worker(self._worker)
+        self._worker.start()
+
+    def execute_plan_file(self, plan_file: str):
+        """执行方案文件，中断后再次执行会从检查点继续"""
+        if self._is_classifying:
+            return
+
+        try:
+            PlanFileExecutor(plan_file)
+        except (OSError, ValueError) as e:
+            self.error_occurred.emit(f"无法读取方案文件: {str(e)}")
+            return
+
+        self._is_classifying = True
+        self.classification_started.emit()
+        self.status_changed.emit("正在执行方案文件...")
+
+        self._worker = ClassificationWorker(plan_file=plan_file)
+        self._connect_worker(self._worker)
+        self._worker.start()
+
+    def latest_undoable_run(self) -> tuple[Optional[dict], str]:
+        """
+        最近一次尚未撤销的运行，只读取日志文件头并统计行数
+
+        Returns:
+            (运行信息, 错误信息)；运行信息包含 journal_path、target_dir、created_at、file_count，
+            没有可撤销的运行时为 None；最近的日志无法读取时返回错误信息，不会改为撤销更早的运行
+        """
+        journals = list_journals()
+        if not journals:
+            return None, ""
+
+        journal_path = journals[0]
+        try:
+            header, record_count = read_journal_summary(journal_path)
+        except ValueError as e:
+            return None, f"无法读取最近一次分类的运行日志 {journal_path}: {str(e)}"
+        return {
+            "journal_path": journal_path,
+            "target_dir": header.get("target_dir", ""),
+            "created_at": header.get("created_at", 0),
+            "file_count": record_count,
+        }, ""
+
+    def undo_run(self, journal_path: str):
+        """撤销一次运行：移回或删除分类后的文件并清理空的分类目录，中断后再次撤销会继续"""
         if self._is_classifying:
             return
 
-        valid, error_msg = self.validate_inputs()
-        if not valid:
+        self._is_classifying = True
+        self.classification_started.emit()
+        self.status_changed.emit("正在撤销...")
+
+        self._worker = ClassificationWorker(undo_journal=journal_path)
+        self._connect_worker(self._worker)
+        self._worker.start()
+
+    @Slot()
+    def pause_classification(self):
+        """暂停正在运行的任务"""
+        if self._worker is None or self._worker.is_paused:
+            return
+        self._worker.pause()
+        self.status_changed.emit("已暂停")
+        self.paused_changed.emit(True)
+
+    @Slot()
+    def resume_classification(self):
+        """继续已暂停的任务"""
+        if self._worker is None or not self._worker.is_paused:
+            return
+        self._worker.resume()
+        self.status_changed.emit("正在继续...")
+        self.paused_changed.emit(False)
+
+    @Slot()
+    def cancel_classification(self):
+        """取消正在运行的任务，已处理的文件保留"""
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        self.status_changed.emit("正在取消...")
+        self.paused_changed.emit(False)
+
+    def export_plan(self, plan: ClassificationPlan, plan_file: str) -> tuple[bool, str]:
+        """
+        导出分类方案文件
+
+        Returns:
+            (是否成功, 错误信息)
+        """
+        try:
+            write_plan_file(plan, plan_file)
+        except OSError as e:
+            return False, f"写入方案文件失败: {str(e)}"
+        return True, ""
+
+    @property
+    def job_queue(self) -> JobQueue:
+        return self._job_queue
+
+    @property
+    def interrupted_job_count(self) -> int:
+        """上次退出时被中断的队列任务数"""
+        return len(self._job_queue.interrupted_jobs)
+
+    def resume_interrupted_jobs(self):
+        """继续上次中断的队列任务，从方案文件的检查点继续，已复制的文件不会重复复制"""
+        self._job_queue.resume_interrupted()
+
+    def discard_interrupted_jobs(self):
+        """放弃上次中断的队列任务，已复制的文件保留"""
+        self._job_queue.discard_interrupted()
+
+    @Slot()
+    def enqueue_classification(self):
+        """以当前设置创建任务并加入队列，不同磁盘上的任务可并行执行"""
+        spec, error_msg = self._prepare_job_spec()
+        if spec is None:
+            self.error_occurred.emit(error_msg)
+            return
+
+        job = ClassificationJob(spec=spec)
+        self._job_queue.add_job(job)
+
+    def _on_job_state_changed(self, job_id: str, state: str):
+        """队列任务状态改变"""
+        job = self._job_queue.get_job(job_id)
+        if job is None:
+            return
+
+        source_folder = job.spec.source_folder
+        source_name = os.path.basename(source_folder) or source_folder
+        if len(job.spec.source_folders) > 1:
+            source_name += f" 等 {len(job.spec.source_folders)} 个文件夹"
+        if job.spec.profile:
+            source_name += f"（方案 {job.spec.profile}）"
+        message = f"队列任务 {source_name}：{JOB_STATE_NAMES[state]}"
+        if job.result is not None:
+            message += f"，成功 {job.result.get('success_count', 0)} 个，失败 {job.result.get('failed_count', 0)} 个"
+        elif job.error:
+            message += f"，{job.error}"
+        message += f"（排队 {self._job_queue.pending_count} 个，运行 {self._job_queue.running_count} 个）"
+        self.status_changed.emit(message)
+
+    def _start_worker(self, plan_only: bool):
+        """校验输入并启动工作线程"""
+        if self._is_classifying:
+            return
+
+        spec, error_msg = self._prepare_job_spec()
+        if spec is None:
             self.error_occurred.emit(error_msg)
             return
 
@@ -683,27 +868,18 @@ class FileClassifierViewModel(QObject):
         self.classification_started.emit()
         self.status_changed.emit("正在初始化...")
 
-        self._worker = ClassificationWorker(
-            classification_mode=self._classification_mode,
-            source_folder=self._source_folder,
-            target_folder=self._target_folder,
-            delete_source=self._delete_source,
-            extension_map_json=self._extension_map_json,
-            delimiter_start=self._delimiter_start,
-            delimiter_end=self._delimiter_end,
-            delimiter_start_pos=self._delimiter_start_pos,
-            delimiter_end_pos=self._delimiter_end_pos,
-            scan_subfolder=self._scan_subfolder,
-            specify_depth=self._specify_depth,
-            scan_depth=self._scan_depth
-        )
-
-        self._worker.progress_updated.connect(self._on_worker_progress)
-        self._worker.finished.connect(self._on_worker_finished)
-        self._worker.error_occurred.connect(self._on_worker_error)
-
+        self._worker = ClassificationWorker(spec=spec, plan_only=plan_only)
+        self._connect_worker(self._worker)
         self._worker.start()
 
+    def _connect_worker(self, worker: ClassificationWorker):
+        """连接工作线程信号"""
+        worker.progress_updated.connect(self._on_worker_progress)
+        worker.metrics_updated.connect(self.metrics_updated)
+        worker.result_ready.connect(self._on_worker_finished)
+        worker.plan_ready.connect(self._on_worker_plan_ready)
+        worker.error_occurred.connect(self._on_worker_error)
+
     def _on_worker_progress(self, value: int, message: str):
         """工作线程进度更新"""
         self.progress_updated.emit(value, message)
@@ -715,18 +891,26 @@ class FileClassifierViewModel(QObject):
         self._classification_result = result
         self.classification_finished.emit(result)
 
+    def _on_worker_plan_ready(self, plan: ClassificationPlan):
+        """分类方案生成完成"""
+        self._is_classifying = False
+        self._worker = None
+        self.plan_ready.emit(plan)
+
     def _on_worker_error(self, error: str):
         """工作线程错误"""
         self._is_classifying = False
         self._worker = None
-        self.error_occurred.emit(error)
+        self.classification_failed.emit(error)
 
     @Slot()
     def reset_settings(self):
         """重置设置"""
         self._source_folder = ""
         self._target_folder = ""
-        self._extension_map_json = self._load_extension_map_from_config()
+        self._extension_profile = ExtensionConfigManager.DEFAULT_PROFILE
+        self._extension_map = self._load_extension_map_from_config()
+        self._extension_lookup = None
         self._delimiter_start = "_"
         self._delimiter_end = "_"
         self._delimiter_start_pos = 1
@@ -735,12 +919,12 @@ class FileClassifierViewModel(QObject):
 
         self.source_folder_changed.emit("")
         self.target_folder_changed.emit("")
-        self.extension_map_changed.emit(self._extension_map_json)
+        self.extension_profile_changed.emit(self._extension_profile)
+        self.extension_map_changed.emit(self._extension_map)
         self.delete_source_changed.emit(False)
         self.status_changed.emit("就绪")
 
     @Slot()
     def load_default_extension_map(self):
-        """加载默认扩展名映射（从配置文件）"""
-        self._extension_map_json = self._load_extension_map_from_config()
-        self.extension_map_changed.emit(self._extension_map_json)
+        """重新从配置文件加载当前方案的扩展名映射"""
+        self.select_extension_profile(self._extension_profile)
@@ -0,0 +1,426 @@
+"""分类任务队列与调度"""
+
+import json
+import os
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from PySide6.QtCore import QObject, Signal
+
+from models.job_spec import JobSpec
+from models.plan_file import CHECKPOINT_SUFFIX
+from utils.file_utils import atomic_write_text
+from utils.path_utils import get_config_path
+
+from .classification_worker import ClassificationWorker
+
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+JOB_INTERRUPTED = "interrupted"
+
+JOB_FINISHED_STATES = (JOB_COMPLETED, JOB_FAILED, JOB_CANCELLED)
+
+JOB_STATE_NAMES = {
+    JOB_PENDING: "排队中",
+    JOB_RUNNING: "运行中",
+    JOB_COMPLETED: "已完成",
+    JOB_FAILED: "失败",
+    JOB_CANCELLED: "已取消",
+    JOB_INTERRUPTED: "已中断",
+}
+
+# 保存到队列文件、重启后恢复的状态
+JOB_SAVED_STATES = (JOB_PENDING, JOB_RUNNING, JOB_INTERRUPTED)
+
+JOB_PLAN_SUFFIX = ".jsonl"
+
+
+@dataclass
+class ClassificationJob:
+    """排队中的分类任务"""
+    spec: JobSpec
+    priority: int = 0
+    job_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    created_at: float = field(default_factory=time.time)
+    state: str = JOB_PENDING
+    error: str = ""
+    result: Optional[dict] = None  # 结束后只保留结果摘要，完整结果通过 job_finished 发出
+
+    def to_dict(self) -> dict:
+        """转换为字典（不含运行结果）"""
+        return {
+            "job_id": self.job_id,
+            "priority": self.priority,
+            "created_at": self.created_at,
+            "state": self.state,
+            **self.spec.to_dict()
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ClassificationJob":
+        """
+        从字典创建任务：上次退出时正在运行或已中断的任务恢复为中断状态，需明确继续后才会运行，
+        其余任务恢复为排队状态
+
+        Raises:
+            ValueError: 任务参数无效
+        """
+        state = data.get("state")
+        return cls(
+            spec=JobSpec.from_dict(data),
+            job_id=data.get("job_id") or uuid.uuid4().hex,
+            priority=data.get("priority", 0),
+            created_at=data.get("created_at", time.time()),
+            state=JOB_INTERRUPTED if state in (JOB_RUNNING, JOB_INTERRUPTED) else JOB_PENDING
+        )
+
+
+def summarize_job_result(result: dict) -> dict:
+    """
+    任务结果摘要：只保留计数，不保留成功/失败文件列表
+
+    Args:
+        result: 完整的处理结果字典
+    """
+    return {
+        "success_count": result.get("success_count", 0),
+        "failed_count": result.get("failed_count", 0),
+        "total_files": result.get("total_files", 0),
+        "unprocessed_count": len(result.get("unprocessed_files", [])),
+        "cancelled": bool(result.get("cancelled")),
+    }
+
+
+def get_device_id(path: str):
+    """
+    获取路径所在设备的标识，路径不存在时使用最近的已存在上级目录
+
+    Args:
+        path: 文件或目录路径
+
+    Returns:
+        设备号；无法获取时返回盘符或根目录，保证同一磁盘上的路径得到相同标识
+    """
+    current = os.path.abspath(path)
+    while True:
+        try:
+            return os.stat(current).st_dev
+        except OSError:
+            parent = os.path.dirname(current)
+            if parent == current:
+                return os.path.splitdrive(current)[0] or current
+            current = parent
+
+
+class JobQueue(QObject):
+    """
+    分类任务队列
+
+    按优先级（高优先）和加入时间排序调度，同时运行的任务数不超过 max_concurrent；
+    源目录或目标目录位于同一设备的任务不会同时运行，避免同一磁盘上的并发读写互相拖慢。
+    排队中的任务保存到配置目录，重启后自动恢复。
+
+    任务生成的方案先写入方案文件（配置目录下的 job_plans）再按文件执行，进度保存在检查点中。
+    程序退出时正在运行的任务重启后为中断状态，不会自动运行：调用 resume_interrupted 后
+    从检查点继续，已复制的文件不会重复复制；discard_interrupted 放弃任务并删除方案文件。
+    已结束的任务只保留结果摘要，且只保留最近 MAX_FINISHED_JOBS 个。
+    """
+
+    DEFAULT_QUEUE_FILE = "job_queue.json"
+    PLAN_DIR_NAME = "job_plans"
+    DEFAULT_MAX_CONCURRENT = 2
+    MAX_FINISHED_JOBS = 100
+
+    job_added = Signal(str)
+    job_state_changed = Signal(str, str)
+    job_progress = Signal(str, int, str)
+    job_finished = Signal(str, dict)
+
+    def __init__(
+        self,
+        max_concurrent: int = DEFAULT_MAX_CONCURRENT,
+        queue_file: Optional[str] = None,
+        parent: Optional[QObject] = None
+    ):
+        super().__init__(parent)
+        self._max_concurrent = max(1, max_concurrent)
+        if queue_file:
+            self._queue_file = Path(queue_file)
+        else:
+            self._queue_file = get_config_path() / self.DEFAULT_QUEUE_FILE
+        self._plan_dir = self._queue_file.parent / self.PLAN_DIR_NAME
+        self._jobs: dict[str, ClassificationJob] = {}
+        self._workers: dict[str, ClassificationWorker] = {}
+        self._finishing_workers: set[ClassificationWorker] = set()
+        self._job_devices: dict[str, set] = {}
+        self._load_jobs()
+
+    @property
+    def jobs(self) -> list[ClassificationJob]:
+        """所有任务，按调度顺序排列"""
+        return sorted(self._jobs.values(), key=self._sort_key)
+
+    @property
+    def max_concurrent(self) -> int:
+        return self._max_concurrent
+
+    @max_concurrent.setter
+    def max_concurrent(self, value: int):
+        self._max_concurrent = max(1, value)
+        self._schedule()
+
+    @property
+    def running_count(self) -> int:
+        return len(self._workers)
+
+    @property
+    def pending_count(self) -> int:
+        return sum(1 for job in self._jobs.values() if job.state == JOB_PENDING)
+
+    @property
+    def interrupted_jobs(self) -> list[ClassificationJob]:
+        """上次退出时被中断、等待继续或放弃的任务"""
+        return [job for job in self.jobs if job.state == JOB_INTERRUPTED]
+
+    def get_job(self, job_id: str) -> Optional[ClassificationJob]:
+        """根据ID获取任务"""
+        return self._jobs.get(job_id)
+
+    def add_job(self, job: ClassificationJob) -> str:
+        """
+        加入任务并尝试调度
+
+        Returns:
+            任务ID
+        """
+        job.state = JOB_PENDING
+        self._jobs[job.job_id] = job
+        self._save_jobs()
+        self.job_added.emit(job.job_id)
+        self._schedule()
+        return job.job_id
+
+    def set_priority(self, job_id: str, priority: int):
+        """修改排队中任务的优先级"""
+        job = self._jobs.get(job_id)
+        if job is None or job.state != JOB_PENDING:
+            return
+        job.priority = priority
+        self._save_jobs()
+        self._schedule()
+
+    def resume_interrupted(self, job_id: Optional[str] = None):
+        """
+        继续中断的任务，从方案文件的检查点继续
+
+        Args:
+            job_id: 任务ID，不指定时继续全部中断的任务
+        """
+        for job in self.interrupted_jobs:
+            if job_id is None or job.job_id == job_id:
+                self._set_state(job, JOB_PENDING)
+        self._save_jobs()
+        self._schedule()
+
+    def discard_interrupted(self, job_id: Optional[str] = None):
+        """
+        放弃中断的任务，已复制的文件保留
+
+        Args:
+            job_id: 任务ID，不指定时放弃全部中断的任务
+        """
+        for job in self.interrupted_jobs:
+            if job_id is None or job.job_id == job_id:
+                self._remove_plan_file(job.job_id)
+                self._set_state(job, JOB_CANCELLED)
+        self._prune_finished()
+        self._save_jobs()
+
+    def cancel_job(self, job_id: str):
+        """取消任务：排队中或中断的任务直接移出队列，运行中的任务协作式取消"""
+        job = self._jobs.get(job_id)
+        if job is None:
+            return
+
+        if job.state in (JOB_PENDING, JOB_INTERRUPTED):
+            self._remove_plan_file(job_id)
+            self._set_state(job, JOB_CANCELLED)
+            self._prune_finished()
+            self._save_jobs()
+        elif job.state == JOB_RUNNING:
+            self._workers[job_id].cancel()
+
+    def pause_job(self, job_id: str):
+        """暂停运行中的任务"""
+        worker = self._workers.get(job_id)
+        if worker is not None:
+            worker.pause()
+
+    def resume_job(self, job_id: str):
+        """继续已暂停的任务"""
+        worker = self._workers.get(job_id)
+        if worker is not None:
+            worker.resume()
+
+    def clear_finished(self):
+        """移除已结束的任务"""
+        self._jobs = {
+            job_id: job for job_id, job in self._jobs.items()
+            if job.state not in JOB_FINISHED_STATES
+        }
+
+    @staticmethod
+    def _sort_key(job: ClassificationJob) -> tuple:
+        return (-job.priority, job.created_at)
+
+    def _busy_devices(self) -> set:
+        """运行中任务占用的设备"""
+        devices = set()
+        for job_devices in self._job_devices.values():
+            devices |= job_devices
+        return devices
+
+    def _schedule(self):
+        """按优先级启动可运行的任务"""
+        if len(self._workers) >= self._max_concurrent:
+            return
+
+        busy_devices = self._busy_devices()
+        for job in self.jobs:
+            if len(self._workers) >= self._max_concurrent:
+                break
+            if job.state != JOB_PENDING:
+                continue
+
+            devices = {get_device_id(folder) for folder in job.spec.source_folders}
+            devices.add(get_device_id(job.spec.target_folder))
+            if devices & busy_devices:
+                continue
+
+            busy_devices |= devices
+            self._start_job(job, devices)
+
+    def _start_job(self, job: ClassificationJob, devices: set):
+        """启动任务的工作线程"""
+        job_id = job.job_id
+        worker = ClassificationWorker(spec=job.spec, job_plan_file=self._get_plan_path(job_id))
+        worker.progress_updated.connect(lambda value, message: self.job_progress.emit(job_id, value, message))
+        worker.result_ready.connect(lambda result: self._on_job_finished(job_id, result))
+        worker.error_occurred.connect(lambda error: self._on_job_error(job_id, error))
+        worker.finished.connect(lambda: self._on_worker_thread_finished(worker))
+
+        self._workers[job_id] = worker
+        self._job_devices[job_id] = devices
+        self._set_state(job, JOB_RUNNING)
+        self._save_jobs()
+        worker.start()
+
+    def _get_plan_path(self, job_id: str) -> str:
+        """任务的方案文件路径"""
+        return str(self._plan_dir / f"{job_id}{JOB_PLAN_SUFFIX}")
+
+    def _remove_plan_file(self, job_id: str):
+        """任务结束后删除方案文件及其检查点"""
+        plan_path = self._get_plan_path(job_id)
+        for path in (plan_path, plan_path + CHECKPOINT_SUFFIX, plan_path + ".tmp"):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _release_worker(self, job_id: str):
+        """
+        释放已发出结果的任务占用的调度名额和设备
+
+        此时 run() 可能尚未返回，工作线程在 QThread.finished 之后才删除，界面线程不等待
+        """
+        worker = self._workers.pop(job_id, None)
+        self._job_devices.pop(job_id, None)
+        if worker is not None and not worker.isFinished():
+            self._finishing_workers.add(worker)
+        elif worker is not None:
+            worker.deleteLater()
+
+    def _on_worker_thread_finished(self, worker: ClassificationWorker):
+        """工作线程已结束，可以删除"""
+        if worker in self._finishing_workers:
+            self._finishing_workers.discard(worker)
+            worker.deleteLater()
+
+    def _prune_finished(self):
+        """已结束的任务超过 MAX_FINISHED_JOBS 个时移除最早加入的"""
+        finished = [job for job in self._jobs.values() if job.state in JOB_FINISHED_STATES]
+        for job in sorted(finished, key=lambda job: job.created_at)[:-self.MAX_FINISHED_JOBS]:
+            del self._jobs[job.job_id]
+
+    def _on_job_finished(self, job_id: str, result: dict):
+        """任务完成：完整结果只通过 job_finished 发出，任务本身只保留摘要"""
+        self._release_worker(job_id)
+        self._remove_plan_file(job_id)
+        job = self._jobs.get(job_id)
+        if job is not None:
+            job.result = summarize_job_result(result)
+            self._set_state(job, JOB_CANCELLED if result.get("cancelled") else JOB_COMPLETED)
+            self.job_finished.emit(job_id, result)
+        self._prune_finished()
+        self._save_jobs()
+        self._schedule()
+
+    def _on_job_error(self, job_id: str, error: str):
+        """任务出错"""
+        self._release_worker(job_id)
+        self._remove_plan_file(job_id)
+        job = self._jobs.get(job_id)
+        if job is not None:
+            job.error = error
+            self._set_state(job, JOB_FAILED)
+        self._prune_finished()
+        self._save_jobs()
+        self._schedule()
+
+    def _set_state(self, job: ClassificationJob, state: str):
+        job.state = state
+        self.job_state_changed.emit(job.job_id, state)
+
+    def _load_jobs(self):
+        """恢复上次未完成的任务，启动时不自动运行，由 start 开始调度排队中的任务"""
+        if not self._queue_file.exists():
+            return
+
+        try:
+            with open(self._queue_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return
+
+        # 根元素或 jobs 类型不对时与文件损坏同样处理
+        if not isinstance(data, dict) or not isinstance(data.get("jobs"), list):
+            return
+
+        for job_data in data["jobs"]:
+            if not isinstance(job_data, dict):
+                continue
+            try:
+                job = ClassificationJob.from_dict(job_data)
+            except ValueError:
+                continue
+            self._jobs[job.job_id] = job
+
+    def _save_jobs(self):
+        """保存未结束的任务，运行中的任务重启后为中断状态"""
+        jobs = [job.to_dict() for job in self.jobs if job.state in JOB_SAVED_STATES]
+        try:
+            self._queue_file.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_text(self._queue_file, json.dumps({"jobs": jobs}, ensure_ascii=False, indent=2))
+        except OSError:
+            pass
+
+    def start(self):
+        """开始调度排队中的任务，中断的任务需调用 resume_interrupted 继续"""
+        self._schedule()
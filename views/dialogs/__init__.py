@@ -4,10 +4,12 @@ from .result_dialog import ResultDialog
 from .general_settings_dialog import GeneralSettingsDialog
 from .extension_settings_dialog import ExtensionSettingsDialog
 from .delimiter_settings_dialog import DelimiterSettingsDialog
+from .plan_preview_dialog import PlanPreviewDialog
 
 __all__ = [
     "ResultDialog",
     "GeneralSettingsDialog",
     "ExtensionSettingsDialog",
     "DelimiterSettingsDialog",
+    "PlanPreviewDialog",
 ]
@@ -1,28 +1,108 @@
 """分隔符设置对话框"""
 
 import os
+from collections import Counter
 from typing import Optional
 
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QThread, Signal
 from PySide6.QtWidgets import (
     QDialog, QWidget, QVBoxLayout, QHBoxLayout,
     QGridLayout, QLabel, QLineEdit, QPushButton,
-    QGroupBox, QComboBox
+    QGroupBox, QComboBox, QTableWidget, QTableWidgetItem,
+    QAbstractItemView
 )
 
+from models.file_classifier import extract_delimited_category
+from utils.file_utils import sample_folder_file_names
 from views.styles import DELIMITER_SETTINGS_DIALOG_STYLE
 
 
+class FileSampleWorker(QThread):
+    """在后台采样源文件夹中的文件名，结果附带采样的文件夹路径"""
+
+    samples_ready = Signal(str, list)
+
+    def __init__(self, folder_path: str, limit: int, parent: Optional[QWidget] = None):
+        super().__init__(parent)
+        self._folder_path = folder_path
+        self._limit = limit
+
+    def run(self):
+        self.samples_ready.emit(self._folder_path, sample_folder_file_names(self._folder_path, self._limit))
+
+
 class DelimiterSettingsDialog(QDialog):
     """分隔符设置对话框"""
 
+    SAMPLE_SIZE = 500
+    MAX_HISTOGRAM_ROWS = 8
+
     def __init__(self, parent: Optional[QWidget] = None):
         super().__init__(parent)
         self._config_manager = None
+        self._sample_names: list[str] = []
+        self._sample_worker: Optional[FileSampleWorker] = None
+        self._sample_workers: set[FileSampleWorker] = set()
+        self._sample_folder: Optional[str] = None
         self._setup_ui()
         self._setup_connections()
         self._load_configs()
 
+    def set_source_folder(self, folder_path: str):
+        """
+        设置源文件夹并在后台采样文件名，用于预览真实文件的提取结果
+
+        之前的采样线程不再连接到对话框，结束后自行释放；其结果即使已在事件队列中，
+        也会因文件夹不符而被忽略。
+
+        Args:
+            folder_path: 源文件夹路径
+        """
+        self._sample_names = []
+        self._release_sample_worker()
+        if not folder_path or not os.path.isdir(folder_path):
+            self._sample_folder = None
+            self.sample_summary_label.setText("未选择有效的源文件夹，无法预览真实文件")
+            self.sample_table.setRowCount(0)
+            return
+
+        self.sample_summary_label.setText("正在采样源文件夹...")
+        self._sample_folder = folder_path
+        worker = FileSampleWorker(folder_path, self.SAMPLE_SIZE, self)
+        worker.samples_ready.connect(self._on_samples_ready)
+        worker.finished.connect(lambda: self._on_sample_worker_finished(worker))
+        self._sample_workers.add(worker)
+        self._sample_worker = worker
+        worker.start()
+
+    def _release_sample_worker(self):
+        """断开当前采样线程的结果信号，线程结束后由 _on_sample_worker_finished 释放"""
+        if self._sample_worker is None:
+            return
+        self._sample_worker.samples_ready.disconnect(self._on_samples_ready)
+        self._sample_worker = None
+
+    def _on_sample_worker_finished(self, worker: FileSampleWorker):
+        """采样线程结束后释放"""
+        self._sample_workers.discard(worker)
+        if worker is self._sample_worker:
+            self._sample_worker = None
+        worker.deleteLater()
+
+    def _on_samples_ready(self, folder_path: str, names: list):
+        """采样完成，忽略已切换掉的文件夹的结果"""
+        if folder_path != self._sample_folder:
+            return
+        self._sample_names = names
+        self._update_sample_preview(sampling_done=True)
+
+    def done(self, result: int):
+        """关闭前等待所有采样线程结束"""
+        self._release_sample_worker()
+        for worker in list(self._sample_workers):
+            worker.wait()
+        super().done(result)
+
     def _load_configs(self):
         """加载配置列表"""
         from utils.delimiter_config_manager import DelimiterConfigManager
@@ -151,8 +231,8 @@ class DelimiterSettingsDialog(QDialog):
     def _setup_ui(self):
         """设置UI"""
         self.setWindowTitle("分隔符设置")
-        self.setMinimumSize(500, 320)
-        self.resize(550, 380)
+        self.setMinimumSize(500, 480)
+        self.resize(580, 600)
         self.setStyleSheet(DELIMITER_SETTINGS_DIALOG_STYLE)
 
         layout = QVBoxLayout(self)
@@ -216,7 +296,24 @@ class DelimiterSettingsDialog(QDialog):
 
         layout.addWidget(demo_group)
 
-        layout.addStretch(1)
+        sample_group = QGroupBox("源文件夹采样")
+        sample_layout = QVBoxLayout(sample_group)
+
+        self.sample_summary_label = QLabel("未选择有效的源文件夹，无法预览真实文件")
+        self.sample_summary_label.setWordWrap(True)
+        sample_layout.addWidget(self.sample_summary_label)
+
+        self.sample_table = QTableWidget()
+        self.sample_table.setColumnCount(3)
+        self.sample_table.setHorizontalHeaderLabels(["分类", "文件数", "占比"])
+        self.sample_table.horizontalHeader().setStretchLastSection(True)
+        self.sample_table.verticalHeader().setVisible(False)
+        self.sample_table.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.sample_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.sample_table.setColumnWidth(0, 220)
+        sample_layout.addWidget(self.sample_table)
+
+        layout.addWidget(sample_group, 1)
 
         button_layout = QHBoxLayout()
         button_layout.setSpacing(10)
@@ -322,6 +419,51 @@ class DelimiterSettingsDialog(QDialog):
             preview_text = f'{result}  →  <span style="color: #f44336;">无法提取</span>'
 
         self.demo_label.setText(preview_text)
+        self._update_sample_preview()
+
+    def _update_sample_preview(self, sampling_done: bool = False):
+        """用当前规则提取采样文件名，显示分类分布和无法提取的比例"""
+        if not self._sample_names:
+            if self._sample_folder is not None and (sampling_done or self._sample_worker is None):
+                self.sample_summary_label.setText("源文件夹中没有文件")
+                self.sample_table.setRowCount(0)
+            return
+
+        start_delim = self.get_delimiter_start()
+        end_delim = self.get_delimiter_end()
+        start_pos = self.get_delimiter_start_pos()
+        end_pos = self.get_delimiter_end_pos()
+
+        counts = Counter()
+        if start_delim and end_delim and not (start_pos == -1 and end_pos == -1):
+            counts.update(
+                extract_delimited_category(name, start_delim, end_delim, start_pos, end_pos)
+                for name in self._sample_names
+            )
+        else:
+            counts[""] = len(self._sample_names)
+
+        total = len(self._sample_names)
+        unmatched = counts.pop("", 0)
+        self.sample_summary_label.setText(
+            f"采样 {total} 个文件，提取出 {len(counts)} 个分类，"
+            f"无法提取 {unmatched} 个（{unmatched / total:.0%}）"
+        )
+
+        rows = counts.most_common(self.MAX_HISTOGRAM_ROWS)
+        other_count = total - unmatched - sum(count for _, count in rows)
+        if other_count > 0:
+            rows.append((f"其他 {len(counts) - len(rows)} 个分类", other_count))
+
+        self.sample_table.setRowCount(len(rows))
+        for row, (category, count) in enumerate(rows):
+            count_item = QTableWidgetItem(str(count))
+            count_item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+            ratio_item = QTableWidgetItem(f"{count / total:.0%}")
+            ratio_item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+            self.sample_table.setItem(row, 0, QTableWidgetItem(category))
+            self.sample_table.setItem(row, 1, count_item)
+            self.sample_table.setItem(row, 2, ratio_item)
 
     def get_delimiter_start(self) -> str:
         return self.delimiter_start_edit.text()
@@ -1,64 +1,125 @@
 """扩展名映射设置对话框"""
 
-import json
 from typing import Optional
 
+from PySide6.QtCore import Qt, QSortFilterProxyModel, QTimer
 from PySide6.QtWidgets import (
     QDialog, QWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QLineEdit, QPushButton, QGroupBox,
-    QTableWidget, QTableWidgetItem, QMessageBox,
-    QAbstractItemView
+    QTableView, QHeaderView, QMessageBox,
+    QAbstractItemView, QComboBox, QInputDialog
 )
 
 from views.styles import EXTENSION_SETTINGS_DIALOG_STYLE
+from views.widgets import ExtensionMappingModel
 
 
 class ExtensionSettingsDialog(QDialog):
     """扩展名映射设置对话框"""
 
-    def __init__(self, parent: Optional[QWidget] = None):
+    SEARCH_DELAY_MS = 200
+
+    def __init__(self, parent: Optional[QWidget] = None, profile: Optional[str] = None):
         super().__init__(parent)
         self._updating_from_viewmodel: bool = False
         self._config_manager = None
+        self._modified: bool = False
+        self._mapping_model = ExtensionMappingModel(self)
+        self._proxy_model = QSortFilterProxyModel(self)
+        self._proxy_model.setSourceModel(self._mapping_model)
+        self._proxy_model.setFilterKeyColumn(-1)
+        self._proxy_model.setFilterCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(self.SEARCH_DELAY_MS)
         self._setup_ui()
         self._setup_connections()
-        self._load_configs()
+        self._load_configs(profile)
 
-    def _load_configs(self):
-        """加载配置"""
+    def _load_configs(self, profile: Optional[str] = None) -> bool:
+        """加载配置方案"""
         from utils.extension_config_manager import ExtensionConfigManager
 
         self._config_manager = ExtensionConfigManager()
-        success = self._config_manager.load_configs()
+        success = self._config_manager.load_configs(profile)
+        self._modified = False
 
+        self._refresh_profile_combo()
         self._refresh_table()
 
         if not success and self._config_manager.load_error:
             QMessageBox.warning(self, "加载配置失败", self._config_manager.load_error)
+        return success
+
+    def _refresh_profile_combo(self):
+        """用配置文件中的方案列表重建下拉框"""
+        self.profile_combo.blockSignals(True)
+        self.profile_combo.clear()
+        self.profile_combo.addItems(self._config_manager.profiles)
+        self.profile_combo.setCurrentText(self._config_manager.current_profile)
+        self.profile_combo.blockSignals(False)
+
+    def _confirm_discard_changes(self) -> bool:
+        """有未保存的修改时确认是否丢弃"""
+        if not self._modified:
+            return True
+        reply = QMessageBox.question(
+            self,
+            "未保存的修改",
+            f"方案 '{self._config_manager.current_profile}' 的修改尚未保存，确定要丢弃吗？",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        return reply == QMessageBox.StandardButton.Yes
 
-    def _refresh_table(self, filter_text: str = ""):
-        """刷新映射表"""
-        self.mapping_table.setRowCount(0)
+    def _on_profile_changed(self, profile: str):
+        """切换配置方案"""
+        if not profile or profile == self._config_manager.current_profile:
+            return
 
-        if not self._config_manager:
+        if not self._confirm_discard_changes():
+            self._refresh_profile_combo()
             return
 
-        if filter_text:
-            mappings = self._config_manager.search_mappings(filter_text)
-        else:
-            mappings = self._config_manager.mappings
+        previous_profile = self._config_manager.current_profile
+        if not self._load_configs(profile):
+            self._load_configs(previous_profile)
 
-        for ext, category in sorted(mappings.items()):
-            row = self.mapping_table.rowCount()
-            self.mapping_table.insertRow(row)
-            self.mapping_table.setItem(row, 0, QTableWidgetItem(ext))
-            self.mapping_table.setItem(row, 1, QTableWidgetItem(category))
+    def _on_new_profile(self):
+        """以当前方案为模板新建方案"""
+        name, ok = QInputDialog.getText(self, "新建方案", "方案名称（以当前方案的映射为初始内容）:")
+        if not ok:
+            return
+
+        success, error_msg = self._config_manager.create_profile(name)
+        if not success:
+            QMessageBox.warning(self, "新建失败", error_msg)
+            return
 
-        self.count_label.setText(f"共 {len(mappings)} 条映射")
+        self._modified = True
+        self._refresh_profile_combo()
+        self._update_count_label()
 
-    def _on_search_changed(self, text: str):
-        """搜索文本改变"""
-        self._refresh_table(text)
+    def _refresh_table(self):
+        """用配置中的全部映射重建表格，仅在加载配置时使用"""
+        if not self._config_manager:
+            return
+
+        self._mapping_model.set_mappings(self._config_manager.mappings)
+        self._update_count_label()
+
+    def _update_count_label(self):
+        """显示当前可见的映射数量"""
+        visible_count = self._proxy_model.rowCount()
+        total_count = self._mapping_model.rowCount()
+        if visible_count == total_count:
+            self.count_label.setText(f"共 {total_count} 条映射")
+        else:
+            self.count_label.setText(f"共 {total_count} 条映射，显示 {visible_count} 条")
+
+    def _apply_search(self):
+        """输入停止后再过滤"""
+        self._proxy_model.setFilterFixedString(self.search_input.text().strip())
+        self._update_count_label()
 
     def _on_add_mapping(self):
         """添加映射"""
@@ -78,22 +139,23 @@ class ExtensionSettingsDialog(QDialog):
             QMessageBox.warning(self, "添加失败", error_msg)
             return
 
+        ext_lower = ext.lower()
+        self._mapping_model.set_mapping(ext_lower, self._config_manager.mappings[ext_lower])
+        self._modified = True
+        self._update_count_label()
+
         self.ext_input.clear()
         self.category_input.clear()
-        self._refresh_table(self.search_input.text())
 
     def _on_delete_mapping(self):
         """删除映射"""
-        current_row = self.mapping_table.currentRow()
-        if current_row < 0:
+        current_index = self.mapping_table.currentIndex()
+        if not current_index.isValid():
             QMessageBox.warning(self, "删除失败", "请先选择要删除的映射")
             return
 
-        ext_item = self.mapping_table.item(current_row, 0)
-        if not ext_item:
-            return
-
-        ext = ext_item.text()
+        source_index = self._proxy_model.mapToSource(current_index)
+        ext = self._mapping_model.extension_at(source_index.row())
         reply = QMessageBox.question(
             self,
             "确认删除",
@@ -103,43 +165,52 @@ class ExtensionSettingsDialog(QDialog):
 
         if reply == QMessageBox.StandardButton.Yes:
             self._config_manager.delete_mapping(ext)
-            self._refresh_table(self.search_input.text())
+            self._mapping_model.remove_mapping(ext)
+            self._modified = True
+            self._update_count_label()
 
     def _on_save(self):
         """保存配置"""
         success, error_msg = self._config_manager.save_configs()
         if success:
-            QMessageBox.information(self, "保存成功", "扩展名映射配置已保存")
+            self._modified = False
+            QMessageBox.information(
+                self, "保存成功", f"配置方案 '{self._config_manager.current_profile}' 已保存"
+            )
             self.accept()
         else:
             QMessageBox.warning(self, "保存失败", error_msg)
 
     def _on_load_default(self):
-        """加载默认配置"""
+        """从配置文件重新加载当前方案，丢弃未保存的修改"""
         from utils.extension_config_manager import ExtensionConfigManager
 
-        self._config_manager = ExtensionConfigManager()
-        success = self._config_manager.load_configs()
+        profile = self._config_manager.current_profile
+        config_manager = ExtensionConfigManager()
+        success = config_manager.load_configs(profile)
 
         if success:
-            self._refresh_table(self.search_input.text())
-            QMessageBox.information(self, "加载成功", "已加载默认扩展名映射")
+            self._config_manager = config_manager
+            self._modified = False
+            self._refresh_profile_combo()
+            self._refresh_table()
+            QMessageBox.information(self, "加载成功", f"已重新加载配置方案 '{profile}'")
         else:
-            QMessageBox.warning(self, "加载失败", self._config_manager.load_error or "未知错误")
-
-    def get_extension_map_json(self) -> str:
-        """获取扩展名映射JSON"""
-        return json.dumps(self._config_manager.mappings, ensure_ascii=False, indent=4)
-
-    def set_extension_map_json(self, value: str):
-        """设置扩展名映射JSON"""
-        try:
-            mappings = json.loads(value)
-            if isinstance(mappings, dict):
-                self._config_manager.import_from_dict(mappings)
-                self._refresh_table()
-        except json.JSONDecodeError:
-            pass
+            QMessageBox.warning(self, "加载失败", config_manager.load_error or "未知错误")
+
+    def get_profile(self) -> str:
+        """获取当前配置方案名称"""
+        return self._config_manager.current_profile
+
+    def get_extension_map(self) -> dict:
+        """获取扩展名映射"""
+        return dict(self._config_manager.mappings)
+
+    def set_extension_map(self, mappings: dict):
+        """设置扩展名映射"""
+        self._config_manager.import_from_dict(mappings)
+        self._modified = True
+        self._refresh_table()
 
     def _setup_ui(self):
         """设置UI"""
@@ -152,6 +223,21 @@ class ExtensionSettingsDialog(QDialog):
         layout.setSpacing(12)
         layout.setContentsMargins(20, 20, 20, 20)
 
+        profile_layout = QHBoxLayout()
+        profile_layout.setSpacing(10)
+
+        profile_label = QLabel("配置方案:")
+        self.profile_combo = QComboBox()
+
+        self.new_profile_button = QPushButton("新建方案")
+        self.new_profile_button.setObjectName("defaultButton")
+
+        profile_layout.addWidget(profile_label)
+        profile_layout.addWidget(self.profile_combo, 1)
+        profile_layout.addWidget(self.new_profile_button)
+
+        layout.addLayout(profile_layout)
+
         search_layout = QHBoxLayout()
         search_layout.setSpacing(10)
 
@@ -164,10 +250,12 @@ class ExtensionSettingsDialog(QDialog):
 
         layout.addLayout(search_layout)
 
-        self.mapping_table = QTableWidget()
-        self.mapping_table.setColumnCount(2)
-        self.mapping_table.setHorizontalHeaderLabels(["扩展名", "分类名称"])
+        self.mapping_table = QTableView()
+        self.mapping_table.setModel(self._proxy_model)
+        self.mapping_table.setSortingEnabled(True)
+        self.mapping_table.sortByColumn(ExtensionMappingModel.COLUMN_EXTENSION, Qt.SortOrder.AscendingOrder)
         self.mapping_table.horizontalHeader().setStretchLastSection(True)
+        self.mapping_table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
         self.mapping_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
         self.mapping_table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
         self.mapping_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
@@ -184,8 +272,8 @@ class ExtensionSettingsDialog(QDialog):
 
         ext_label = QLabel("扩展名:")
         self.ext_input = QLineEdit()
-        self.ext_input.setPlaceholderText("如: pdf")
-        self.ext_input.setMaximumWidth(100)
+        self.ext_input.setPlaceholderText("如: pdf、tar.gz")
+        self.ext_input.setMaximumWidth(120)
 
         category_label = QLabel("分类:")
         self.category_input = QLineEdit()
@@ -205,7 +293,7 @@ class ExtensionSettingsDialog(QDialog):
         button_layout = QHBoxLayout()
         button_layout.setSpacing(10)
 
-        self.default_button = QPushButton("加载默认")
+        self.default_button = QPushButton("重新加载")
         self.default_button.setObjectName("defaultButton")
 
         self.delete_button = QPushButton("删除选中")
@@ -227,7 +315,10 @@ class ExtensionSettingsDialog(QDialog):
 
     def _setup_connections(self):
         """设置信号连接"""
-        self.search_input.textChanged.connect(self._on_search_changed)
+        self.profile_combo.currentTextChanged.connect(self._on_profile_changed)
+        self.new_profile_button.clicked.connect(self._on_new_profile)
+        self.search_input.textChanged.connect(self._search_timer.start)
+        self._search_timer.timeout.connect(self._apply_search)
         self.add_button.clicked.connect(self._on_add_mapping)
         self.delete_button.clicked.connect(self._on_delete_mapping)
         self.save_button.clicked.connect(self._on_save)
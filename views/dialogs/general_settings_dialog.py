@@ -8,6 +8,7 @@ from PySide6.QtWidgets import (
     QLabel, QLineEdit, QPushButton, QCheckBox
 )
 
+from models.path_template import TEMPLATE_FIELDS
 from views.styles import GENERAL_SETTINGS_DIALOG_STYLE
 
 
@@ -23,8 +24,8 @@ class GeneralSettingsDialog(QDialog):
     def _setup_ui(self):
         """设置UI"""
         self.setWindowTitle("通用设置")
-        self.setMinimumSize(400, 280)
-        self.resize(450, 320)
+        self.setMinimumSize(400, 340)
+        self.resize(450, 380)
         self.setStyleSheet(GENERAL_SETTINGS_DIALOG_STYLE)
 
         layout = QVBoxLayout(self)
@@ -58,6 +59,23 @@ class GeneralSettingsDialog(QDialog):
         depth_layout.addStretch(1)
         layout.addLayout(depth_layout)
 
+        template_layout = QHBoxLayout()
+        template_layout.setSpacing(10)
+
+        template_label = QLabel("目录模板:")
+        template_layout.addWidget(template_label)
+
+        self.path_template_input = QLineEdit()
+        self.path_template_input.setPlaceholderText("{category}")
+        template_layout.addWidget(self.path_template_input, 1)
+        layout.addLayout(template_layout)
+
+        fields_text = "  ".join(f"{{{name}}} {desc}" for name, desc in TEMPLATE_FIELDS.items())
+        template_hint = QLabel(f"可用字段: {fields_text}")
+        template_hint.setWordWrap(True)
+        template_hint.setStyleSheet("color: #888888; font-size: 12px;")
+        layout.addWidget(template_hint)
+
         layout.addStretch(1)
 
         button_layout = QHBoxLayout()
@@ -128,3 +146,11 @@ class GeneralSettingsDialog(QDialog):
         self._updating_from_viewmodel = True
         self.depth_input.setText(str(value))
         self._updating_from_viewmodel = False
+
+    def get_path_template(self) -> str:
+        return self.path_template_input.text().strip()
+
+    def set_path_template(self, value: str):
+        self._updating_from_viewmodel = True
+        self.path_template_input.setText(value)
+        self._updating_from_viewmodel = False
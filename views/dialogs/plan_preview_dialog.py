@@ -0,0 +1,120 @@
+"""分类方案预览对话框"""
+
+from typing import Optional
+
+from PySide6.QtCore import Qt, Signal
+from PySide6.QtWidgets import (
+    QDialog, QWidget, QVBoxLayout, QHBoxLayout,
+    QLabel, QPushButton, QGroupBox, QFileDialog,
+    QTableWidget, QTableWidgetItem, QAbstractItemView
+)
+
+from models.classification_plan import ClassificationPlan
+from utils.file_utils import format_file_size
+from views.styles import PLAN_PREVIEW_DIALOG_STYLE
+
+
+class PlanPreviewDialog(QDialog):
+    """分类方案预览对话框，确认后由调用方执行同一方案"""
+
+    export_requested = Signal(str)
+
+    def __init__(self, plan: ClassificationPlan, parent: Optional[QWidget] = None):
+        super().__init__(parent)
+        self._plan = plan
+        self._setup_ui()
+        self._setup_connections()
+        self._show_summary()
+
+    @property
+    def plan(self) -> ClassificationPlan:
+        return self._plan
+
+    def _setup_ui(self):
+        """设置UI"""
+        self.setWindowTitle("分类预览")
+        self.setMinimumSize(500, 420)
+        self.resize(600, 500)
+        self.setStyleSheet(PLAN_PREVIEW_DIALOG_STYLE)
+
+        layout = QVBoxLayout(self)
+        layout.setSpacing(12)
+        layout.setContentsMargins(20, 20, 20, 20)
+
+        self.summary_label = QLabel()
+        self.summary_label.setWordWrap(True)
+        layout.addWidget(self.summary_label)
+
+        group = QGroupBox("分类统计")
+        group_layout = QVBoxLayout(group)
+
+        self.category_table = QTableWidget()
+        self.category_table.setColumnCount(3)
+        self.category_table.setHorizontalHeaderLabels(["分类", "文件数", "大小"])
+        self.category_table.horizontalHeader().setStretchLastSection(True)
+        self.category_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.category_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        group_layout.addWidget(self.category_table)
+
+        layout.addWidget(group)
+
+        button_layout = QHBoxLayout()
+        button_layout.setSpacing(10)
+
+        self.export_button = QPushButton("导出方案...")
+        self.export_button.setObjectName("exportButton")
+
+        self.cancel_button = QPushButton("关闭")
+        self.cancel_button.setObjectName("cancelButton")
+
+        self.execute_button = QPushButton("执行分类")
+        self.execute_button.setObjectName("executeButton")
+
+        button_layout.addWidget(self.export_button)
+        button_layout.addStretch(1)
+        button_layout.addWidget(self.cancel_button)
+        button_layout.addWidget(self.execute_button)
+
+        layout.addLayout(button_layout)
+
+    def _setup_connections(self):
+        """设置信号连接"""
+        self.cancel_button.clicked.connect(self.reject)
+        self.execute_button.clicked.connect(self.accept)
+        self.export_button.clicked.connect(self._on_export)
+
+    def _on_export(self):
+        """选择保存位置并请求导出方案"""
+        plan_file, _ = QFileDialog.getSaveFileName(
+            self,
+            "导出分类方案",
+            "classification_plan.jsonl",
+            "分类方案 (*.jsonl);;所有文件 (*)"
+        )
+        if plan_file:
+            self.export_requested.emit(plan_file)
+
+    def _show_summary(self):
+        """显示方案摘要"""
+        summary = self._plan.get_summary()
+
+        self.summary_label.setText(
+            f"共 {summary['total_files']} 个文件，将处理 {summary['planned_count']} 个"
+            f"（{format_file_size(summary['total_bytes'])}），"
+            f"重名改名 {summary['conflict_count']} 个，"
+            f"无法分类 {summary['failed_count']} 个，跳过 {summary['skipped_count']} 个"
+        )
+
+        categories = sorted(summary["categories"].items(), key=lambda item: item[1]["bytes"], reverse=True)
+        self.category_table.setRowCount(len(categories))
+        for row, (category, stats) in enumerate(categories):
+            count_item = QTableWidgetItem(str(stats["count"]))
+            count_item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+            size_item = QTableWidgetItem(format_file_size(stats["bytes"]))
+            size_item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+
+            self.category_table.setItem(row, 0, QTableWidgetItem(category))
+            self.category_table.setItem(row, 1, count_item)
+            self.category_table.setItem(row, 2, size_item)
+
+        self.execute_button.setEnabled(summary["planned_count"] > 0)
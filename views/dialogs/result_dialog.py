@@ -2,27 +2,37 @@
 
 from typing import Optional
 
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
 from PySide6.QtWidgets import (
-    QDialog, QWidget, QVBoxLayout, QGroupBox,
-    QListWidget, QListWidgetItem, QPushButton
+    QDialog, QWidget, QVBoxLayout, QHBoxLayout, QGroupBox,
+    QTableView, QHeaderView, QAbstractItemView, QLineEdit,
+    QCheckBox, QLabel, QPushButton
 )
 
+from models.failures import count_failures, format_failure_counts, format_failure_targets
 from views.styles import RESULT_DIALOG_STYLE
+from views.widgets import ResultTableModel
 
 
 class ResultDialog(QDialog):
     """分类结果对话框"""
 
+    SEARCH_DELAY_MS = 250
+
     def __init__(self, parent: Optional[QWidget] = None):
         super().__init__(parent)
+        self._model = ResultTableModel(self)
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(self.SEARCH_DELAY_MS)
         self._setup_ui()
+        self._setup_connections()
 
     def _setup_ui(self):
         """设置UI"""
         self.setWindowTitle("分类结果")
         self.setMinimumSize(500, 400)
-        self.resize(600, 500)
+        self.resize(700, 500)
         self.setStyleSheet(RESULT_DIALOG_STYLE)
 
         layout = QVBoxLayout(self)
@@ -35,37 +45,104 @@ class ResultDialog(QDialog):
         group_layout = QVBoxLayout(group)
         group_layout.setSpacing(10)
 
-        self.result_list = QListWidget()
-        group_layout.addWidget(self.result_list)
+        filter_layout = QHBoxLayout()
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("搜索文件名、分类或错误...")
+        self.search_input.setClearButtonEnabled(True)
+        self.failures_only_checkbox = QCheckBox("仅显示失败")
+        filter_layout.addWidget(self.search_input, 1)
+        filter_layout.addWidget(self.failures_only_checkbox)
+        group_layout.addLayout(filter_layout)
+
+        self.source_label = QLabel()
+        self.source_label.setObjectName("countLabel")
+        self.source_label.setWordWrap(True)
+        self.source_label.setVisible(False)
+        group_layout.addWidget(self.source_label)
+
+        self.failure_label = QLabel()
+        self.failure_label.setObjectName("countLabel")
+        self.failure_label.setWordWrap(True)
+        self.failure_label.setVisible(False)
+        group_layout.addWidget(self.failure_label)
+
+        self.result_table = QTableView()
+        self.result_table.setModel(self._model)
+        self.result_table.setSortingEnabled(True)
+        self.result_table.sortByColumn(-1, Qt.SortOrder.AscendingOrder)
+        self.result_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.result_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.result_table.setTextElideMode(Qt.TextElideMode.ElideMiddle)
+        self.result_table.setWordWrap(False)
+
+        # 固定行高和列宽，视图无需逐行测量内容
+        vertical_header = self.result_table.verticalHeader()
+        vertical_header.setVisible(False)
+        vertical_header.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        vertical_header.setDefaultSectionSize(28)
+
+        horizontal_header = self.result_table.horizontalHeader()
+        horizontal_header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        horizontal_header.setStretchLastSection(True)
+        self.result_table.setColumnWidth(ResultTableModel.COLUMN_STATUS, 50)
+        self.result_table.setColumnWidth(ResultTableModel.COLUMN_FILE, 260)
+        self.result_table.setColumnWidth(ResultTableModel.COLUMN_CATEGORY, 140)
+        group_layout.addWidget(self.result_table)
+
+        self.count_label = QLabel()
+        self.count_label.setObjectName("countLabel")
+        group_layout.addWidget(self.count_label)
 
         close_button = QPushButton("关闭")
         close_button.clicked.connect(self.accept)
         layout.addWidget(close_button, 0, Qt.AlignmentFlag.AlignCenter)
 
+    def _setup_connections(self):
+        """设置信号连接"""
+        self.search_input.textChanged.connect(self._search_timer.start)
+        self._search_timer.timeout.connect(self._apply_search)
+        self.failures_only_checkbox.toggled.connect(self._on_failures_only_toggled)
+
+    def _apply_search(self):
+        """输入停止后再过滤，避免每个按键都遍历全部结果"""
+        self._model.set_search_text(self.search_input.text())
+        self._update_count_label()
+
+    def _on_failures_only_toggled(self, checked: bool):
+        self._model.set_failures_only(checked)
+        self._update_count_label()
+
+    def _update_count_label(self):
+        """显示过滤后的结果数量"""
+        self.count_label.setText(f"显示 {self._model.visible_count} / {self._model.total_count} 条")
+
     def set_results(self, success_files: list, failed_files: list):
-        """设置分类结果"""
-        self.result_list.clear()
-
-        for success_file in success_files:
-            item = QListWidgetItem()
-            file_name = success_file.get("file_name", "未知文件")
-            max_length = 40
-            if len(file_name) > max_length:
-                file_name = file_name[:max_length - 3] + "..."
-            category = success_file.get("category", "未知分类")
-            item.setText(f"✓ {file_name} → {category}")
-            self.result_list.addItem(item)
-
-        for failed_file in failed_files:
-            item = QListWidgetItem()
-            file_name = failed_file.get("file_name", "未知文件")
-            max_length = 40
-            if len(file_name) > max_length:
-                file_name = file_name[:max_length - 3] + "..."
-            error = failed_file.get("error", "未知错误")
-            item.setText(f"✗ {file_name} - {error}")
-            self.result_list.addItem(item)
+        """设置分类结果，有失败时按错误类别和目标分类显示失败数量"""
+        self._model.set_results(success_files, failed_files)
+        self._update_count_label()
+        failure_counts = count_failures(failed_files)
+        lines = []
+        failure_text = format_failure_counts(failure_counts)
+        if failure_text:
+            lines.append(f"失败原因：{failure_text}")
+        target_text = format_failure_targets(failure_counts)
+        if target_text:
+            lines.append(f"失败的分类：{target_text}")
+        self.failure_label.setText("\n".join(lines))
+        self.failure_label.setVisible(bool(lines))
+
+    def set_source_breakdown(self, breakdown: list):
+        """显示多个源文件夹各自的处理结果，只有一个源文件夹时隐藏"""
+        lines = [
+            f"{item['source_folder']}：共 {item['total_files']} 个，成功 {item['success_count']} 个，"
+            f"失败 {item['failed_count']} 个"
+            + (f"，未处理 {item['unprocessed_count']} 个" if item.get("unprocessed_count") else "")
+            for item in breakdown
+        ]
+        self.source_label.setText("\n".join(lines))
+        self.source_label.setVisible(bool(lines))
 
     def clear_results(self):
         """清空结果"""
-        self.result_list.clear()
+        self.set_results([], [])
+        self.set_source_breakdown([])
@@ -1,22 +1,27 @@
 """文件分类器主窗口视图层"""
 
+import time
 from typing import Optional
 
-from PySide6.QtCore import Slot
+from PySide6.QtCore import QTimer, Slot
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QGroupBox, QLabel, QLineEdit, QPushButton,
     QRadioButton, QProgressBar, QMessageBox, QFileDialog,
-    QDialog
+    QDialog, QComboBox
 )
 from PySide6.QtCore import Qt
 
+from models.progress import PHASE_NAMES, ProgressSnapshot, format_duration
+from utils.file_utils import format_file_size
+from utils.path_utils import SOURCE_FOLDER_SEPARATOR, split_source_folders
 from viewmodels.file_classifier_viewmodel import FileClassifierViewModel
 from .dialogs import (
     ResultDialog,
     GeneralSettingsDialog,
     ExtensionSettingsDialog,
     DelimiterSettingsDialog,
+    PlanPreviewDialog,
 )
 
 
@@ -40,6 +45,40 @@ class FileClassifierWindow(QMainWindow):
     @viewmodel.setter
     def viewmodel(self, value: FileClassifierViewModel):
         self._viewmodel = value
+        self._add_plugin_mode_radios()
+        self._refresh_profile_combo()
+        QTimer.singleShot(0, self._check_interrupted_jobs)
+
+    def _check_interrupted_jobs(self):
+        """上次退出时有被中断的队列任务时询问是否继续"""
+        if not self._viewmodel or not self._viewmodel.interrupted_job_count:
+            return
+
+        reply = QMessageBox.question(
+            self,
+            "继续任务",
+            f"上次退出时有 {self._viewmodel.interrupted_job_count} 个队列任务未完成。\n"
+            "是否继续？继续时从中断处执行，已复制的文件不会重复复制；选择“否”将放弃这些任务，已复制的文件保留。",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if reply == QMessageBox.StandardButton.Yes:
+            self._viewmodel.resume_interrupted_jobs()
+        else:
+            self._viewmodel.discard_interrupted_jobs()
+
+    def _add_plugin_mode_radios(self):
+        """为插件分类器添加分类方式选项"""
+        if not self._viewmodel:
+            return
+
+        for name in self._viewmodel.classifier_names[len(self._mode_radios):]:
+            radio = QRadioButton(self._viewmodel.get_classifier_display_name(name))
+            radio.toggled.connect(self._on_mode_changed)
+            self._mode_layout.insertWidget(self._mode_layout.indexOf(self._mode_radios[-1]) + 1, radio)
+            self._mode_radios.append(radio)
+
+        if self._viewmodel.plugin_errors:
+            self.status_label.setText("；".join(self._viewmodel.plugin_errors))
 
     def _setup_ui(self):
         """设置UI"""
@@ -82,14 +121,17 @@ class FileClassifierWindow(QMainWindow):
 
         source_label = QLabel("源文件夹:")
         self.source_path_edit = QLineEdit()
-        self.source_path_edit.setPlaceholderText("选择要分类的文件夹...")
-        self.source_path_edit.setReadOnly(True)
+        self.source_path_edit.setPlaceholderText("选择要分类的文件夹，多个文件夹用 ; 分隔...")
         self.browse_source_button = QPushButton("浏览...")
         self.browse_source_button.setObjectName("browseButton")
+        self.add_source_button = QPushButton("添加")
+        self.add_source_button.setObjectName("browseButton")
+        self.add_source_button.setToolTip("再添加一个源文件夹，多个源文件夹会一起扫描并合并分类")
 
         source_layout.addWidget(source_label)
         source_layout.addWidget(self.source_path_edit, 1)
         source_layout.addWidget(self.browse_source_button)
+        source_layout.addWidget(self.add_source_button)
 
         target_layout = QHBoxLayout()
         target_layout.setSpacing(10)
@@ -122,14 +164,26 @@ class FileClassifierWindow(QMainWindow):
         self.extension_radio.setChecked(True)
         self.extension_radio.setObjectName("extensionRadio")
 
+        self.profile_combo = QComboBox()
+        self.profile_combo.setObjectName("profileCombo")
+        self.profile_combo.setToolTip("扩展名配置方案")
+
         self.delimiter_radio = QRadioButton("按分隔符分类")
         self.delimiter_radio.setObjectName("delimiterRadio")
 
+        self.date_radio = QRadioButton("按日期分类")
+        self.date_radio.setObjectName("dateRadio")
+
         self.settings_button = QPushButton("分类设置")
         self.settings_button.setObjectName("actionButton")
 
+        self._mode_radios = [self.extension_radio, self.delimiter_radio, self.date_radio]
+        self._mode_layout = layout
+
         layout.addWidget(self.extension_radio)
+        layout.addWidget(self.profile_combo)
         layout.addWidget(self.delimiter_radio)
+        layout.addWidget(self.date_radio)
         layout.addStretch(1)
         layout.addWidget(self.settings_button)
 
@@ -150,14 +204,41 @@ class FileClassifierWindow(QMainWindow):
         self.reset_button = QPushButton("重置")
         self.reset_button.setObjectName("resetButton")
 
+        self.undo_button = QPushButton("撤销")
+        self.undo_button.setObjectName("resetButton")
+        self.undo_button.setToolTip("撤销最近一次分类：移回或删除分类后的文件")
+
+        self.plan_file_button = QPushButton("执行方案")
+        self.plan_file_button.setObjectName("previewButton")
+
+        self.preview_button = QPushButton("预览")
+        self.preview_button.setObjectName("previewButton")
+
+        self.queue_button = QPushButton("加入队列")
+        self.queue_button.setObjectName("previewButton")
+
         self.start_button = QPushButton("开始分类")
         self.start_button.setObjectName("startButton")
 
+        self.pause_button = QPushButton("暂停")
+        self.pause_button.setObjectName("pauseButton")
+        self.pause_button.setVisible(False)
+
+        self.cancel_button = QPushButton("取消")
+        self.cancel_button.setObjectName("resetButton")
+        self.cancel_button.setVisible(False)
+
         layout.addStretch(1)
         layout.addWidget(self.general_settings_button)
         layout.addWidget(self.result_button)
         layout.addWidget(self.reset_button)
+        layout.addWidget(self.undo_button)
+        layout.addWidget(self.plan_file_button)
+        layout.addWidget(self.preview_button)
+        layout.addWidget(self.queue_button)
         layout.addWidget(self.start_button)
+        layout.addWidget(self.pause_button)
+        layout.addWidget(self.cancel_button)
         layout.addStretch(1)
 
         parent_layout.addLayout(layout)
@@ -173,19 +254,58 @@ class FileClassifierWindow(QMainWindow):
         self.status_label.setObjectName("statusLabel")
         self.status_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
+        stats_layout = QHBoxLayout()
+        stats_layout.setSpacing(16)
+        self.phase_stat_label = QLabel()
+        self.speed_stat_label = QLabel()
+        self.remaining_stat_label = QLabel()
+        self.eta_stat_label = QLabel()
+        self.failed_stat_label = QLabel()
+        stats_layout.addStretch(1)
+        for label in (
+            self.phase_stat_label,
+            self.speed_stat_label,
+            self.remaining_stat_label,
+            self.eta_stat_label,
+            self.failed_stat_label
+        ):
+            label.setObjectName("statsLabel")
+            stats_layout.addWidget(label)
+        stats_layout.addStretch(1)
+        self._reset_stats()
+
         parent_layout.addWidget(self.progress_bar)
+        parent_layout.addLayout(stats_layout)
         parent_layout.addWidget(self.status_label)
 
+    def _reset_stats(self):
+        """重置统计面板"""
+        self.phase_stat_label.setText("阶段: -")
+        self.speed_stat_label.setText("速度: -")
+        self.remaining_stat_label.setText("剩余: -")
+        self.eta_stat_label.setText("预计: -")
+        self.failed_stat_label.setText("失败: 0")
+
     def _setup_connections(self):
         """设置信号槽连接"""
         self.browse_source_button.clicked.connect(self._on_browse_source)
+        self.add_source_button.clicked.connect(self._on_add_source)
         self.browse_target_button.clicked.connect(self._on_browse_target)
         self.extension_radio.toggled.connect(self._on_mode_changed)
+        self.profile_combo.currentTextChanged.connect(self._on_profile_selected)
+        self.delimiter_radio.toggled.connect(self._on_mode_changed)
+        self.date_radio.toggled.connect(self._on_mode_changed)
         self.settings_button.clicked.connect(self._on_open_settings)
         self.general_settings_button.clicked.connect(self._on_open_general_settings)
         self.result_button.clicked.connect(self._on_show_result)
         self.start_button.clicked.connect(self._on_start)
+        self.preview_button.clicked.connect(self._on_preview)
+        self.queue_button.clicked.connect(self._on_enqueue)
+        self.plan_file_button.clicked.connect(self._on_execute_plan_file)
         self.reset_button.clicked.connect(self._on_reset)
+        self.undo_button.clicked.connect(self._on_undo)
+        self.pause_button.clicked.connect(self._on_pause)
+        self.cancel_button.clicked.connect(self._on_cancel)
 
     @Slot()
     def _on_browse_source(self):
@@ -199,6 +319,23 @@ class FileClassifierWindow(QMainWindow):
         if folder:
             self.source_path_edit.setText(folder)
 
+    @Slot()
+    def _on_add_source(self):
+        """追加一个源文件夹"""
+        folder = QFileDialog.getExistingDirectory(
+            self,
+            "添加源文件夹",
+            "",
+            QFileDialog.Option.ShowDirsOnly
+        )
+        if not folder:
+            return
+
+        folders = split_source_folders(self.source_path_edit.text())
+        if folder not in folders:
+            folders.append(folder)
+        self.source_path_edit.setText(f"{SOURCE_FOLDER_SEPARATOR} ".join(folders))
+
     @Slot()
     def _on_browse_target(self):
         """浏览选择目标文件夹"""
@@ -214,9 +351,39 @@ class FileClassifierWindow(QMainWindow):
     @Slot(bool)
     def _on_mode_changed(self, checked: bool):
         """分类方式改变"""
-        is_extension_mode = self.extension_radio.isChecked()
-        if self._viewmodel:
-            self._viewmodel.classification_mode = 0 if is_extension_mode else 1
+        if not self._viewmodel:
+            return
+
+        for mode, radio in enumerate(self._mode_radios):
+            if radio.isChecked():
+                self._viewmodel.classification_mode = mode
+                break
+        self.profile_combo.setEnabled(self.extension_radio.isChecked())
+
+    def _refresh_profile_combo(self):
+        """用 ViewModel 中的方案列表重建扩展名配置方案下拉框"""
+        if not self._viewmodel:
+            return
+
+        self.profile_combo.blockSignals(True)
+        self.profile_combo.clear()
+        self.profile_combo.addItems(self._viewmodel.extension_profiles)
+        self.profile_combo.setCurrentText(self._viewmodel.extension_profile)
+        self.profile_combo.blockSignals(False)
+
+    @Slot(str)
+    def _on_profile_selected(self, profile: str):
+        """切换扩展名配置方案"""
+        if not self._viewmodel or not profile or profile == self._viewmodel.extension_profile:
+            return
+
+        if not self._viewmodel.select_extension_profile(profile):
+            self._refresh_profile_combo()
+
+    @Slot(str)
+    def _on_extension_profile_changed(self, profile: str):
+        """ViewModel 的配置方案改变"""
+        self._refresh_profile_combo()
 
     @Slot()
     def _on_open_settings(self):
@@ -224,15 +391,24 @@ class FileClassifierWindow(QMainWindow):
         if not self._viewmodel:
             return
 
-        is_extension_mode = self.extension_radio.isChecked()
-
-        if is_extension_mode:
-            dialog = ExtensionSettingsDialog(self)
+        if self.extension_radio.isChecked():
+            dialog = ExtensionSettingsDialog(self, profile=self._viewmodel.extension_profile)
 
             if dialog.exec() == QDialog.DialogCode.Accepted:
-                self._viewmodel.extension_map_json = dialog.get_extension_map_json()
+                self._viewmodel.select_extension_profile(dialog.get_profile())
+        elif self.date_radio.isChecked():
+            QMessageBox.information(
+                self,
+                "日期分类",
+                "按拍摄日期分类到 年/月 文件夹。\n"
+                "照片读取 EXIF 拍摄时间，视频读取 MP4/MOV 创建时间，无法读取时使用文件修改时间。"
+            )
+        elif not self.delimiter_radio.isChecked():
+            QMessageBox.information(self, "插件分类器", "插件分类器没有可配置的设置")
         else:
             dialog = DelimiterSettingsDialog(self)
+            source_folders = split_source_folders(self.source_path_edit.text())
+            dialog.set_source_folder(source_folders[0] if source_folders else "")
             dialog.set_delimiter_start(self._viewmodel.delimiter_start)
             dialog.set_delimiter_end(self._viewmodel.delimiter_end)
             dialog.set_delimiter_start_pos(self._viewmodel.delimiter_start_pos)
@@ -255,12 +431,14 @@ class FileClassifierWindow(QMainWindow):
         dialog.set_scan_subfolder(self._viewmodel.scan_subfolder)
         dialog.set_specify_depth(self._viewmodel.specify_depth)
         dialog.set_depth(self._viewmodel.scan_depth)
+        dialog.set_path_template(self._viewmodel.path_template)
 
         if dialog.exec() == QDialog.DialogCode.Accepted:
             self._viewmodel.delete_source = dialog.get_delete_source()
             self._viewmodel.scan_subfolder = dialog.get_scan_subfolder()
             self._viewmodel.specify_depth = dialog.get_specify_depth()
             self._viewmodel.scan_depth = dialog.get_depth()
+            self._viewmodel.path_template = dialog.get_path_template()
 
     @Slot()
     def _on_show_result(self):
@@ -274,6 +452,7 @@ class FileClassifierWindow(QMainWindow):
                 success_files = result.get("success_files", [])
                 failed_files = result.get("failed_files", [])
                 self._result_dialog.set_results(success_files, failed_files)
+                self._result_dialog.set_source_breakdown(result.get("source_breakdown", []))
 
         self._result_dialog.show()
 
@@ -285,6 +464,117 @@ class FileClassifierWindow(QMainWindow):
             self._viewmodel.target_folder = self.target_path_edit.text()
             self._viewmodel.start_classification()
 
+    @Slot()
+    def _on_preview(self):
+        """预览分类方案"""
+        if self._viewmodel:
+            self._viewmodel.source_folder = self.source_path_edit.text()
+            self._viewmodel.target_folder = self.target_path_edit.text()
+            self._viewmodel.start_preview()
+
+    @Slot()
+    def _on_pause(self):
+        """暂停或继续当前任务"""
+        if not self._viewmodel:
+            return
+        if self.pause_button.text() == "暂停":
+            self._viewmodel.pause_classification()
+        else:
+            self._viewmodel.resume_classification()
+
+    @Slot()
+    def _on_cancel(self):
+        """取消当前任务"""
+        if self._viewmodel:
+            self.cancel_button.setEnabled(False)
+            self._viewmodel.cancel_classification()
+
+    @Slot(bool)
+    def _on_paused_changed(self, paused: bool):
+        """任务暂停状态改变"""
+        self.pause_button.setText("继续" if paused else "暂停")
+
+    def _set_job_controls_visible(self, visible: bool):
+        """显示或隐藏运行中任务的控制按钮"""
+        self.pause_button.setText("暂停")
+        self.pause_button.setVisible(visible)
+        self.cancel_button.setEnabled(True)
+        self.cancel_button.setVisible(visible)
+
+    @Slot()
+    def _on_enqueue(self):
+        """以当前设置加入任务队列"""
+        if self._viewmodel:
+            self._viewmodel.source_folder = self.source_path_edit.text()
+            self._viewmodel.target_folder = self.target_path_edit.text()
+            self._viewmodel.enqueue_classification()
+
+    @Slot(object)
+    def _on_plan_ready(self, plan):
+        """分类方案生成完成"""
+        self.start_button.setEnabled(True)
+        self.preview_button.setEnabled(True)
+        self._set_job_controls_visible(False)
+        self.status_label.setText("预览完成")
+
+        dialog = PlanPreviewDialog(plan, self)
+        dialog.export_requested.connect(lambda plan_file: self._on_export_plan(plan, plan_file))
+        if dialog.exec() == QDialog.DialogCode.Accepted and self._viewmodel:
+            self._viewmodel.execute_plan(plan)
+
+    def _on_export_plan(self, plan, plan_file: str):
+        """导出分类方案文件"""
+        if not self._viewmodel:
+            return
+
+        success, error_msg = self._viewmodel.export_plan(plan, plan_file)
+        if success:
+            QMessageBox.information(self, "导出成功", f"分类方案已导出到:\n{plan_file}")
+        else:
+            QMessageBox.warning(self, "导出失败", error_msg)
+
+    @Slot()
+    def _on_execute_plan_file(self):
+        """选择并执行方案文件"""
+        if not self._viewmodel:
+            return
+
+        plan_file, _ = QFileDialog.getOpenFileName(
+            self,
+            "选择分类方案",
+            "",
+            "分类方案 (*.jsonl);;所有文件 (*)"
+        )
+        if plan_file:
+            self._viewmodel.execute_plan_file(plan_file)
+
+    @Slot()
+    def _on_undo(self):
+        """确认后撤销最近一次分类"""
+        if not self._viewmodel:
+            return
+
+        run, error = self._viewmodel.latest_undoable_run()
+        if error:
+            QMessageBox.warning(self, "撤销", error)
+            return
+        if run is None:
+            QMessageBox.information(self, "撤销", "没有可撤销的分类")
+            return
+
+        started_at = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(run["created_at"]))
+        reply = QMessageBox.question(
+            self,
+            "确认撤销",
+            f"确定要撤销 {started_at} 的分类吗？\n"
+            f"目标文件夹: {run['target_dir']}\n"
+            f"共 {run['file_count']} 个文件，移动过的文件将移回原位置，复制的文件将被删除。\n"
+            "分类后被修改过的文件不会被撤销。",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if reply == QMessageBox.StandardButton.Yes:
+            self._viewmodel.undo_run(run["journal_path"])
+
     @Slot()
     def _on_reset(self):
         """重置设置"""
@@ -305,6 +595,21 @@ class FileClassifierWindow(QMainWindow):
         self.progress_bar.setValue(value)
         self.status_label.setText(message)
 
+    @Slot(object)
+    def _on_metrics_updated(self, snapshot: ProgressSnapshot):
+        """刷新统计面板"""
+        self.phase_stat_label.setText(f"阶段: {PHASE_NAMES.get(snapshot.phase, snapshot.phase)}")
+        self.speed_stat_label.setText(
+            f"速度: {snapshot.files_per_second:.0f} 个/秒，{format_file_size(int(snapshot.bytes_per_second))}/秒"
+        )
+        if snapshot.bytes_total > 0:
+            self.remaining_stat_label.setText(f"剩余: {format_file_size(snapshot.bytes_remaining)}")
+        else:
+            self.remaining_stat_label.setText(f"剩余: {max(0, snapshot.total - snapshot.processed)} 个")
+        eta = snapshot.eta
+        self.eta_stat_label.setText(f"预计: {format_duration(eta)}" if eta is not None else "预计: -")
+        self.failed_stat_label.setText(f"失败: {snapshot.failed_count}")
+
     @Slot(str)
     def _on_status_changed(self, status: str):
         """状态改变"""
@@ -314,7 +619,10 @@ class FileClassifierWindow(QMainWindow):
     def _on_classification_started(self):
         """分类开始"""
         self.progress_bar.setValue(0)
+        self._reset_stats()
         self.start_button.setEnabled(False)
+        self.preview_button.setEnabled(False)
+        self._set_job_controls_visible(True)
         self.status_label.setText("正在分类...")
 
     @Slot(dict)
@@ -322,12 +630,25 @@ class FileClassifierWindow(QMainWindow):
         """分类完成"""
         self.progress_bar.setValue(100)
         self.start_button.setEnabled(True)
+        self.preview_button.setEnabled(True)
+        self._set_job_controls_visible(False)
 
         success_count = result.get("success_count", 0)
         failed_count = result.get("failed_count", 0)
         total_files = result.get("total_files", 0)
 
-        self.status_label.setText(f"分类完成！共 {total_files} 个文件，成功: {success_count} 个，失败: {failed_count} 个")
+        if result.get("cancelled"):
+            unprocessed_count = len(result.get("unprocessed_files", []))
+            self.status_label.setText(
+                f"已取消！成功: {success_count} 个，失败: {failed_count} 个，未处理: {unprocessed_count} 个"
+            )
+        elif result.get("undone_journal"):
+            self.status_label.setText(f"撤销完成！共 {total_files} 个文件，成功: {success_count} 个，失败: {failed_count} 个")
+        else:
+            self.status_label.setText(f"分类完成！共 {total_files} 个文件，成功: {success_count} 个，失败: {failed_count} 个")
+
+        if result.get("journal_error"):
+            QMessageBox.warning(self, "运行日志", result["journal_error"])
 
         if self._result_dialog is None:
             self._result_dialog = ResultDialog(self)
@@ -335,11 +656,19 @@ class FileClassifierWindow(QMainWindow):
         success_files = result.get("success_files", [])
         failed_files = result.get("failed_files", [])
         self._result_dialog.set_results(success_files, failed_files)
+        self._result_dialog.set_source_breakdown(result.get("source_breakdown", []))
         self._result_dialog.show()
 
     @Slot(str)
-    def _on_error_occurred(self, error: str):
-        """发生错误"""
+    def _on_classification_failed(self, error: str):
+        """分类任务失败"""
         self.start_button.setEnabled(True)
+        self.preview_button.setEnabled(True)
+        self._set_job_controls_visible(False)
         self.status_label.setText("发生错误")
         QMessageBox.critical(self, "错误", error)
+
+    @Slot(str)
+    def _on_error_occurred(self, error: str):
+        """发生与运行中任务无关的错误，只提示，不改变任务控制按钮和状态"""
+        QMessageBox.critical(self, "错误", error)
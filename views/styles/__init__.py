@@ -5,6 +5,7 @@ from .common_styles import (
     GENERAL_SETTINGS_DIALOG_STYLE,
     EXTENSION_SETTINGS_DIALOG_STYLE,
     DELIMITER_SETTINGS_DIALOG_STYLE,
+    PLAN_PREVIEW_DIALOG_STYLE,
     get_dialog_style,
     get_button_style,
     get_input_style,
@@ -20,6 +21,7 @@ __all__ = [
     "GENERAL_SETTINGS_DIALOG_STYLE",
     "EXTENSION_SETTINGS_DIALOG_STYLE",
     "DELIMITER_SETTINGS_DIALOG_STYLE",
+    "PLAN_PREVIEW_DIALOG_STYLE",
     "get_dialog_style",
     "get_button_style",
     "get_input_style",
@@ -264,13 +264,13 @@ def get_list_style() -> str:
 
 def get_table_style() -> str:
     return f"""
-    QTableWidget {{
+    QTableView {{
         {TABLE_STYLE}
     }}
-    QTableWidget::item {{
+    QTableView::item {{
         {TABLE_ITEM_STYLE}
     }}
-    QTableWidget::item:selected {{
+    QTableView::item:selected {{
         {TABLE_ITEM_SELECTED_STYLE}
     }}
     QHeaderView::section {{
@@ -304,7 +304,18 @@ def get_combobox_style() -> str:
 RESULT_DIALOG_STYLE = f"""
 {DIALOG_BASE_STYLE}
 {get_groupbox_style()}
-{get_list_style()}
+{get_checkbox_style()}
+QLineEdit {{
+    {INPUT_STYLE}
+}}
+QLineEdit:focus {{
+    {INPUT_FOCUS_STYLE}
+}}
+{get_table_style()}
+QLabel#countLabel {{
+    color: #777777;
+    font-size: 12px;
+}}
 QPushButton {{
     {BUTTON_PRIMARY_STYLE}
 }}
@@ -357,6 +368,7 @@ QLineEdit {{
 QLineEdit:focus {{
     {INPUT_FOCUS_STYLE}
 }}
+{get_combobox_style()}
 {get_table_style()}
 {get_groupbox_style()}
 QPushButton {{
@@ -410,6 +422,7 @@ QLineEdit:focus {{
     {INPUT_FOCUS_STYLE}
 }}
 {get_checkbox_style()}
+{get_table_style()}
 QPushButton {{
     {BUTTON_PRIMARY_STYLE}
 }}
@@ -430,3 +443,33 @@ QPushButton#cancelButton:hover {{
 }}
 {get_combobox_style()}
 """
+
+PLAN_PREVIEW_DIALOG_STYLE = f"""
+{DIALOG_BASE_STYLE}
+{get_table_style()}
+{get_groupbox_style()}
+QPushButton {{
+    {BUTTON_PRIMARY_STYLE}
+}}
+QPushButton:hover {{
+    {BUTTON_PRIMARY_HOVER_STYLE}
+}}
+QPushButton#exportButton {{
+    {BUTTON_DEFAULT_STYLE}
+}}
+QPushButton#exportButton:hover {{
+    {BUTTON_DEFAULT_HOVER_STYLE}
+}}
+QPushButton#executeButton {{
+    {BUTTON_SUCCESS_STYLE}
+}}
+QPushButton#executeButton:hover {{
+    {BUTTON_SUCCESS_HOVER_STYLE}
+}}
+QPushButton#cancelButton {{
+    {BUTTON_CANCEL_STYLE}
+}}
+QPushButton#cancelButton:hover {{
+    {BUTTON_CANCEL_HOVER_STYLE}
+}}
+"""
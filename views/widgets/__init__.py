@@ -1 +1,6 @@
 """自定义控件模块"""
+
+from .extension_mapping_model import ExtensionMappingModel
+from .result_table_model import ResultTableModel
+
+__all__ = ["ExtensionMappingModel", "ResultTableModel"]
@@ -0,0 +1,90 @@
+"""扩展名映射表格模型"""
+
+import bisect
+from typing import Optional
+
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, QObject, Qt
+
+
+class ExtensionMappingModel(QAbstractTableModel):
+    """
+    扩展名映射表格模型
+
+    行按扩展名排序保存，添加、修改和删除只通知受影响的行，不重建整个表格。
+    """
+
+    COLUMN_EXTENSION = 0
+    COLUMN_CATEGORY = 1
+
+    HEADERS = ["扩展名", "分类名称"]
+
+    def __init__(self, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self._extensions: list[str] = []
+        self._categories: list[str] = []
+
+    def set_mappings(self, mappings: dict):
+        """设置全部映射"""
+        self.beginResetModel()
+        self._extensions = sorted(mappings)
+        self._categories = [mappings[ext] for ext in self._extensions]
+        self.endResetModel()
+
+    def extension_at(self, row: int) -> str:
+        """获取指定行的扩展名"""
+        return self._extensions[row]
+
+    def _find_row(self, extension: str) -> int:
+        """查找扩展名所在行，不存在时返回-1"""
+        row = bisect.bisect_left(self._extensions, extension)
+        if row < len(self._extensions) and self._extensions[row] == extension:
+            return row
+        return -1
+
+    def set_mapping(self, extension: str, category: str):
+        """添加或修改单条映射"""
+        row = self._find_row(extension)
+        if row >= 0:
+            self._categories[row] = category
+            index = self.index(row, self.COLUMN_CATEGORY)
+            self.dataChanged.emit(index, index)
+            return
+
+        row = bisect.bisect_left(self._extensions, extension)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._extensions.insert(row, extension)
+        self._categories.insert(row, category)
+        self.endInsertRows()
+
+    def remove_mapping(self, extension: str):
+        """删除单条映射"""
+        row = self._find_row(extension)
+        if row < 0:
+            return
+
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._extensions[row]
+        del self._categories[row]
+        self.endRemoveRows()
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self._extensions)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self.HEADERS)
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if index.column() == self.COLUMN_EXTENSION:
+            return self._extensions[index.row()]
+        return self._categories[index.row()]
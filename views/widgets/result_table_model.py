@@ -0,0 +1,171 @@
+"""分类结果表格模型"""
+
+from typing import Optional
+
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, QObject, Qt
+
+from models.failures import describe_failure
+
+
+class ResultTableModel(QAbstractTableModel):
+    """
+    分类结果表格模型
+
+    直接引用结果字典中的成功/失败列表，不复制记录；单元格文本（包括按错误码生成的
+    错误说明）在视图绘制时才生成，过滤和排序只维护行号列表，因此数十万条结果也能立即显示。
+    """
+
+    COLUMN_STATUS = 0
+    COLUMN_FILE = 1
+    COLUMN_CATEGORY = 2
+    COLUMN_ERROR = 3
+
+    HEADERS = ["状态", "文件", "分类", "错误"]
+
+    def __init__(self, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self._success_files: list = []
+        self._failed_files: list = []
+        self._rows = range(0)
+        self._failures_only = False
+        self._search_text = ""
+        self._sort_column = -1
+        self._sort_order = Qt.SortOrder.AscendingOrder
+
+    @property
+    def total_count(self) -> int:
+        return len(self._success_files) + len(self._failed_files)
+
+    @property
+    def visible_count(self) -> int:
+        return len(self._rows)
+
+    def set_results(self, success_files: list, failed_files: list):
+        """设置分类结果"""
+        self.beginResetModel()
+        self._success_files = success_files
+        self._failed_files = failed_files
+        self._rows = self._build_rows()
+        self.endResetModel()
+
+    def clear(self):
+        """清空结果"""
+        self.set_results([], [])
+
+    def set_failures_only(self, failures_only: bool):
+        """只显示失败的文件"""
+        if failures_only != self._failures_only:
+            self._failures_only = failures_only
+            self._refresh_rows()
+
+    def set_search_text(self, text: str):
+        """按文件名、分类或错误信息过滤（不区分大小写）"""
+        text = text.strip().lower()
+        if text != self._search_text:
+            self._search_text = text
+            self._refresh_rows()
+
+    def _record(self, index: int) -> tuple[dict, bool]:
+        """根据记录序号获取(记录, 是否成功)"""
+        success_count = len(self._success_files)
+        if index < success_count:
+            return self._success_files[index], True
+        return self._failed_files[index - success_count], False
+
+    @staticmethod
+    def _category_text(record: dict, success: bool) -> str:
+        """成功记录的分类，失败记录的目标分类"""
+        return record.get("category", "") if success else record.get("target_category", "")
+
+    @staticmethod
+    def _error_text(record: dict, success: bool) -> str:
+        return "" if success else describe_failure(record)
+
+    def _build_rows(self):
+        """根据过滤条件和排序生成可见行号"""
+        success_count = len(self._success_files)
+        start = success_count if self._failures_only else 0
+        rows = range(start, success_count + len(self._failed_files))
+
+        if self._search_text:
+            text = self._search_text
+            rows = [index for index in rows if self._matches(index, text)]
+
+        if self._sort_column >= 0:
+            rows = sorted(
+                rows,
+                key=self._sort_key(self._sort_column),
+                reverse=self._sort_order == Qt.SortOrder.DescendingOrder
+            )
+        return rows
+
+    def _refresh_rows(self):
+        self.beginResetModel()
+        self._rows = self._build_rows()
+        self.endResetModel()
+
+    def _matches(self, index: int, text: str) -> bool:
+        record, success = self._record(index)
+        return (
+            text in record.get("file_name", "").lower()
+            or text in self._category_text(record, success).lower()
+            or text in self._error_text(record, success).lower()
+        )
+
+    def _sort_key(self, column: int):
+        """生成排序键函数"""
+        if column == self.COLUMN_STATUS:
+            success_count = len(self._success_files)
+            return lambda index: index >= success_count
+        if column == self.COLUMN_ERROR:
+            return lambda index: self._error_text(*self._record(index))
+        if column == self.COLUMN_CATEGORY:
+            return lambda index: self._category_text(*self._record(index)).lower()
+        return lambda index: self._record(index)[0].get("file_name", "").lower()
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self._rows)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self.HEADERS)
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+
+        record, success = self._record(self._rows[index.row()])
+        column = index.column()
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == self.COLUMN_STATUS:
+                return "✓" if success else "✗"
+            if column == self.COLUMN_FILE:
+                return record.get("file_name", "未知文件")
+            if column == self.COLUMN_CATEGORY:
+                return self._category_text(record, success)
+            if column == self.COLUMN_ERROR:
+                return self._error_text(record, success)
+        elif role == Qt.ItemDataRole.ToolTipRole:
+            if column == self.COLUMN_FILE:
+                return record.get("file_path", "")
+            if column == self.COLUMN_ERROR:
+                return self._error_text(record, success)
+        elif role == Qt.ItemDataRole.TextAlignmentRole and column == self.COLUMN_STATUS:
+            return Qt.AlignmentFlag.AlignCenter
+        return None
+
+    def sort(self, column: int, order: Qt.SortOrder = Qt.SortOrder.AscendingOrder):
+        self._sort_column = column
+        self._sort_order = order
+        self.layoutAboutToBeChanged.emit()
+        self._rows = self._build_rows()
+        self.layoutChanged.emit()